@@ -0,0 +1,35 @@
+"""add_job_coordinates
+
+Revision ID: 0c8e5a7d3f12
+Revises: 6b2d9f4e1a35
+Create Date: 2026-10-20 00:18:53.241907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c8e5a7d3f12'
+down_revision: Union[str, None] = '6b2d9f4e1a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are geocoded by: python -m app.commands.backfill_job_locations
+    op.add_column('job_posts', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('job_posts', sa.Column('longitude', sa.Float(), nullable=True))
+    op.add_column('job_posts', sa.Column('geohash', sa.String(length=12), nullable=True))
+    op.create_index(op.f('ix_job_posts_geohash'), 'job_posts', ['geohash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_posts_geohash'), table_name='job_posts')
+    op.drop_column('job_posts', 'geohash')
+    op.drop_column('job_posts', 'longitude')
+    op.drop_column('job_posts', 'latitude')
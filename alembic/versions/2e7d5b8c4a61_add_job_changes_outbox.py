@@ -0,0 +1,42 @@
+"""add_job_changes_outbox
+
+Revision ID: 2e7d5b8c4a61
+Revises: d81c4e7a9f20
+Create Date: 2026-10-19 18:22:49.306154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7d5b8c4a61'
+down_revision: Union[str, None] = 'd81c4e7a9f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_changes',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('tx_id', sa.BigInteger(), nullable=False),
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('op', sa.String(length=8), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_job_changes_tx_id_id', 'job_changes', ['tx_id', 'id'], unique=False)
+    op.create_index(op.f('ix_job_changes_changed_at'), 'job_changes', ['changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_changes_changed_at'), table_name='job_changes')
+    op.drop_index('ix_job_changes_tx_id_id', table_name='job_changes')
+    op.drop_table('job_changes')
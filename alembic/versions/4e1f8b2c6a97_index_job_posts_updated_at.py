@@ -0,0 +1,29 @@
+"""index_job_posts_updated_at
+
+Revision ID: 4e1f8b2c6a97
+Revises: 0c8e5a7d3f12
+Create Date: 2026-10-20 09:41:07.528316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e1f8b2c6a97'
+down_revision: Union[str, None] = '0c8e5a7d3f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Incremental snapshots read the jobs changed since the previous watermark
+    op.create_index(op.f('ix_job_posts_updated_at'), 'job_posts', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_job_posts_updated_at'), table_name='job_posts')
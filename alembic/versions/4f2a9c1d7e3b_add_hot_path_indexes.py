@@ -0,0 +1,43 @@
+"""add_hot_path_indexes
+
+Revision ID: 4f2a9c1d7e3b
+Revises: 63485801f148
+Create Date: 2026-10-19 09:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2a9c1d7e3b'
+down_revision: Union[str, None] = '63485801f148'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_COLUMNS = ('RoleName', 'CompanyName', 'Location', 'DepartmentName')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Recency ordering in get_jobs (ORDER BY PostingDate DESC LIMIT n)
+    op.create_index(op.f('ix_job_posts_PostingDate'), 'job_posts', ['PostingDate'], unique=False)
+    # get_valid_otp filters by user_id
+    op.create_index(op.f('ix_otps_user_id'), 'otps', ['user_id'], unique=False)
+    # ilike '%term%' filters in get_jobs
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_job_posts_{column}_trgm', 'job_posts', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(TRGM_COLUMNS):
+        op.drop_index(f'ix_job_posts_{column}_trgm', table_name='job_posts')
+    op.drop_index(op.f('ix_otps_user_id'), table_name='otps')
+    op.drop_index(op.f('ix_job_posts_PostingDate'), table_name='job_posts')
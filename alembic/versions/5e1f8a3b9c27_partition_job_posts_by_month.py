@@ -0,0 +1,117 @@
+"""partition_job_posts_by_month
+
+Revision ID: 5e1f8a3b9c27
+Revises: 7c19a3f5e2d4
+Create Date: 2026-10-19 21:40:37.118402
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1f8a3b9c27'
+down_revision: Union[str, None] = '7c19a3f5e2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+TRGM_COLUMNS = ('RoleName', 'CompanyName', 'Location', 'DepartmentName')
+# Foreign keys into job_posts.id; a partitioned job_posts can only be referenced by (id, PostingDate)
+REFERENCING_FKS = (
+    ('job_posts_duplicate_of_fkey', 'job_posts', 'duplicate_of', 'SET NULL'),
+    ('job_descriptions_job_id_fkey', 'job_descriptions', 'job_id', 'CASCADE'),
+    ('saved_search_matches_job_id_fkey', 'saved_search_matches', 'job_id', 'CASCADE'),
+)
+
+
+def _month(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_indexes() -> None:
+    op.create_index(op.f('ix_job_posts_PostingDate'), 'job_posts', ['PostingDate'], unique=False)
+    op.create_index(op.f('ix_job_posts_RoleName'), 'job_posts', ['RoleName'], unique=False)
+    op.create_index(op.f('ix_job_posts_Location'), 'job_posts', ['Location'], unique=False)
+    op.create_index(op.f('ix_job_posts_CompanyName'), 'job_posts', ['CompanyName'], unique=False)
+    for column in TRGM_COLUMNS:
+        op.create_index(
+            f'ix_job_posts_{column}_trgm', 'job_posts', [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+    op.create_index('ix_job_posts_simhash_bands', 'job_posts', ['simhash_bands'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_job_posts_duplicate_of', 'job_posts', ['duplicate_of'], unique=False,
+        postgresql_where=sa.text('duplicate_of IS NOT NULL'),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Referencing rows are cleaned up by crud.delete_job and the partition archival instead
+    for name, table, _, _ in REFERENCING_FKS:
+        op.drop_constraint(name, table, type_='foreignkey')
+
+    # PostingDate becomes the partition key (NOT NULL, part of the primary key)
+    op.execute('UPDATE job_posts SET "PostingDate" = created_at WHERE "PostingDate" IS NULL')
+    op.rename_table('job_posts', 'job_posts_unpartitioned')
+    op.execute(
+        'CREATE TABLE job_posts (LIKE job_posts_unpartitioned INCLUDING DEFAULTS) PARTITION BY RANGE ("PostingDate")'
+    )
+    op.alter_column('job_posts', 'PostingDate', nullable=False)
+
+    # Data move: one partition per month from the oldest post through MONTHS_AHEAD months from now
+    # (no DEFAULT partition; see app/services/job_partitions.py). Rows are copied month by month
+    # straight into their partition, and the indexes are built once the data is in place.
+    bind = op.get_bind()
+    oldest, newest = bind.execute(
+        sa.text('SELECT min("PostingDate"), max("PostingDate") FROM job_posts_unpartitioned')
+    ).one()
+    now = datetime.now(timezone.utc)
+    month = _month(oldest or now)
+    last = max(_add_months(_month(now), MONTHS_AHEAD), _month(newest or now))
+    while month <= last:
+        upper = _add_months(month, 1)
+        name = f'job_posts_p{month.year:04d}{month.month:02d}'
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF job_posts "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        op.execute(
+            f"INSERT INTO {name} SELECT * FROM job_posts_unpartitioned "
+            f"WHERE \"PostingDate\" >= '{month.isoformat()}' AND \"PostingDate\" < '{upper.isoformat()}'"
+        )
+        month = upper
+    op.drop_table('job_posts_unpartitioned')
+
+    # The primary key must include the partition key; it also serves lookups by id (ix_job_posts_id is not rebuilt)
+    op.create_primary_key('job_posts_pkey', 'job_posts', ['id', 'PostingDate'])
+    _create_indexes()
+    op.execute('ANALYZE job_posts')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('CREATE TABLE job_posts_unpartitioned (LIKE job_posts INCLUDING DEFAULTS)')
+    op.execute('INSERT INTO job_posts_unpartitioned SELECT * FROM job_posts')
+    op.drop_table('job_posts') # Drops the partitions with it
+    op.rename_table('job_posts_unpartitioned', 'job_posts')
+    op.alter_column('job_posts', 'PostingDate', nullable=True)
+    op.create_primary_key('job_posts_pkey', 'job_posts', ['id'])
+    op.create_index(op.f('ix_job_posts_id'), 'job_posts', ['id'], unique=False)
+    _create_indexes()
+
+    # Rows of archived months no longer have a job to reference
+    op.execute('UPDATE job_posts SET duplicate_of = NULL WHERE duplicate_of NOT IN (SELECT id FROM job_posts)')
+    op.execute('DELETE FROM job_descriptions WHERE job_id NOT IN (SELECT id FROM job_posts)')
+    op.execute('DELETE FROM saved_search_matches WHERE job_id NOT IN (SELECT id FROM job_posts)')
+    for name, table, column, ondelete in reversed(REFERENCING_FKS):
+        op.create_foreign_key(name, table, 'job_posts', [column], ['id'], ondelete=ondelete)
@@ -0,0 +1,41 @@
+"""add_job_stats_rollups
+
+Revision ID: 6b2d9f4e1a35
+Revises: a3f6c9e1d2b8
+Create Date: 2026-10-19 23:41:12.506284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b2d9f4e1a35'
+down_revision: Union[str, None] = 'a3f6c9e1d2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'job_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('CompanyName', sa.String(), nullable=False),
+        sa.Column('Location', sa.String(), nullable=False),
+        sa.Column('postings', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'CompanyName', 'Location'),
+    )
+    # Backfill from the existing posts (python -m app.commands.rebuild_job_stats does the same for a range)
+    op.execute(
+        'INSERT INTO job_stats (day, "CompanyName", "Location", postings) '
+        'SELECT ("PostingDate" AT TIME ZONE \'UTC\')::date, coalesce("CompanyName", \'\'), coalesce("Location", \'\'), count(*) '
+        'FROM job_posts GROUP BY 1, 2, 3'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_stats')
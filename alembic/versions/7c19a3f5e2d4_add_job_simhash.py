@@ -0,0 +1,45 @@
+"""add_job_simhash
+
+Revision ID: 7c19a3f5e2d4
+Revises: 2e7d5b8c4a61
+Create Date: 2026-10-19 20:05:12.640187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c19a3f5e2d4'
+down_revision: Union[str, None] = '2e7d5b8c4a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are fingerprinted by: python -m app.commands.backfill_simhash
+    op.add_column('job_posts', sa.Column('simhash', sa.BigInteger(), nullable=True))
+    op.add_column('job_posts', sa.Column('simhash_bands', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.add_column('job_posts', sa.Column('duplicate_of', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_foreign_key(
+        'job_posts_duplicate_of_fkey', 'job_posts', 'job_posts', ['duplicate_of'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index('ix_job_posts_simhash_bands', 'job_posts', ['simhash_bands'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_job_posts_duplicate_of', 'job_posts', ['duplicate_of'], unique=False,
+        postgresql_where=sa.text('duplicate_of IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_posts_duplicate_of', table_name='job_posts')
+    op.drop_index('ix_job_posts_simhash_bands', table_name='job_posts')
+    op.drop_constraint('job_posts_duplicate_of_fkey', 'job_posts', type_='foreignkey')
+    op.drop_column('job_posts', 'duplicate_of')
+    op.drop_column('job_posts', 'simhash_bands')
+    op.drop_column('job_posts', 'simhash')
@@ -0,0 +1,34 @@
+"""drop_redundant_id_indexes
+
+Revision ID: 8d4b1e6f3a70
+Revises: 5e1f8a3b9c27
+Create Date: 2026-10-19 22:18:03.551940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4b1e6f3a70'
+down_revision: Union[str, None] = '5e1f8a3b9c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Plain btrees on primary key columns, duplicating the primary key index on every write.
+# (ix_job_posts_id was already left out when job_posts was partitioned in 5e1f8a3b9c27.)
+REDUNDANT_INDEXES = (('ix_users_id', 'users'), ('ix_otps_id', 'otps'))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index, table in REDUNDANT_INDEXES:
+        op.drop_index(index, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index, table in reversed(REDUNDANT_INDEXES):
+        op.create_index(index, table, ['id'], unique=False)
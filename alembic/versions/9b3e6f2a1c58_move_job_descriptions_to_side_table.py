@@ -0,0 +1,56 @@
+"""move_job_descriptions_to_side_table
+
+Revision ID: 9b3e6f2a1c58
+Revises: 4f2a9c1d7e3b
+Create Date: 2026-10-19 14:03:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e6f2a1c58'
+down_revision: Union[str, None] = '4f2a9c1d7e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMPRESSION_CODECS = ('pglz', 'lz4')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # JobDescription is by far the widest column; keeping it inline in job_posts
+    # means fewer tuples per page for every list/filter/sort scan.
+    op.create_table(
+        'job_descriptions',
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['job_id'], ['job_posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    codec = settings.JOB_DESCRIPTION_COMPRESSION
+    if codec:
+        if codec not in COMPRESSION_CODECS:
+            raise ValueError(f"JOB_DESCRIPTION_COMPRESSION must be one of {COMPRESSION_CODECS}, got {codec!r}")
+        # Postgres 14+; applies to values written from now on (the copy below included)
+        op.execute(f'ALTER TABLE job_descriptions ALTER COLUMN body SET COMPRESSION {codec}')
+    op.execute(
+        'INSERT INTO job_descriptions (job_id, body) '
+        'SELECT id, "JobDescription" FROM job_posts WHERE "JobDescription" IS NOT NULL'
+    )
+    op.drop_column('job_posts', 'JobDescription')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('job_posts', sa.Column('JobDescription', sa.Text(), nullable=True))
+    op.execute(
+        'UPDATE job_posts SET "JobDescription" = d.body FROM job_descriptions d WHERE d.job_id = job_posts.id'
+    )
+    op.drop_table('job_descriptions')
@@ -0,0 +1,64 @@
+"""add_saved_searches
+
+Revision ID: d81c4e7a9f20
+Revises: 9b3e6f2a1c58
+Create Date: 2026-10-19 16:41:05.772390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81c4e7a9f20'
+down_revision: Union[str, None] = '9b3e6f2a1c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'saved_searches',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('RoleName', sa.String(), nullable=True),
+        sa.Column('CompanyName', sa.String(), nullable=True),
+        sa.Column('Location', sa.String(), nullable=True),
+        sa.Column('DepartmentName', sa.String(), nullable=True),
+        sa.Column('keyword', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_saved_searches_user_id'), 'saved_searches', ['user_id'], unique=False)
+    op.create_table(
+        'saved_search_matches',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('saved_search_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['saved_search_id'], ['saved_searches.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['job_id'], ['job_posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_saved_search_matches_user_id_id', 'saved_search_matches', ['user_id', 'id'], unique=False)
+    # ON DELETE CASCADE from saved_searches / job_posts
+    op.create_index(op.f('ix_saved_search_matches_saved_search_id'), 'saved_search_matches', ['saved_search_id'], unique=False)
+    op.create_index(op.f('ix_saved_search_matches_job_id'), 'saved_search_matches', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_saved_search_matches_job_id'), table_name='saved_search_matches')
+    op.drop_index(op.f('ix_saved_search_matches_saved_search_id'), table_name='saved_search_matches')
+    op.drop_index('ix_saved_search_matches_user_id_id', table_name='saved_search_matches')
+    op.drop_table('saved_search_matches')
+    op.drop_index(op.f('ix_saved_searches_user_id'), table_name='saved_searches')
+    op.drop_table('saved_searches')
@@ -1,17 +1,19 @@
 # app/api/deps.py
-from typing import Generator, Annotated, Optional
+from typing import Annotated, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials # Added
-from jose import JWTError
 from sqlalchemy.orm import Session
 
+from app.api.idempotency import IdempotentRequest
 from app.core import security
+from app.core.server_timing import phase
 from app.core.config import settings
+from app.core.request_context import BATCH_USER
 from app.crud import crud_user
 from app.models.user import User
 from app.schemas.user import TokenPayload # Removed User as UserSchema is not used
-from app.database import SessionLocal
+from app.database import get_db, get_db_manual_commit # Unit-of-work session dependencies
 
 # Changed from OAuth2PasswordBearer to HTTPBearer
 reusable_oauth2 = HTTPBearer(
@@ -31,18 +33,21 @@ automation_bearer_token_scheme = HTTPBearer(
 # with HTTPBearer, the user gets the token from /auth/verify-otp 
 # and then uses it.
 
-def get_db() -> Generator:
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
+# get_db commits once when the endpoint returns and rolls back on error.
+# Use it with scope="function" so the commit happens before the response is
+# sent; a failed commit then surfaces as an error instead of a false 2xx.
+# Endpoints that need intermediate commits use get_db_manual_commit instead.
 
 async def get_current_user(
-    db: Annotated[Session, Depends(get_db)], 
+    request: Request,
+    db: Annotated[Session, Depends(get_db, scope="function")], 
     auth_credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(reusable_oauth2)], # Made optional
     automation_token_credentials: Annotated[Optional[HTTPAuthorizationCredentials], Depends(automation_bearer_token_scheme)] # Added automation token
 ) -> User: # Return type changed to User (SQLAlchemy model)
+    batch_user = request.scope.get(BATCH_USER)
+    if batch_user is not None:
+        return batch_user # Sub-request of POST /batch: authenticated once for the whole batch
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -66,7 +71,8 @@ async def get_current_user(
         # Create a dummy user or fetch a specific automation user
         # This part needs to be adapted to your application's logic for an automation user
         # For now, let's assume there's an admin user with ID 1 for automation, or create a mock one.
-        user = crud_user.get_user(db, user_id=1) # Example: Get user with ID 1
+        with phase("auth"):
+            user = crud_user.get_user(db, user_id=1) # Example: Get user with ID 1
         if not user:
             # Fallback or error if the designated automation user doesn't exist
             # This is a placeholder. You'll need to decide how to handle this.
@@ -82,30 +88,24 @@ async def get_current_user(
         # but if we made it optional and no token was provided, raise manually.
         raise credentials_exception
 
-    try:
-        token = auth_credentials.credentials # Extract token from credentials
-        payload = security.verify_token(token, credentials_exception)
-        if payload.sub is None:
-            raise credentials_exception
-        
-        # Ensure user_id is an integer
-        try:
-            user_id = int(payload.sub)
-        except ValueError:
-            # This case should ideally not happen if tokens are generated correctly
-            # and sub is always a string representation of an int.
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-    except Exception: # Catch potential validation errors from TokenPayload
-        raise credentials_exception
-        
-    user = crud_user.get_user(db, user_id=user_id) # type: ignore
+    with phase("auth"):
+        user = get_user_from_token(db, auth_credentials.credentials)
     if user is None:
         raise credentials_exception
     return user # Return SQLAlchemy model instance
 
+def get_user_from_token(db: Session, token: str) -> Optional[User]:
+    """Resolves a JWT access token to its user; None if the token is invalid or the user no longer exists."""
+    try:
+        payload = security.verify_token(token, ValueError("Invalid token"))
+        if payload.sub is None:
+            return None
+        # Ensure user_id is an integer; sub is always a string representation of an int
+        user_id = int(payload.sub)
+    except Exception: # JWTError, expired token, malformed sub or payload validation errors
+        return None
+    return crud_user.get_user(db, user_id=user_id)
+
 async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)] # Type hint changed to User
 ) -> User: # Return type changed to User
@@ -121,3 +121,12 @@ async def get_current_active_admin(
             status_code=403, detail="The user doesn't have enough privileges"
         )
     return current_user
+
+async def get_idempotent_request(
+    request: Request,
+    db: Annotated[Session, Depends(get_db, scope="function")],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    idempotency_key: Annotated[Optional[str], Header(min_length=1, max_length=255)] = None
+) -> IdempotentRequest:
+    """Idempotency-Key handling for create endpoints (see app/api/idempotency.py); a no-op without the header."""
+    return IdempotentRequest(db, current_user.id, idempotency_key, f"{request.method} {request.url.path}")
@@ -0,0 +1,64 @@
+# app/api/idempotency.py
+"""
+Idempotency-Key support for create endpoints.
+
+Clients that retry a POST send the same Idempotency-Key header. The first
+execution's response (status, JSON body, endpoint-specific headers) is
+stored with a hash of the request for IDEMPOTENCY_TTL_SECONDS and replayed
+to repeats, marked with `Idempotent-Replayed: true`, without running the
+endpoint again. Reusing a key for a different request is a 422.
+
+The record is written in the request's own transaction, so it exists exactly
+when the write it describes was committed; a failed request stores nothing
+and may simply be retried. A duplicate that arrives while the first request
+is still running blocks on a transaction-scoped lock on the key, then
+replays the first request's response once it has committed.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app import crud
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotentRequest:
+    __slots__ = ("db", "user_id", "key", "operation", "request_hash")
+
+    def __init__(self, db: Session, user_id: int, key: Optional[str], operation: str):
+        self.db = db
+        self.user_id = user_id
+        self.key = key
+        self.operation = operation # e.g. "POST /api/v1/jobs/"; part of the request hash
+        self.request_hash: Optional[str] = None
+
+    def replay(self, payload: BaseModel) -> Optional[Response]:
+        """The stored response of an earlier execution of this request, or None if the endpoint should run."""
+        if self.key is None:
+            return None
+        self.request_hash = hashlib.sha256(f"{self.operation}\n{payload.model_dump_json()}".encode()).hexdigest()
+        crud.lock_idempotency_key(self.db, self.user_id, self.key) # Waits for an in-flight duplicate to finish
+        record = crud.get_idempotency_record(self.db, self.user_id, self.key)
+        if record is None:
+            return None
+        if record.request_hash != self.request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        headers = {**(record.response_headers or {}), REPLAYED_HEADER: "true"}
+        return Response(
+            content=record.response_body, status_code=record.status_code, media_type="application/json", headers=headers,
+        )
+
+    def save(self, status_code: int, body: BaseModel, headers: Optional[dict[str, str]] = None) -> None:
+        """Stores the response to replay; call after the write, before returning."""
+        if self.key is None:
+            return
+        crud.save_idempotency_record(
+            self.db, self.user_id, self.key, self.request_hash, status_code, body.model_dump_json().encode(), headers,
+        )
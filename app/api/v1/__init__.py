@@ -2,9 +2,15 @@ from fastapi import APIRouter
 from app.api.v1.endpoints import jobs as jobs_router
 from app.api.v1.endpoints import auth as auth_router
 from app.api.v1.endpoints import users as users_router  # Import the new users router
+from app.api.v1.endpoints import admin as admin_router
+from app.api.v1.endpoints import saved_searches as saved_searches_router
+from app.api.v1.endpoints import batch as batch_router
 
 api_router = APIRouter()
 
 api_router.include_router(jobs_router.router, prefix="/jobs", tags=["jobs"])
 api_router.include_router(auth_router.router, prefix="/auth", tags=["auth"])
-api_router.include_router(users_router.router, prefix="/users", tags=["users"])  # Include the users router
\ No newline at end of file
+api_router.include_router(users_router.router, prefix="/users", tags=["users"])  # Include the users router
+api_router.include_router(admin_router.router, prefix="/admin", tags=["admin"])
+api_router.include_router(saved_searches_router.router, prefix="/saved-searches", tags=["saved-searches"])
+api_router.include_router(batch_router.router, prefix="/batch", tags=["batch"])
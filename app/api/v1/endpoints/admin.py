@@ -0,0 +1,88 @@
+# app/api/v1/endpoints/admin.py
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from typing import Annotated
+import logging
+
+from app import schemas, models
+from app.api import deps
+from app.core.server_timing import TimedRoute
+from app.core import profiler
+from app.database import engine
+from app.services import snapshots
+
+logger = logging.getLogger("app.snapshots")
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.get("/profiles", response_model=schemas.ProfileList)
+def list_request_profiles(
+    current_user: Annotated[models.User, Depends(deps.get_current_active_admin)]
+):
+    """
+    List captured request profiles, newest first. Requires admin.
+    Profile a request by sending it with an admin token and `X-Profile: 1`.
+    """
+    return {"profiles": profiler.list_profiles()}
+
+@router.get("/profiles/{name}", response_class=FileResponse)
+def download_request_profile(
+    name: str,
+    current_user: Annotated[models.User, Depends(deps.get_current_active_admin)]
+):
+    """
+    Download a captured profile (collapsed stacks for flamegraph.pl/speedscope). Requires admin.
+    """
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
+
+def _write_snapshot(request: schemas.SnapshotCreate) -> None:
+    try:
+        snapshots.create_snapshot(engine, **request.model_dump())
+    except snapshots.SnapshotInProgress:
+        logger.warning("snapshot request dropped: another snapshot is being written")
+    except Exception:
+        logger.exception("snapshot failed")
+
+@router.post("/snapshots", status_code=status.HTTP_202_ACCEPTED)
+def create_snapshot(
+    request: schemas.SnapshotCreate,
+    background_tasks: BackgroundTasks,
+    current_user: Annotated[models.User, Depends(deps.get_current_active_admin)]
+):
+    """
+    Start writing a Parquet snapshot of the job data for analytics; it shows up
+    in GET /admin/snapshots once complete. Requires admin.
+    """
+    if not snapshots.available():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Snapshots need pyarrow installed")
+    if snapshots.running(engine):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A snapshot is already being written")
+    background_tasks.add_task(_write_snapshot, request)
+    return {"detail": "Snapshot started"}
+
+@router.get("/snapshots", response_model=schemas.SnapshotList)
+def list_snapshots(
+    current_user: Annotated[models.User, Depends(deps.get_current_active_admin)]
+):
+    """
+    List completed snapshots (their manifests), newest first. Requires admin.
+    """
+    return {"snapshots": snapshots.list_snapshots()}
+
+@router.get("/snapshots/{name}/{file}", response_class=FileResponse)
+def download_snapshot_file(
+    name: str,
+    file: str,
+    current_user: Annotated[models.User, Depends(deps.get_current_active_admin)]
+):
+    """
+    Download one file of a snapshot, e.g. job_posts.parquet or manifest.json. Requires admin.
+    """
+    path = snapshots.snapshot_file(name, file)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot file not found")
+    media_type = "application/json" if file.endswith(".json") else "application/vnd.apache.parquet"
+    return FileResponse(path, media_type=media_type, filename=f"{name}-{file}")
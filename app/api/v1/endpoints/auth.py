@@ -3,27 +3,19 @@ from sqlalchemy.orm import Session
 from datetime import timedelta
 
 from app import crud, schemas, models
-from app.core import security
-from app.database import SessionLocal
+from app.core import security, metrics
+from app.api import deps
+from app.core.server_timing import TimedRoute
 from app.core.config import settings
-from app.services.email_service import send_otp_email
 
 # models.Base.metadata.create_all(bind=engine) # This should be handled by Alembic migrations
 
-router = APIRouter()
-
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/request-otp", response_model=schemas.Msg)
 async def request_otp(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(deps.get_db_manual_commit, scope="function"),
     otp_request: schemas.OTPRequest
 ):
     """
@@ -60,10 +52,15 @@ async def request_otp(
     
     # Store OTP
     crud.create_otp(db=db, user_id=user.id, otp_code=otp_code, expires_delta=otp_expires_delta, identifier=identifier_to_use)
+    # Single commit for the new user (if any) and the OTP. Committed before the
+    # email goes out so the transaction isn't held open across the Brevo call.
+    db.commit()
+    metrics.record(metrics.OTP_ISSUED.inc)
     
     response_msg = f"OTP generation process initiated for {identifier_to_use}."
 
     if is_email_request and email: # Send email if it was an email request
+        from app.services.email_service import send_otp_email # Lazy: pulls in httpx, only needed on this path
         email_sent = await send_otp_email(email_to=email, otp_code=otp_code)
         if email_sent:
             response_msg = f"OTP has been sent to {email}."
@@ -87,7 +84,7 @@ async def request_otp(
 @router.post("/verify-otp", response_model=schemas.Token)
 async def verify_otp(
     *,
-    db: Session = Depends(get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     otp_verify: schemas.OTPVerify
 ):
     """
@@ -116,6 +113,7 @@ async def verify_otp(
     db_otp = crud.get_valid_otp(db=db, identifier=identifier_to_use, otp_code=otp_verify.otp_code)
 
     if not db_otp:
+        metrics.record(metrics.OTP_FAILED.inc)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired OTP.",
@@ -123,6 +121,7 @@ async def verify_otp(
 
     # Mark OTP as used
     crud.mark_otp_as_used(db=db, db_otp=db_otp)
+    metrics.record(metrics.OTP_VERIFIED.inc)
 
     # Generate access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
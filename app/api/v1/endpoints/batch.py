@@ -0,0 +1,123 @@
+# app/api/v1/endpoints/batch.py
+"""
+POST /api/v1/batch: several read-only sub-requests in one round trip.
+
+The batch is authenticated once and opens one session. Sub-requests are
+dispatched in order, in process, through the API router (not the middleware), with
+the batch's user and session in their scope; deps.get_current_user and
+get_db hand those out instead of decoding the token and opening a session
+again. Middleware (CORS, metrics, Server-Timing) sees only the batch.
+"""
+import json
+import logging
+from typing import Annotated
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app import schemas, models
+from app.api import deps
+from app.core.config import settings
+from app.core.request_context import BATCH_SESSION, BATCH_USER
+from app.core.server_timing import TimedRoute
+
+logger = logging.getLogger("app.batch")
+
+router = APIRouter(route_class=TimedRoute)
+
+API_PREFIX = "/api/v1/"
+DROPPED_HEADERS = {b"content-length", b"content-type"} # Belong to the batch's own body
+HIDDEN_RESPONSE_HEADERS = {"content-length", "server-timing"}
+
+
+def _error(sub: schemas.BatchSubRequest, status_code: int, detail: str) -> schemas.BatchSubResponse:
+    return schemas.BatchSubResponse(id=sub.id, status=status_code, body={"detail": detail})
+
+
+class _StreamingResponse(Exception):
+    """Raised from the sub-request's send(): an event stream never completes, so it cannot be batched."""
+
+
+async def _dispatch(request: Request, sub: schemas.BatchSubRequest, db: Session, user) -> schemas.BatchSubResponse:
+    url = urlsplit(sub.path)
+    if not url.path.startswith(API_PREFIX) or url.path.rstrip("/") == request.url.path.rstrip("/"):
+        return _error(sub, status.HTTP_400_BAD_REQUEST, "Sub-request path must be an API path other than /batch")
+    scope = {
+        **request.scope,
+        "method": sub.method,
+        "path": url.path,
+        "raw_path": url.path.encode(),
+        "query_string": url.query.encode(),
+        "headers": [(k, v) for k, v in request.scope["headers"] if k not in DROPPED_HEADERS],
+        "path_params": {},
+        BATCH_SESSION: db,
+        BATCH_USER: user,
+    }
+    scope.pop("route", None)
+    scope.pop("endpoint", None)
+
+    started: dict = {}
+    chunks: list[bytes] = []
+
+    messages = iter([{"type": "http.request", "body": b"", "more_body": False}])
+
+    async def receive():
+        # Empty body, then an immediate disconnect (stops anything still listening for more)
+        return next(messages, {"type": "http.disconnect"})
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            if dict(message.get("headers", [])).get(b"content-type", b"").startswith(b"text/event-stream"):
+                raise _StreamingResponse()
+            started.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        # The router, not the app: routing, 404/405 and exception handlers, but no middleware
+        await request.app.router(scope, receive, send)
+    except _StreamingResponse:
+        return _error(sub, status.HTTP_400_BAD_REQUEST, "Streaming endpoints cannot be batched")
+    except StarletteHTTPException as e: # Raised by the router itself (404, 405) when no route takes the path
+        return _error(sub, e.status_code, e.detail)
+    except Exception:
+        logger.exception("batch sub-request %s failed", url.path)
+        db.rollback() # Reads only; leaves the shared session usable for the remaining sub-requests
+        return _error(sub, status.HTTP_500_INTERNAL_SERVER_ERROR, "Internal Server Error")
+
+    headers = {
+        k.decode("latin-1"): v.decode("latin-1") for k, v in started.get("headers", [])
+        if k.decode("latin-1").lower() not in HIDDEN_RESPONSE_HEADERS
+    }
+    raw = b"".join(chunks)
+    if headers.get("content-type", "").startswith("application/json") and raw:
+        body = json.loads(raw)
+    else:
+        body = raw.decode("utf-8", errors="replace") or None
+    return schemas.BatchSubResponse(id=sub.id, status=started.get("status", 500), headers=headers, body=body)
+
+
+@router.post("", response_model=schemas.BatchResponse)
+async def run_batch(
+    batch_in: schemas.BatchRequest,
+    request: Request,
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)]
+):
+    """
+    Run up to BATCH_MAX_REQUESTS read-only (GET) API requests, e.g.
+    {"requests": [{"id": "me", "path": "/api/v1/users/me"}, {"path": "/api/v1/jobs/?limit=5"}]},
+    with authentication and session setup done once for the whole batch.
+    Each sub-response carries its own status, headers and body; a failing
+    sub-request does not fail the batch. Requires authentication.
+    """
+    if len(batch_in.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} sub-requests per batch",
+        )
+    # Sequential: the sub-requests share one session, which must not be used concurrently
+    responses = [await _dispatch(request, sub, db, current_user) for sub in batch_in.requests]
+    return {"responses": responses}
@@ -1,29 +1,63 @@
 # app/api/v1/endpoints/jobs.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional, Annotated # Added Annotated
+from typing import List, Literal, Optional, Annotated # Added Annotated
+from datetime import date
 import uuid
 
 from app import crud, schemas, models # Updated imports
 # from app.database import get_db # Updated import - get_db is now in deps
 from app.api import deps # Import deps
+from app.api.idempotency import IdempotentRequest
+from app.core.config import settings
+from app.core.server_timing import TimedRoute
+from app.crud.crud_job_change import format_cursor, parse_cursor
+from app.services import change_feed, geo
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.post("/", response_model=schemas.JobPostInDB, status_code=status.HTTP_201_CREATED)
 def create_job_posting(
     job_in: schemas.JobPostCreate,
-    db: Annotated[Session, Depends(deps.get_db)], 
-    current_user: Annotated[models.User, Depends(deps.get_current_active_user)] 
+    response: Response,
+    db: Annotated[Session, Depends(deps.get_db, scope="function")], 
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)],
+    idempotency: Annotated[IdempotentRequest, Depends(deps.get_idempotent_request)]
 ):
     """
     Create new job posting. Requires authentication.
+
+    Near-duplicates of an existing post (DEDUP_POLICY) are flagged
+    (X-Duplicate-Of header), rejected with 409, or merged into the existing
+    post (200 with that post). Retries sent with the same Idempotency-Key
+    header get the first response back instead of creating the job again.
     """
-    return crud.create_job(db=db, job=job_in)
+    replayed = idempotency.replay(job_in)
+    if replayed is not None:
+        return replayed
+    try:
+        db_job = crud.create_job(db=db, job=job_in)
+    except crud.DuplicateJobError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"msg": "Near-duplicate of an existing job", "duplicate_of": str(e.existing_id)},
+        )
+    if db_job.dedup_outcome == "merged":
+        response.status_code = status.HTTP_200_OK
+        response.headers["X-Duplicate-Of"] = str(db_job.id)
+    elif db_job.duplicate_of is not None:
+        response.headers["X-Duplicate-Of"] = str(db_job.duplicate_of)
+    idempotency.save(
+        response.status_code or status.HTTP_201_CREATED, schemas.JobPostInDB.model_validate(db_job),
+        {k: v for k, v in response.headers.items() if k == "x-duplicate-of"},
+    )
+    return db_job
 
-@router.get("/", response_model=List[schemas.JobPostInDB])
+@router.get("/", response_model=List[schemas.JobPostListItem])
 def read_job_postings(
-    db: Annotated[Session, Depends(deps.get_db)], 
+    response: Response,
+    db: Annotated[Session, Depends(deps.get_db, scope="function")], 
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)], # Added dependency
     skip: int = 0,
     limit: int = 100,
@@ -31,25 +65,140 @@ def read_job_postings(
     CompanyName: Optional[str] = None,
     Location: Optional[str] = None,
     DepartmentName: Optional[str] = None,
-    keyword: Optional[str] = None  # Added keyword parameter
+    keyword: Optional[str] = None,  # Added keyword parameter
+    near: Optional[str] = None, # Place name from the gazetteer, e.g. "Bengaluru"
+    radius_km: Annotated[Optional[float], Query(gt=0, le=settings.GEO_MAX_RADIUS_KM)] = None,
+    include_description: bool = False, # JobDescription is null in list items unless requested
+    count: Literal["exact", "estimated", "none"] = "none"
 ):
     """
     Retrieve all job postings, with pagination and search filters. Requires authentication.
+
+    With `near`, only jobs whose Location resolves to a place within
+    `radius_km` (default GEO_DEFAULT_RADIUS_KM) of that place are listed.
+
+    With `count`, the total is returned in X-Total-Count; X-Total-Count-Mode
+    says how it was obtained (exact/estimated) and X-Total-Count-Accuracy how
+    far to trust it (exact, lower-bound, planner-estimate, table-statistics).
     """
-    search_params = schemas.JobSearch(
+    search_params = schemas.JobListSearch(
         RoleName=RoleName,
         CompanyName=CompanyName,
         Location=Location,
         DepartmentName=DepartmentName,
-        keyword=keyword  # Pass keyword to search params
+        keyword=keyword,  # Pass keyword to search params
+        near=near,
+        radius_km=radius_km
     )
-    jobs = crud.get_jobs(db, skip=skip, limit=limit, search_params=search_params)
+    if radius_km is not None and not near:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="radius_km requires near")
+    if near and geo.resolve(near) is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown place: {near}")
+    jobs = crud.get_jobs(db, skip=skip, limit=limit, search_params=search_params, include_description=include_description)
+    if count != "none":
+        total, method, accuracy = crud.count_jobs(db, search_params=search_params, mode=count)
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["X-Total-Count-Mode"] = method
+        response.headers["X-Total-Count-Accuracy"] = accuracy
     return jobs
 
+# Registered before /{job_id} so "changes" is not parsed as a job id
+@router.get("/changes", response_model=schemas.JobChangeFeed)
+def read_job_changes(
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)],
+    since: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.CHANGE_FEED_PAGE_MAX)] = 100
+):
+    """
+    Job creates/updates/deletes after the `since` cursor, oldest first (omit it
+    to start from the beginning of the retained history). Pass `next_cursor`
+    back as `since` to fetch only deltas. Requires authentication.
+    """
+    cursor = _parse_since(since)
+    changes = [change_feed.to_schema(c) for c in crud.get_job_changes(db, since=cursor, limit=limit)]
+    return {"changes": changes, "next_cursor": changes[-1].cursor if changes else format_cursor(cursor)}
+
+@router.get("/changes/stream", response_class=StreamingResponse)
+async def stream_job_changes(
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)],
+    since: Optional[str] = None,
+    last_event_id: Annotated[Optional[str], Header()] = None
+):
+    """
+    Server-Sent Events stream of job changes (event = op, id = cursor, data =
+    the change as in /changes). Resumes after `since` or the Last-Event-ID
+    header sent by reconnecting EventSource clients. Requires authentication.
+    """
+    cursor = _parse_since(last_event_id or since)
+    return StreamingResponse(
+        change_feed.stream(cursor),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _parse_since(value: Optional[str]):
+    try:
+        return parse_cursor(value)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid change cursor")
+
+@router.post("/batch-get", response_model=schemas.JobBatchGetResult)
+def batch_get_job_postings(
+    batch_in: schemas.JobBatchGet,
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)]
+):
+    """
+    Get up to JOB_BATCH_GET_MAX job postings by id in one request (one query).
+    Jobs come back in request order; ids without a job are listed in `missing`.
+    Requires authentication.
+    """
+    if len(batch_in.ids) > settings.JOB_BATCH_GET_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.JOB_BATCH_GET_MAX} ids per request",
+        )
+    job_ids = list(dict.fromkeys(batch_in.ids))
+    found = {job.id: job for job in crud.get_jobs_by_ids(db, job_ids, include_description=batch_in.include_description)}
+    return {
+        "jobs": [found[job_id] for job_id in job_ids if job_id in found],
+        "missing": [job_id for job_id in job_ids if job_id not in found],
+    }
+
+@router.get("/stats", response_model=schemas.JobStats)
+def read_job_stats(
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)],
+    group_by: Annotated[List[Literal["day", "company", "location"]], Query()] = ["day"],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    CompanyName: Optional[str] = None,
+    Location: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=settings.JOB_STATS_MAX_ROWS)] = 1000
+):
+    """
+    Postings per day / company / location (any combination in `group_by`),
+    over PostingDate days date_from..date_to (UTC, inclusive), optionally for
+    one exact CompanyName or Location. Answered from the job_stats rollups,
+    not by scanning jobs. Requires authentication.
+    """
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from is after date_to")
+    group_by = list(dict.fromkeys(group_by))
+    rows = crud.get_job_stats(
+        db, group_by, date_from=date_from, date_to=date_to, CompanyName=CompanyName, Location=Location, limit=limit,
+    )
+    for row in rows: # '' is the rollup key for "not set"
+        for name in ("company", "location"):
+            if row.get(name) == "":
+                row[name] = None
+    return {"group_by": group_by, "rows": rows}
+
 @router.get("/{job_id}", response_model=schemas.JobPostInDB)
 def read_job_posting(
     job_id: uuid.UUID,
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] # Added dependency
 ):
     """
@@ -64,7 +213,7 @@ def read_job_posting(
 def update_single_job_posting(
     job_id: uuid.UUID,
     job_in: schemas.JobPostUpdate,
-    db: Annotated[Session, Depends(deps.get_db)], 
+    db: Annotated[Session, Depends(deps.get_db, scope="function")], 
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] 
 ):
     """
@@ -79,7 +228,7 @@ def update_single_job_posting(
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_single_job_posting(
     job_id: uuid.UUID,
-    db: Annotated[Session, Depends(deps.get_db)], 
+    db: Annotated[Session, Depends(deps.get_db, scope="function")], 
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] 
 ):
     """
@@ -92,7 +241,7 @@ def delete_single_job_posting(
 
 @router.get("/suggestions/role-names", response_model=schemas.SuggestionList)
 async def get_role_name_suggestions(
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] # Added dependency
 ):
     """
@@ -103,7 +252,7 @@ async def get_role_name_suggestions(
 
 @router.get("/suggestions/company-names", response_model=schemas.SuggestionList)
 async def get_company_name_suggestions(
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] # Added dependency
 ):
     """
@@ -114,7 +263,7 @@ async def get_company_name_suggestions(
 
 @router.get("/suggestions/locations", response_model=schemas.SuggestionList)
 async def get_location_suggestions(
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] # Added dependency
 ):
     """
@@ -125,7 +274,7 @@ async def get_location_suggestions(
 
 @router.get("/suggestions/department-names", response_model=schemas.SuggestionList)
 async def get_department_name_suggestions(
-    db: Annotated[Session, Depends(deps.get_db)],
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
     current_user: Annotated[models.User, Depends(deps.get_current_active_user)] # Added dependency
 ):
     """
@@ -0,0 +1,73 @@
+# app/api/v1/endpoints/saved_searches.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List, Annotated
+
+from app import crud, schemas, models
+from app.api import deps
+from app.api.idempotency import IdempotentRequest
+from app.core.config import settings
+from app.core.server_timing import TimedRoute
+
+router = APIRouter(route_class=TimedRoute)
+
+@router.post("/", response_model=schemas.SavedSearch, status_code=status.HTTP_201_CREATED)
+def create_saved_search(
+    search_in: schemas.SavedSearchCreate,
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)],
+    idempotency: Annotated[IdempotentRequest, Depends(deps.get_idempotent_request)]
+):
+    """
+    Save a job search. New jobs matching it are delivered to the inbox. Requires authentication.
+    Honours the Idempotency-Key header like POST /jobs/.
+    """
+    replayed = idempotency.replay(search_in)
+    if replayed is not None:
+        return replayed
+    if crud.count_saved_searches(db, user_id=current_user.id) >= settings.SAVED_SEARCHES_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.SAVED_SEARCHES_PER_USER} saved searches per user",
+        )
+    saved_search = crud.create_saved_search(db, user_id=current_user.id, search_in=search_in)
+    idempotency.save(status.HTTP_201_CREATED, schemas.SavedSearch.model_validate(saved_search))
+    return saved_search
+
+@router.get("/", response_model=List[schemas.SavedSearch])
+def read_saved_searches(
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)]
+):
+    """
+    List the current user's saved searches. Requires authentication.
+    """
+    return crud.get_saved_searches(db, user_id=current_user.id)
+
+@router.get("/inbox", response_model=schemas.SavedSearchInbox)
+def read_saved_search_inbox(
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)],
+    after: int = 0,
+    limit: Annotated[int, Query(ge=1, le=settings.SAVED_SEARCH_INBOX_PAGE_MAX)] = 50
+):
+    """
+    New jobs that matched the user's saved searches, oldest first. Poll with
+    `after` set to the previous `next_cursor`; an empty page means nothing new.
+    Requires authentication.
+    """
+    matches = crud.get_inbox(db, user_id=current_user.id, after=after, limit=limit)
+    return {"matches": matches, "next_cursor": matches[-1].id if matches else after}
+
+@router.delete("/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_saved_search(
+    search_id: int,
+    db: Annotated[Session, Depends(deps.get_db, scope="function")],
+    current_user: Annotated[models.User, Depends(deps.get_current_active_user)]
+):
+    """
+    Delete one of the current user's saved searches (and its inbox entries). Requires authentication.
+    """
+    if crud.delete_saved_search(db, user_id=current_user.id, search_id=search_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Saved search not found")
+    return
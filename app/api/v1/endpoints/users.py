@@ -6,10 +6,11 @@ from sqlalchemy.exc import IntegrityError
 
 from app.schemas.user import User as UserSchema, UserProfileUpdate # Pydantic schema for user output
 from app.api import deps
+from app.core.server_timing import TimedRoute
 from app.crud import crud_user
 from app.models.user import User as UserModel # SQLAlchemy model
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 @router.get("/me", response_model=UserSchema)
 async def read_users_me(
@@ -25,7 +26,7 @@ async def read_users_me(
 @router.put("/me", response_model=UserSchema)
 async def update_user_me(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     profile_in: UserProfileUpdate,
     current_user: Annotated[UserModel, Depends(deps.get_current_active_user)]
 ):
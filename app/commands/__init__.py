@@ -0,0 +1,2 @@
+# app/commands/__init__.py
+# Operational one-off/cron commands: python -m app.commands.<name>
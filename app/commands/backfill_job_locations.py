@@ -0,0 +1,65 @@
+# app/commands/backfill_job_locations.py
+"""
+Geocodes job posts against the offline gazetteer (app/services/gazetteer.csv)
+in keyset-paginated batches, one commit per batch. By default only posts
+without coordinates are visited; --all re-resolves every post, e.g. after
+places or aliases were added to the gazetteer.
+
+    python -m app.commands.backfill_job_locations --batch-size 5000
+"""
+import argparse
+
+from sqlalchemy import select, update
+
+from app.database import SessionLocal
+from app.models.job import JobPost
+from app.services import geo
+
+
+def geocode(batch_size: int, everything: bool = False) -> tuple[int, int]:
+    """Returns (posts visited, posts located)."""
+    visited, located, last_id = 0, 0, None
+    while True:
+        with SessionLocal() as db:
+            query = select(JobPost.id, JobPost.PostingDate, JobPost.Location, JobPost.geohash).order_by(JobPost.id).limit(batch_size)
+            if not everything:
+                query = query.where(JobPost.geohash.is_(None), JobPost.Location.is_not(None))
+            if last_id is not None:
+                query = query.where(JobPost.id > last_id)
+            rows = db.execute(query).all()
+            if not rows:
+                return visited, located
+            values = []
+            for job_id, posted, location, current in rows:
+                place = geo.resolve(location)
+                if place is not None:
+                    located += 1
+                if (place.geohash if place else None) != current:
+                    values.append({
+                        "id": job_id,
+                        "PostingDate": posted, # Part of the table's primary key (partition key)
+                        "latitude": place.lat if place else None,
+                        "longitude": place.lon if place else None,
+                        "geohash": place.geohash if place else None,
+                    })
+            if values:
+                db.execute(update(JobPost), values) # Bulk UPDATE ... WHERE id = :id AND "PostingDate" = :PostingDate
+                db.commit()
+            visited += len(rows)
+            last_id = rows[-1][0]
+            print(f"visited {visited}, located {located}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--all", action="store_true", help="re-resolve posts that already have coordinates")
+    args = parser.parse_args(argv)
+
+    visited, located = geocode(args.batch_size, everything=args.all)
+    print(f"located {located} of {visited} job posts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+# app/commands/backfill_simhash.py
+"""
+Fingerprints job posts created before near-duplicate detection existed
+(simhash IS NULL), in keyset-paginated batches, one commit per batch.
+With --mark-duplicates, also sets duplicate_of on every post that has an
+older near-duplicate (nothing is deleted or merged).
+
+    python -m app.commands.backfill_simhash --batch-size 5000 --mark-duplicates
+"""
+import argparse
+
+from sqlalchemy import select, update
+
+from app import crud
+from app.database import SessionLocal
+from app.models.job import JobPost, JobPostDescription
+from app.services import dedup
+
+
+def fingerprint_missing(batch_size: int) -> int:
+    done, last_id = 0, None
+    while True:
+        with SessionLocal() as db:
+            query = (
+                select(JobPost.id, JobPost.PostingDate, JobPost.CompanyName, JobPost.RoleName, JobPostDescription.body)
+                .outerjoin(JobPostDescription, JobPostDescription.job_id == JobPost.id)
+                .where(JobPost.simhash.is_(None))
+                .order_by(JobPost.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(JobPost.id > last_id)
+            rows = db.execute(query).all()
+            if not rows:
+                return done
+            values = []
+            for job_id, posted, company, role, description in rows:
+                fp = dedup.fingerprint(company, role, description)
+                values.append({
+                    "id": job_id, "PostingDate": posted, # The table's primary key includes the partition key
+                    "simhash": dedup.to_signed(fp), "simhash_bands": dedup.bands(fp),
+                })
+            db.execute(update(JobPost), values) # Bulk UPDATE ... WHERE id = :id AND "PostingDate" = :PostingDate
+            db.commit()
+            done += len(rows)
+            last_id = rows[-1][0]
+            print(f"fingerprinted {done}")
+
+
+def mark_duplicates(batch_size: int) -> int:
+    marked, last_id = 0, None
+    while True:
+        with SessionLocal() as db:
+            query = (
+                select(JobPost.id, JobPost.simhash, JobPost.PostingDate)
+                .where(JobPost.simhash.is_not(None), JobPost.duplicate_of.is_(None))
+                .order_by(JobPost.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(JobPost.id > last_id)
+            rows = db.execute(query).all()
+            if not rows:
+                return marked
+            for job_id, simhash, posted in rows:
+                original = crud.find_near_duplicate(
+                    db, dedup.to_unsigned(simhash), exclude_id=job_id, posted_before=posted,
+                )
+                if original is not None:
+                    db.execute(update(JobPost).where(JobPost.id == job_id).values(duplicate_of=original.id))
+                    marked += 1
+            db.commit()
+            last_id = rows[-1][0]
+            print(f"checked through {last_id}, {marked} marked")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--mark-duplicates", action="store_true")
+    args = parser.parse_args(argv)
+
+    print(f"fingerprinted {fingerprint_missing(args.batch_size)} job posts")
+    if args.mark_duplicates:
+        print(f"marked {mark_duplicates(args.batch_size)} near-duplicates")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+# app/commands/export_snapshot.py
+"""
+Writes a Parquet snapshot of the job data to SNAPSHOT_DIR for analytics
+(see app/services/snapshots.py). --incremental writes only what changed
+since the newest snapshot's watermark (or --since); run it from cron
+between periodic full snapshots. Needs pyarrow.
+
+    python -m app.commands.export_snapshot
+    python -m app.commands.export_snapshot --incremental --no-users --no-otps
+"""
+import argparse
+import json
+from datetime import datetime, timezone
+
+from app.database import engine
+from app.services import snapshots
+
+
+def _timestamp(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--incremental", action="store_true", help="only rows changed since the newest snapshot")
+    parser.add_argument("--since", type=_timestamp, help="ISO timestamp (UTC if naive); implies --incremental")
+    parser.add_argument("--no-users", dest="users", action="store_false", help="leave out users.parquet")
+    parser.add_argument("--no-otps", dest="otps", action="store_false", help="leave out otp_daily.parquet")
+    parser.add_argument("--descriptions", action="store_true", help="include JobDescription in job_posts.parquet")
+    parser.add_argument("--batch-rows", type=int, help="rows per row group (default: SNAPSHOT_BATCH_ROWS)")
+    parser.add_argument("--dir", help="output directory (default: SNAPSHOT_DIR)")
+    args = parser.parse_args(argv)
+    if args.batch_rows is not None and args.batch_rows < 1:
+        parser.error("--batch-rows must be positive")
+
+    try:
+        manifest = snapshots.create_snapshot(
+            engine,
+            incremental=args.incremental or args.since is not None,
+            since=args.since,
+            include_users=args.users,
+            include_otps=args.otps,
+            include_descriptions=args.descriptions,
+            batch_rows=args.batch_rows,
+            directory=args.dir,
+        )
+    except snapshots.SnapshotUnavailable as e:
+        parser.error(str(e))
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,34 @@
+# app/commands/maintain_job_partitions.py
+"""
+Keeps job_posts' monthly partitions in shape: creates the partitions for
+the next JOB_PARTITION_MONTHS_AHEAD months and archives the ones entirely
+older than JOB_RETENTION_MONTHS (detached into JOB_ARCHIVE_SCHEMA with their
+descriptions, or dropped with --mode drop). Idempotent; run daily from cron:
+
+    python -m app.commands.maintain_job_partitions --retention-months 24
+"""
+import argparse
+
+from app.core.config import settings
+from app.database import engine
+from app.services import job_partitions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months-ahead", type=int, default=settings.JOB_PARTITION_MONTHS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=settings.JOB_RETENTION_MONTHS, help="0 keeps everything")
+    parser.add_argument("--mode", choices=("detach", "drop"), default=settings.JOB_ARCHIVE_MODE)
+    args = parser.parse_args(argv)
+
+    created = job_partitions.ensure_ahead(engine, args.months_ahead)
+    print(f"created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+    if args.retention_months > 0:
+        archived = job_partitions.archive_expired(engine, args.retention_months, args.mode)
+        for name, rows in archived.items():
+            print(f"{'archived' if args.mode == 'detach' else 'dropped'} {name} ({rows} job posts)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
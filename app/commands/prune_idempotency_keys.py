@@ -0,0 +1,27 @@
+# app/commands/prune_idempotency_keys.py
+"""
+Deletes stored Idempotency-Key responses past their expiry
+(IDEMPOTENCY_TTL_SECONDS after the original request). Expired keys are
+already ignored on lookup; this only reclaims the space. Run from cron:
+
+    python -m app.commands.prune_idempotency_keys
+"""
+import argparse
+
+from app import crud
+from app.database import SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        deleted = crud.prune_idempotency_keys(db)
+        db.commit()
+    print(f"deleted {deleted} expired idempotency keys")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
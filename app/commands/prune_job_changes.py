@@ -0,0 +1,31 @@
+# app/commands/prune_job_changes.py
+"""
+Deletes job_changes outbox rows older than JOB_CHANGES_RETENTION_DAYS (or
+--days). Consumers whose cursor is older than the retention window must
+re-list instead of reading deltas. Run from cron:
+
+    python -m app.commands.prune_job_changes --days 30
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from app import crud
+from app.core.config import settings
+from app.database import SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=settings.JOB_CHANGES_RETENTION_DAYS)
+    args = parser.parse_args(argv)
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    with SessionLocal() as db:
+        deleted = crud.prune_job_changes(db, older_than=cutoff)
+        db.commit()
+    print(f"deleted {deleted} job changes older than {cutoff.isoformat()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,33 @@
+# app/commands/rebuild_job_stats.py
+"""
+Recomputes the job_stats rollups (GET /jobs/stats) from job_posts, e.g. after
+a bulk load or a backfill that bypassed crud. Without --since/--until the
+whole range of existing posts is rebuilt; rollups of days with no posts left
+(archived partitions) are kept. Job writes wait while it runs.
+
+    python -m app.commands.rebuild_job_stats --since 2026-01-01 --until 2026-03-31
+"""
+import argparse
+from datetime import date
+
+from app import crud
+from app.database import SessionLocal
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--since", type=date.fromisoformat, help="first day (UTC) to rebuild")
+    parser.add_argument("--until", type=date.fromisoformat, help="last day (UTC) to rebuild, inclusive")
+    args = parser.parse_args(argv)
+    if args.since and args.until and args.since > args.until:
+        parser.error("--since is after --until")
+
+    with SessionLocal() as db:
+        written = crud.rebuild_job_stats(db, date_from=args.since, date_to=args.until)
+        db.commit()
+    print(f"wrote {written} job stats rows")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
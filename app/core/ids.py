@@ -0,0 +1,56 @@
+# app/core/ids.py
+"""
+Time-ordered UUIDv7 identifiers (RFC 9562).
+
+Layout: 48-bit Unix milliseconds, version 7, a 12-bit counter (rand_a),
+the RFC variant and 62 random bits. The counter starts at a random value in
+its lower half every millisecond and is incremented for ids minted within
+the same millisecond, so ids from one process sort strictly in creation
+order; across processes they are ordered to the millisecond.
+
+They are ordinary uuid.UUID values (same column type, same API type), but
+consecutive inserts land on the right-hand edge of the primary key btree
+instead of a random leaf page.
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+_MS_MASK = (1 << 48) - 1
+_RAND_B_MASK = (1 << 62) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _next_counter() -> tuple[int, int]:
+    global _last_ms, _counter
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms, _counter = now_ms, int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            # Same millisecond, or the clock stepped back: stay monotonic
+            _counter += 1
+            if _counter > 0xFFF: # Counter exhausted: borrow the next millisecond
+                _last_ms, _counter = _last_ms + 1, 0
+        return _last_ms, _counter
+
+
+def uuid7(unix_ms: Optional[int] = None) -> uuid.UUID:
+    """New UUIDv7; `unix_ms` pins the timestamp (random counter, no ordering guarantee within it)."""
+    if unix_ms is None:
+        unix_ms, counter = _next_counter()
+    else:
+        counter = int.from_bytes(os.urandom(2), "big") & 0xFFF
+    rand_b = int.from_bytes(os.urandom(8), "big") & _RAND_B_MASK
+    return uuid.UUID(int=(unix_ms & _MS_MASK) << 80 | 0x7 << 76 | counter << 64 | 0b10 << 62 | rand_b)
+
+
+def uuid7_time(value: uuid.UUID) -> datetime:
+    """When a UUIDv7 was minted (millisecond precision)."""
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
@@ -0,0 +1,196 @@
+# app/core/load_shedding.py
+"""
+Per-route-class concurrency limits with a bounded, deadline-limited queue.
+
+Requests are classified from the method and path before routing:
+
+    auth    /api/v1/auth/*
+    export  /api/v1/admin/* and */export* (long, heavy responses)
+    search  other reads (GET/HEAD, POST /jobs/batch-get)
+    writes  everything else
+
+Each class admits at most LOAD_SHED_LIMITS[class] requests at a time in this
+worker. Further requests wait in a FIFO queue of LOAD_SHED_QUEUE_SIZE; one
+that arrives to a full queue, or is still waiting after
+LOAD_SHED_MAX_WAIT_SECONDS, gets 503 with Retry-After straight away instead of
+joining the threadpool and DB pool backlog. A flood of searches then cannot
+starve logins, since each class only waits behind its own requests.
+
+With LOAD_SHED_ADAPTIVE the limit follows observed latency (AIMD): after each
+window of completed requests it is cut by LIMIT_BACKOFF if their average
+latency exceeded LOAD_SHED_TARGET_LATENCY_MS, and otherwise raised by one if
+requests had to queue, never above the configured limit.
+
+The SSE change stream is exempt: it holds its connection open but is idle.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.request_context import get_request_state
+
+LIMIT_BACKOFF = 0.9
+WINDOW_MIN = 10 # Completed requests per adaptive decision (at least the current limit)
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+_EXEMPT_PATHS = ("/jobs/changes/stream",)
+_READ_POSTS = ("/jobs/batch-get", "/batch") # POSTs that only read (POST /batch runs GET sub-requests)
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    """Route class of a request, or None when it is not limited."""
+    prefix = settings.API_V1_STR
+    if not path.startswith(prefix + "/"):
+        return None # /, /metrics, docs
+    path = path[len(prefix):]
+    if path in _EXEMPT_PATHS:
+        return None
+    if path.startswith("/auth/"):
+        return "auth"
+    if path.startswith("/admin/") or "/export" in path:
+        return "export"
+    if method in _READ_METHODS or path in _READ_POSTS:
+        return "search"
+    return "writes"
+
+
+class Shed(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    """Admission control for one route class; used from a single event loop."""
+
+    def __init__(
+        self, name: str, limit: int, queue_size: int, max_wait: float,
+        target_latency: Optional[float] = None, min_limit: int = 1,
+    ):
+        self.name = name
+        self.max_limit = limit
+        self.min_limit = min(min_limit, limit)
+        self.limit = float(limit)
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.target_latency = target_latency # Seconds; None keeps the limit fixed
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._window_count = 0
+        self._window_latency = 0.0
+        self._saturated = False
+        metrics.record(metrics.LOAD_SHED_LIMIT.labels(name).set, limit)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> float:
+        """Takes a slot, waiting if need be; returns the seconds waited. Raises Shed instead of waiting too long."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return 0.0
+        self._saturated = True
+        if len(self._waiters) >= self.queue_size:
+            raise Shed("queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot() # Granted just as the wait ended: hand it on
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(exc, asyncio.TimeoutError):
+                raise Shed("timeout") from None
+            raise
+        return time.perf_counter() - start
+
+    def release(self, latency: float) -> None:
+        """Returns a slot taken by acquire(); `latency` is how long the request held it."""
+        if self.target_latency is not None:
+            self._observe(latency)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None) # The slot passes straight to the waiter
+                self.in_flight += 1
+
+    def _observe(self, latency: float) -> None:
+        self._window_count += 1
+        self._window_latency += latency
+        if self._window_count < max(WINDOW_MIN, int(self.limit)):
+            return
+        average = self._window_latency / self._window_count
+        limit = self.limit
+        if average > self.target_latency:
+            limit = max(float(self.min_limit), limit * LIMIT_BACKOFF)
+        elif self._saturated:
+            limit = min(float(self.max_limit), limit + 1)
+        self._window_count, self._window_latency, self._saturated = 0, 0.0, False
+        if int(limit) != int(self.limit):
+            metrics.record(metrics.LOAD_SHED_LIMIT.labels(self.name).set, int(limit))
+        self.limit = limit
+
+
+def build_limiters() -> dict[str, ConcurrencyLimiter]:
+    targets = settings.LOAD_SHED_TARGET_LATENCY_MS if settings.LOAD_SHED_ADAPTIVE else {}
+    return {
+        name: ConcurrencyLimiter(
+            name, limit, settings.LOAD_SHED_QUEUE_SIZE, settings.LOAD_SHED_MAX_WAIT_SECONDS,
+            target_latency=targets[name] / 1000 if name in targets else None,
+        )
+        for name, limit in settings.LOAD_SHED_LIMITS.items()
+    }
+
+
+class LoadSheddingMiddleware:
+    """Pure ASGI middleware; unclassified requests and classes without a limit pass straight through."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.limiters = build_limiters()
+        self._queue_wait = {name: metrics.LOAD_SHED_QUEUE_WAIT.labels(name).observe for name in self.limiters}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter = None
+        if scope["type"] == "http":
+            limiter = self.limiters.get(route_class(scope["method"], scope["path"]))
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            waited = await limiter.acquire()
+        except Shed as exc:
+            metrics.record(metrics.LOAD_SHED_REQUESTS.labels(limiter.name, exc.reason).inc)
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry"}, status_code=503,
+                headers={"Retry-After": str(settings.LOAD_SHED_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+        metrics.record(self._queue_wait[limiter.name], waited)
+        state = get_request_state()
+        if state is not None and waited:
+            state.timings["queue"] = waited
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - start)
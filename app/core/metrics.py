@@ -0,0 +1,212 @@
+# app/core/metrics.py
+"""
+Prometheus metrics for the API.
+
+Hot-path code never touches a metric directly: it appends a pre-bound
+`(observe_or_inc, value)` pair to a deque (append is atomic under the GIL, so
+no lock is taken), and a background thread per worker drains the deque into
+prometheus_client. Label sets are bound on a route's first request and cached.
+
+Multiple workers: set PROMETHEUS_MULTIPROC_DIR to an empty, writable directory
+before the app starts. Each worker then writes its samples to mmap files in
+that directory and /metrics aggregates all of them, whichever worker serves
+the scrape.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_context import route_template
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ or "prometheus_multiproc_dir" in os.environ
+
+LATENCY_BUCKETS = (0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.",
+    ["route", "method"], buckets=LATENCY_BUCKETS,
+)
+HTTP_RESPONSES = Counter(
+    "http_responses_total", "HTTP responses by route template and status class.",
+    ["route", "method", "status"],
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests currently being handled.", multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection.", buckets=SQL_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use", "DB connections currently checked out of the pool.", multiprocess_mode="livesum",
+)
+SQL_QUERIES = Counter("sql_queries_total", "SQL statements executed, by route template.", ["route"])
+SQL_QUERY_DURATION = Histogram(
+    "sql_query_duration_seconds", "SQL statement execution time, by route template.", ["route"], buckets=SQL_BUCKETS,
+)
+
+LOAD_SHED_REQUESTS = Counter(
+    "load_shed_requests_total", "Requests refused with 503 by the concurrency limiter.", ["route_class", "reason"],
+)
+LOAD_SHED_QUEUE_WAIT = Histogram(
+    "load_shed_queue_wait_seconds", "Time admitted requests waited for a concurrency slot.",
+    ["route_class"], buckets=LATENCY_BUCKETS,
+)
+LOAD_SHED_LIMIT = Gauge(
+    "load_shed_concurrency_limit", "Current concurrency limit per route class.",
+    ["route_class"], multiprocess_mode="livesum",
+)
+
+CACHE_INVALIDATIONS = Counter(
+    "cache_invalidations_total", "Cache invalidations received from other workers, by entity and kind (keys | flush).",
+    ["entity", "kind"],
+)
+
+OTP_EVENTS = Counter("otp_events_total", "OTP lifecycle events.", ["event"])
+OTP_ISSUED = OTP_EVENTS.labels("issued")
+OTP_VERIFIED = OTP_EVENTS.labels("verified")
+OTP_FAILED = OTP_EVENTS.labels("failed")
+
+EMAIL_SEND_DURATION = Histogram(
+    "email_send_duration_seconds", "Latency of transactional email API calls.", buckets=LATENCY_BUCKETS,
+)
+EMAIL_SEND_ERRORS = Counter("email_send_errors_total", "Failed email sends by reason.", ["reason"])
+
+
+class _Recorder:
+    """Lock-free hand-off from request threads to a per-worker flusher thread."""
+
+    def __init__(self, interval: float = 0.5, max_pending: int = 200_000):
+        self.interval = interval
+        self._pending: deque = deque(maxlen=max_pending)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def __call__(self, fn, value: float = 1.0) -> None:
+        self._pending.append((fn, value))
+        if self._thread is None:
+            self._start()
+
+    def flush(self) -> None:
+        pending = self._pending
+        while pending:
+            try:
+                fn, value = pending.popleft()
+            except IndexError:
+                break
+            fn(value)
+
+    def _run(self) -> None:
+        tick = threading.Event()  # Never set; wait() is an interruptible sleep
+        while True:
+            tick.wait(self.interval)
+            self.flush()
+
+    def _start(self) -> None:
+        with self._start_lock:  # Only taken until the thread exists
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+                self._thread.start()
+
+    def _after_fork(self) -> None:
+        # Threads do not survive fork; samples queued in the parent belong to it.
+        self._pending.clear()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+
+record = _Recorder()
+
+
+class _RouteMetrics:
+    """Label-bound children for one (route, method), created once and cached."""
+
+    __slots__ = ("duration", "sql_count", "sql_duration", "statuses", "route", "method")
+
+    def __init__(self, route: str, method: str):
+        self.route = route
+        self.method = method
+        self.duration = HTTP_REQUEST_DURATION.labels(route, method).observe
+        self.sql_count = SQL_QUERIES.labels(route).inc
+        self.sql_duration = SQL_QUERY_DURATION.labels(route).observe
+        self.statuses: dict[int, object] = {}
+
+    def status(self, code: int):
+        bound = self.statuses.get(code)
+        if bound is None:
+            bound = self.statuses[code] = HTTP_RESPONSES.labels(self.route, self.method, f"{code // 100}xx").inc
+        return bound
+
+
+_route_metrics: dict[tuple[str, str], _RouteMetrics] = {}
+
+
+def route_metrics(route: str, method: str) -> _RouteMetrics:
+    bound = _route_metrics.get((route, method))
+    if bound is None:
+        bound = _route_metrics[(route, method)] = _RouteMetrics(route, method)
+    return bound
+
+
+def observe_sql(state, seconds: float) -> None:
+    """Attributes one executed statement to the request's route."""
+    bound = route_metrics(state.route, state.method)
+    record(bound.sql_count)
+    record(bound.sql_duration, seconds)
+
+
+class PrometheusMiddleware:
+    """Pure ASGI middleware recording latency, in-flight count and status per route."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        record(HTTP_IN_FLIGHT.inc)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record(HTTP_IN_FLIGHT.dec)
+            bound = route_metrics(route_template(scope), scope["method"])
+            record(bound.duration, time.perf_counter() - start)
+            record(bound.status(status_code))
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    record.flush()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        payload = generate_latest(registry)
+    else:
+        payload = generate_latest()
+    return Response(payload, media_type=CONTENT_TYPE_LATEST)
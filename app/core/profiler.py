@@ -0,0 +1,201 @@
+# app/core/profiler.py
+"""
+On-demand sampling profiler for individual requests.
+
+A request is profiled when either
+- it carries the `X-Profile: 1` header and its bearer token belongs to an
+  active admin, or
+- it is picked by PROFILE_SAMPLE_RATE (operator-configured random sampling).
+
+While it runs, a sampler thread snapshots the stacks of the threads working
+on that request every PROFILE_INTERVAL_MS (concurrent requests are left out)
+and the result is written to PROFILE_DIR in collapsed-stack
+format (`frame;frame;frame count`), ready for flamegraph.pl or speedscope. The
+profile name is returned in the `X-Profile-Id` response header.
+
+Requests that are not selected pay for one header lookup and, with a
+non-zero sample rate, one random() call. Only one profile runs at a time.
+"""
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import Context
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.request_context import RequestState, get_request_state, request_state_in
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".collapsed"
+
+# Leaf frames that mean "this thread is parked", not doing request work.
+_IDLE_LEAVES = {"wait", "select", "poll", "accept"}
+
+_active = threading.Lock()
+
+
+# A threadpool worker holds the copied context it runs work in within this
+# many frames of the bottom of its stack (Thread._bootstrap -> worker loop).
+_WORKER_FRAMES = 4
+
+
+class _Sampler(threading.Thread):
+    """
+    Samples only the request's own threads: the event-loop thread while it is
+    inside the request's middleware call (`anchor` is that coroutine's frame),
+    and threadpool workers while they run sync dependencies or the endpoint in
+    a copy of the request's context.
+    """
+
+    def __init__(self, interval: float, anchor, state: RequestState | None):
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.anchor = anchor
+        self.state = state
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def _belongs(self, frame) -> bool:
+        bottom = deque(maxlen=_WORKER_FRAMES)
+        while frame is not None:
+            if frame is self.anchor:
+                return True
+            bottom.append(frame)
+            frame = frame.f_back
+        if self.state is None:
+            return False
+        for frame in bottom:
+            for value in frame.f_locals.values():
+                if isinstance(value, Context) and request_state_in(value) is self.state:
+                    return True
+        return False
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        while not self._stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own or frame.f_code.co_name in _IDLE_LEAVES or not self._belongs(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident) or f"thread-{ident}")
+                stack.reverse()
+                self.samples[";".join(stack)] += 1
+
+    def stop(self) -> Counter:
+        self._stop_event.set()
+        self.join()
+        return self.samples
+
+
+def _profile_name(method: str, path: str, request_id: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    return f"{time.strftime('%Y%m%dT%H%M%S')}-{method}-{slug[:60]}-{request_id}{PROFILE_SUFFIX}"
+
+
+def _write_profile(name: str, samples: Counter, interval: float) -> None:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    path = os.path.join(settings.PROFILE_DIR, name)
+    with open(path, "w") as fh:
+        fh.write(f"# interval_ms={interval * 1000:g} samples={sum(samples.values())}\n")
+        for stack, count in samples.most_common():
+            fh.write(f"{stack} {count}\n")
+    _prune()
+
+
+def _prune() -> None:
+    profiles = list_profiles()
+    for entry in profiles[settings.PROFILE_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(settings.PROFILE_DIR, entry["name"]))
+        except OSError:
+            pass
+
+
+def list_profiles() -> list[dict]:
+    """Captured profiles, newest first."""
+    try:
+        names = [n for n in os.listdir(settings.PROFILE_DIR) if n.endswith(PROFILE_SUFFIX)]
+    except FileNotFoundError:
+        return []
+    entries = []
+    for name in names:
+        stat = os.stat(os.path.join(settings.PROFILE_DIR, name))
+        entries.append({"name": name, "size_bytes": stat.st_size, "created_at": stat.st_mtime})
+    entries.sort(key=lambda e: e["created_at"], reverse=True)
+    return entries
+
+
+def profile_path(name: str) -> str | None:
+    """Resolves a profile name from list_profiles() to a path; None if unknown."""
+    if os.path.basename(name) != name or not name.endswith(PROFILE_SUFFIX):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, name)
+    return path if os.path.isfile(path) else None
+
+
+def _bearer_token(scope: Scope) -> str | None:
+    for key, value in scope["headers"]:
+        if key == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token if scheme.lower() == "bearer" else None
+    return None
+
+
+def _is_admin_token(token: str) -> bool:
+    from app.api.deps import get_user_from_token
+    from app.database import SessionLocal
+
+    with SessionLocal() as db:
+        user = get_user_from_token(db, token)
+        return bool(user and user.is_active and user.is_admin)
+
+
+class ProfilerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def _should_profile(self, scope: Scope) -> bool:
+        if settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+            return True
+        if not any(key == PROFILE_HEADER for key, _ in scope["headers"]):
+            return False
+        token = _bearer_token(scope)
+        return bool(token) and await run_in_threadpool(_is_admin_token, token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not await self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not _active.acquire(blocking=False):
+            await self.app(scope, receive, send)  # Another profile is running
+            return
+
+        state = get_request_state()
+        name = _profile_name(scope["method"], scope["path"], state.request_id if state else str(os.getpid()))
+        interval = settings.PROFILE_INTERVAL_MS / 1000
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", name.encode())]
+            await send(message)
+
+        sampler = _Sampler(interval, sys._getframe(), state)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            samples = sampler.stop()
+            _active.release()
+            await run_in_threadpool(_write_profile, name, samples, interval)
@@ -0,0 +1,136 @@
+# app/core/query_limits.py
+"""
+Bounds on how long a request's SQL may run.
+
+Statement timeout: deps.get_db stores STATEMENT_TIMEOUT_MS for the request's
+route class (see load_shedding.route_class) on the session, and every
+transaction the session begins starts with SET LOCAL statement_timeout, so
+the setting never leaks into the next user of the pooled connection.
+
+Cancellation on disconnect: the pool records which DBAPI connections the
+current request has checked out. QueryCancelMiddleware reads the ASGI receive
+channel on its own (handing the messages on to the app), so it sees
+http.disconnect even while a sync endpoint is blocked in a query; it then
+cancels the running statements at the backend (psycopg2 cancel()), and the
+endpoint fails fast, rolls back and frees its connection. (Request bodies
+here are small JSON, so reading them ahead of the app costs nothing.)
+
+Either way Postgres reports query_canceled (57014), answered with 503.
+"""
+import asyncio
+import threading
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.load_shedding import route_class
+from app.core.request_context import RequestState, get_request_state
+
+STATEMENT_TIMEOUT_KEY = "statement_timeout_ms"
+QUERY_CANCELED = "57014"
+_CONNECTIONS = "db_connections"
+_RECORD_STATE = "request_state"
+_lock = threading.Lock() # Held while cancelling, so a connection cannot be checked in and reused mid-cancel
+
+
+def statement_timeout_ms(scope: Scope) -> Optional[int]:
+    """STATEMENT_TIMEOUT_MS for the request's route class, or None for no limit."""
+    timeout = settings.STATEMENT_TIMEOUT_MS.get(route_class(scope.get("method", ""), scope.get("path", "")))
+    return timeout or None
+
+
+@event.listens_for(Session, "after_begin")
+def _set_statement_timeout(session: Session, transaction, connection) -> None:
+    timeout = session.info.get(STATEMENT_TIMEOUT_KEY)
+    if timeout and connection.dialect.name == "postgresql":
+        # Raw cursor: not counted as one of the request's queries
+        with connection.connection.dbapi_connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL statement_timeout = {int(timeout)}")
+
+
+# -- connections in use by the current request ------------------------------
+
+def track_checkout(dbapi_connection, connection_record) -> None:
+    state = get_request_state()
+    if state is None:
+        return
+    connection_record.info[_RECORD_STATE] = state
+    with _lock:
+        state.extras.setdefault(_CONNECTIONS, set()).add(dbapi_connection)
+
+
+def track_checkin(dbapi_connection, connection_record) -> None:
+    state = connection_record.info.pop(_RECORD_STATE, None)
+    if state is None:
+        return
+    with _lock:
+        state.extras.get(_CONNECTIONS, set()).discard(dbapi_connection)
+
+
+def cancel_queries(state: RequestState) -> int:
+    """Cancels whatever the request's connections are running; returns how many were signalled."""
+    cancelled = 0
+    with _lock:
+        for dbapi_connection in list(state.extras.get(_CONNECTIONS, ())):
+            cancel = getattr(dbapi_connection, "cancel", None)
+            if cancel is not None:
+                cancel()
+                cancelled += 1
+    return cancelled
+
+
+class QueryCancelMiddleware:
+    """Pure ASGI middleware; must run inside RequestContextMiddleware."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        state = get_request_state() if scope["type"] == "http" else None
+        if state is None:
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue = asyncio.Queue()
+        response_done = False
+
+        async def watch() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    if not response_done:
+                        await run_in_threadpool(cancel_queries, state)
+                    return
+
+        async def app_receive() -> Message:
+            message = await messages.get()
+            if message["type"] == "http.disconnect":
+                messages.put_nowait(message) # Every later receive() sees it too
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_done
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done = True
+            await send(message)
+
+        watcher = asyncio.create_task(watch())
+        try:
+            await self.app(scope, app_receive, send_wrapper)
+        finally:
+            response_done = True
+            watcher.cancel()
+
+
+async def query_canceled_handler(request: Request, exc: OperationalError):
+    if getattr(exc.orig, "pgcode", None) != QUERY_CANCELED:
+        raise exc
+    return JSONResponse(status_code=503, content={"detail": "The query took too long and was cancelled"})
@@ -0,0 +1,96 @@
+# app/core/request_context.py
+"""
+Per-request state shared by middleware and instrumentation hooks.
+
+RequestContextMiddleware stores a RequestState in a ContextVar for the
+duration of each HTTP request. Sync endpoints run in the threadpool with a
+copy of the context, so they see the same (mutable) RequestState object.
+"""
+import itertools
+import os
+import time
+from contextvars import Context, ContextVar
+from typing import Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Scope keys set on the sub-requests of POST /api/v1/batch: the batch's session
+# and authenticated user, reused by deps.get_db / deps.get_current_user
+BATCH_SESSION = "app.batch_session"
+BATCH_USER = "app.batch_user"
+
+_request_ids = itertools.count(1)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Low-cardinality route label for a request, e.g. /api/v1/jobs/{job_id}.
+
+    Rebuilt from the matched path parameters rather than from route.path,
+    which only holds the path relative to an included router.
+    """
+    if scope.get("endpoint") is None and scope.get("route") is None:
+        return UNMATCHED_ROUTE
+    path = scope.get("path", "")
+    params = scope.get("path_params")
+    if not params:
+        return path
+    by_value = {str(value): name for name, value in params.items()}
+    return "/".join(
+        "{" + by_value[segment] + "}" if segment in by_value else segment
+        for segment in path.split("/")
+    )
+
+
+class RequestState:
+    __slots__ = ("scope", "request_id", "started_at", "sql_count", "sql_seconds", "timings", "extras")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.request_id = f"{os.getpid()}-{next(_request_ids)}"
+        self.started_at = time.perf_counter()
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.timings: dict[str, float] = {}  # Server-Timing phases, in seconds
+        self.extras: dict = {}  # Free-form slots for other instrumentation
+
+    @property
+    def route(self) -> str:
+        """Route template (e.g. /api/v1/jobs/{job_id}), known once routing has run."""
+        return route_template(self.scope)
+
+    @property
+    def method(self) -> str:
+        return self.scope.get("method", "")
+
+
+_current_request: ContextVar[Optional[RequestState]] = ContextVar("current_request", default=None)
+
+
+def get_request_state() -> Optional[RequestState]:
+    """The current request's state, or None outside a request (scripts, startup)."""
+    return _current_request.get()
+
+
+def request_state_in(context: Context) -> Optional[RequestState]:
+    """The request state of another context, e.g. the copy a threadpool worker runs a sync endpoint in."""
+    return context.get(_current_request)
+
+
+class RequestContextMiddleware:
+    """Pure ASGI middleware; keep it outermost so every other layer sees the state."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _current_request.set(RequestState(scope))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
@@ -4,13 +4,13 @@ import string
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional
 
-from jose import jwt, JWTError
-from passlib.context import CryptContext # For password hashing if needed later, not for OTP
-
 from app.core.config import settings
 from app.schemas.user import TokenPayload # Assuming TokenPayload is in user schemas
 
-# If you were to hash passwords (not for OTP, but for traditional auth)
+# python-jose (and cryptography behind it) is imported on first use rather than
+# at module import: it is the heaviest import on the boot path.
+# passlib is not imported at all until password hashing is actually needed:
+# from passlib.context import CryptContext
 # pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 ALGORITHM = "HS256"
@@ -25,10 +25,12 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
+    from jose import jwt
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def verify_token(token: str, credentials_exception: Exception) -> TokenPayload | None:
+    from jose import jwt, JWTError
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[ALGORITHM]
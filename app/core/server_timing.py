@@ -0,0 +1,136 @@
+# app/core/server_timing.py
+"""
+`Server-Timing` response header with a per-phase breakdown of wall time:
+
+    queue      waiting for a concurrency slot (app/core/load_shedding.py)
+    auth       JWT decode + user lookup (deps.get_current_user; includes its SQL)
+    db         time inside cursor execution (all SQL in the request)
+    orm        time in the crud layer that is not SQL (query building, hydration)
+    commit     the unit-of-work commit in deps.get_db
+    serialize  response validation/serialization (endpoint return -> response start, minus commit)
+    ext        calls to external services (Brevo)
+    total      request start -> response start
+
+Phases are accumulated on the RequestState by cheap markers (two
+perf_counter() calls each) and rendered by ServerTimingMiddleware.
+"""
+import functools
+import inspect
+import time
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_context import get_request_state
+
+ENDPOINT_DONE = "endpoint_done_at"
+CRUD_DEPTH = "crud_depth"
+
+
+class phase:
+    """Context manager adding the enclosed wall time to a named phase."""
+
+    __slots__ = ("name", "state", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.state = get_request_state()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.state is not None:
+            timings = self.state.timings
+            timings[self.name] = timings.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+
+def timed_crud(fn):
+    """Marks a crud function; its non-SQL wall time is counted as `orm`."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        state = get_request_state()
+        if state is None or state.extras.get(CRUD_DEPTH):
+            return fn(*args, **kwargs)  # Nested crud calls count once, in the outermost
+        state.extras[CRUD_DEPTH] = 1
+        sql_before = state.sql_seconds
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            state.extras[CRUD_DEPTH] = 0
+            orm = (time.perf_counter() - start) - (state.sql_seconds - sql_before)
+            state.timings["orm"] = state.timings.get("orm", 0.0) + max(orm, 0.0)
+
+    return wrapper
+
+
+def _mark_endpoint_done() -> None:
+    state = get_request_state()
+    if state is not None:
+        state.extras[ENDPOINT_DONE] = time.perf_counter()
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that notes when the endpoint returns, so serialization can be timed."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **kw):
+                try:
+                    return await endpoint(*args, **kw)
+                finally:
+                    _mark_endpoint_done()
+        else:
+            @functools.wraps(endpoint)
+            def timed_endpoint(*args, **kw):
+                try:
+                    return endpoint(*args, **kw)
+                finally:
+                    _mark_endpoint_done()
+        super().__init__(path, timed_endpoint, **kwargs)
+
+
+def render(state, now: float) -> bytes:
+    timings = state.timings
+    parts = []
+    if "queue" in timings:
+        parts.append(f"queue;dur={timings['queue'] * 1000:.2f}")
+    if "auth" in timings:
+        parts.append(f"auth;dur={timings['auth'] * 1000:.2f}")
+    if state.sql_count:
+        parts.append(f'db;dur={state.sql_seconds * 1000:.2f};desc="{state.sql_count} queries"')
+    for name in ("orm", "commit"):
+        if name in timings:
+            parts.append(f"{name};dur={timings[name] * 1000:.2f}")
+    endpoint_done = state.extras.get(ENDPOINT_DONE)
+    if endpoint_done is not None:
+        serialize = now - endpoint_done - timings.get("commit", 0.0)
+        parts.append(f"serialize;dur={max(serialize, 0.0) * 1000:.2f}")
+    if "ext" in timings:
+        parts.append(f"ext;dur={timings['ext'] * 1000:.2f}")
+    parts.append(f"total;dur={(now - state.started_at) * 1000:.2f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        state = get_request_state() if scope["type"] == "http" else None
+        if state is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                header = render(state, time.perf_counter())
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
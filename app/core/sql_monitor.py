@@ -0,0 +1,70 @@
+# app/core/sql_monitor.py
+"""
+Per-request SQL diagnostics fed by the engine cursor hooks in app/database.py:
+
+- every statement is counted against the current request (RequestState);
+- statements slower than SQL_SLOW_QUERY_MS are logged with their parameters
+  redacted;
+- a statement that, once normalized, runs more than SQL_REPEAT_THRESHOLD
+  times within one request is flagged once (N+1 / repeated lookups).
+"""
+import logging
+import re
+from collections import Counter
+
+from app.core.config import settings
+from app.core.request_context import RequestState
+
+logger = logging.getLogger("app.sql")
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|\?|\$\d+|:\w+")
+_PLACEHOLDER_RUN = re.compile(r"\?(?:\s*,\s*\?)+")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    """Collapses parameters, literal numbers, IN-list length and whitespace."""
+    text = _PLACEHOLDER.sub("?", statement)
+    text = _NUMBER.sub("?", text)
+    text = _PLACEHOLDER_RUN.sub("?...", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def redact(parameters) -> object:
+    """Keeps parameter names/positions and types, never values."""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} parameter sets>"
+        return [f"<{type(value).__name__}>" for value in parameters]
+    return parameters
+
+
+def _describe(state: RequestState | None) -> str:
+    if state is None:
+        return "outside request"
+    return f"{state.method} {state.route} [req {state.request_id}]"
+
+
+def on_statement(state: RequestState | None, statement: str, parameters, elapsed: float) -> None:
+    """Called after every cursor execution."""
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "slow query (%.1f ms) in %s: %s params=%s",
+            elapsed * 1000, _describe(state), _WHITESPACE.sub(" ", statement).strip(), redact(parameters),
+        )
+
+    if state is None or settings.SQL_REPEAT_THRESHOLD <= 0:
+        return
+    repeats = state.extras.get("sql_repeats")
+    if repeats is None:
+        repeats = state.extras["sql_repeats"] = Counter()
+    key = normalize(statement)
+    repeats[key] += 1
+    if repeats[key] == settings.SQL_REPEAT_THRESHOLD + 1:
+        logger.warning(
+            "repeated query in %s: issued more than %d times: %s",
+            _describe(state), settings.SQL_REPEAT_THRESHOLD, key,
+        )
@@ -0,0 +1,6 @@
+# app/core/workers.py
+from uvicorn_worker import UvicornWorker
+
+class ProductionUvicornWorker(UvicornWorker):
+    """Gunicorn worker running the ASGI app on uvloop + httptools, with lifespan events."""
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
@@ -1,10 +1,16 @@
 # app/crud/__init__.py
+# Write helpers only flush; the request's session dependency (deps.get_db)
+# commits once per request.
 from .crud_job import (
+    DuplicateJobError,
+    count_jobs,
     create_job,
     delete_job,
+    find_near_duplicate,
     get_distinct_job_attributes,
     get_job,
     get_jobs,
+    get_jobs_by_ids,
     update_job,
 )
 from .crud_user import (
@@ -18,3 +24,28 @@ from .crud_user import (
     update_user,
     get_valid_otp,
 )
+from .crud_saved_search import (
+    count_saved_searches,
+    create_saved_search,
+    delete_saved_search,
+    get_inbox,
+    get_saved_searches,
+    record_matches,
+)
+from .crud_job_change import (
+    get_job_changes,
+    get_latest_job_change_cursor,
+    prune_job_changes,
+    record_job_change,
+)
+from .crud_job_stats import (
+    adjust_job_stats,
+    get_job_stats,
+    rebuild_job_stats,
+)
+from .crud_idempotency import (
+    get_idempotency_record,
+    lock_idempotency_key,
+    prune_idempotency_keys,
+    save_idempotency_record,
+)
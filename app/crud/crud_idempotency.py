@@ -0,0 +1,53 @@
+# app/crud/crud_idempotency.py
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.models.idempotency import IdempotencyKey
+from app.core.config import settings
+from app.core.server_timing import timed_crud
+
+@timed_crud
+def lock_idempotency_key(db: Session, user_id: int, key: str) -> None:
+    """
+    Transaction-scoped advisory lock on (user, key): a concurrent request with
+    the same key blocks here until the first one commits or rolls back.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return # SQLite serializes writers anyway
+    db.execute(select(func.pg_advisory_xact_lock(user_id, func.hashtext(key))))
+
+@timed_crud
+def get_idempotency_record(db: Session, user_id: int, key: str) -> Optional[IdempotencyKey]:
+    """The unexpired stored response for the key, if any."""
+    record = db.get(IdempotencyKey, (user_id, key))
+    if record is None or _aware(record.expires_at) <= datetime.now(timezone.utc):
+        return None
+    return record
+
+@timed_crud
+def save_idempotency_record(
+    db: Session, user_id: int, key: str, request_hash: str, status_code: int, body: bytes,
+    headers: Optional[dict[str, str]] = None,
+) -> IdempotencyKey:
+    record = db.get(IdempotencyKey, (user_id, key)) # An expired record for the key is overwritten
+    if record is None:
+        record = IdempotencyKey(user_id=user_id, key=key)
+        db.add(record)
+    record.request_hash = request_hash
+    record.status_code = status_code
+    record.response_body = body
+    record.response_headers = headers or None
+    record.expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    db.flush()
+    return record
+
+@timed_crud
+def prune_idempotency_keys(db: Session, now: Optional[datetime] = None) -> int:
+    """Deletes expired records; returns how many."""
+    now = now or datetime.now(timezone.utc)
+    return db.query(IdempotencyKey).filter(IdempotencyKey.expires_at <= now).delete(synchronize_session=False)
+
+def _aware(moment: datetime) -> datetime:
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc) # SQLite returns naive datetimes
@@ -1,19 +1,43 @@
 # app/crud/crud_job.py
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_ # Import or_
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import BigInteger, String, cast, desc, false, func, literal, or_, select, text # Import or_
+from sqlalchemy.dialects.postgresql import BIT
+import json
 import uuid
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Optional
 
-from app.models.job import JobPost
+from app.models.job import JobPost, JobPostDescription
+from app.models.saved_search import SavedSearchMatch
+from app.core.config import settings
+from app.core.server_timing import timed_crud
+from app.services import dedup, geo, invalidation, search_index
+from app.crud import crud_job_change, crud_job_stats, crud_saved_search
 from app.schemas.job import JobPostCreate, JobPostUpdate, JobSearch # Added JobSearch
 
+@timed_crud
 def get_job(db: Session, job_id: uuid.UUID) -> JobPost | None:
-    return db.query(JobPost).filter(JobPost.id == job_id).first()
+    return db.query(JobPost).options(joinedload(JobPost.description_row)).filter(JobPost.id == job_id).first()
 
-def get_jobs(db: Session, skip: int = 0, limit: int = 100, search_params: Optional[JobSearch] = None) -> list[JobPost]:
-    query = db.query(JobPost)
+def _listed(jobs: list[JobPost], include_description: bool) -> list[JobPost]:
+    # Loaded with raiseload unless descriptions were asked for: serialise them as null
+    if not include_description:
+        for job in jobs:
+            job.omit_description()
+    return jobs
+
+@timed_crud
+def get_jobs_by_ids(db: Session, job_ids: list[uuid.UUID], include_description: bool = True) -> list[JobPost]:
+    """Jobs with the given ids in one IN query (unordered; unknown ids are skipped)."""
+    description_loader = joinedload if include_description else raiseload
+    jobs = db.query(JobPost).options(description_loader(JobPost.description_row)).filter(JobPost.id.in_(job_ids)).all()
+    return _listed(jobs, include_description)
 
+def _filtered_jobs(db: Session, search_params: Optional[JobSearch]):
+    """JobPost query with the ilike search filters applied (no ordering or paging)."""
+    query = db.query(JobPost)
     if search_params:
         if search_params.RoleName:
             query = query.filter(JobPost.RoleName.ilike(f"%{search_params.RoleName}%"))
@@ -25,20 +49,184 @@ def get_jobs(db: Session, skip: int = 0, limit: int = 100, search_params: Option
             query = query.filter(JobPost.DepartmentName.ilike(f"%{search_params.DepartmentName}%"))
         if search_params.keyword:
             keyword_search = f"%{search_params.keyword}%"
+            # Matched once up front: as a correlated EXISTS, Postgres would scan job_descriptions again for every partition
+            description_matches = (
+                select(JobPostDescription.job_id).where(JobPostDescription.body.ilike(keyword_search))
+                .cte("description_matches").prefix_with("MATERIALIZED")
+            )
             query = query.filter(
                 or_(
                     JobPost.RoleName.ilike(keyword_search),
                     JobPost.CompanyName.ilike(keyword_search),
                     JobPost.Location.ilike(keyword_search),
                     JobPost.DepartmentName.ilike(keyword_search),
-                    JobPost.JobDescription.ilike(keyword_search),
+                    JobPost.id.in_(select(description_matches.c.job_id)),
                     JobPost.ContactEmail.ilike(keyword_search) # Added ContactEmail
                     # Add other fields you want the generic keyword to search against
                 )
             )
-            
-    return query.order_by(desc(JobPost.PostingDate)).offset(skip).limit(limit).all()
+        near = getattr(search_params, "near", None) # JobListSearch
+        if near:
+            # Jobs sit at their place's centre: match the places within the radius by geohash
+            place = geo.resolve(near)
+            if place is None:
+                return query.filter(false())
+            radius = search_params.radius_km or settings.GEO_DEFAULT_RADIUS_KM
+            query = query.filter(JobPost.geohash.in_(geo.geohashes_near(place, radius)))
+    return query
+
+def _uses_search_index(search_params: Optional[JobSearch]) -> bool:
+    # The index has no coordinates: keyword searches with near= run in the database
+    return bool(
+        search_params and search_params.keyword and not getattr(search_params, "near", None) and search_index.is_ready()
+    )
+
+def _index_filters(search_params: JobSearch) -> dict:
+    return {field: getattr(search_params, field) for field in search_index.FILTER_FIELDS}
+
+@timed_crud
+def get_jobs(
+    db: Session, skip: int = 0, limit: int = 100, search_params: Optional[JobSearch] = None,
+    include_description: bool = False,
+) -> list[JobPost]:
+    # Descriptions live in job_descriptions; load them for the page only when asked (one extra IN query)
+    description_loader = selectinload if include_description else raiseload
+
+    if _uses_search_index(search_params):
+        # Ranked (BM25) keyword search from the in-process index; the other params filter within it
+        job_ids = search_index.search(search_params.keyword, _index_filters(search_params), skip=skip, limit=limit)
+        if job_ids is not None:
+            if not job_ids:
+                return []
+            query = db.query(JobPost).options(description_loader(JobPost.description_row))
+            jobs = {job.id: job for job in query.filter(JobPost.id.in_(job_ids)).all()}
+            return _listed([jobs[job_id] for job_id in job_ids if job_id in jobs], include_description)
+
+    query = _filtered_jobs(db, search_params).options(description_loader(JobPost.description_row))
+    # job_posts is range-partitioned by month on PostingDate: this ordering is an ordered Append over the
+    # partitions' PostingDate indexes, newest month first, so a page only touches the months it spans
+    return _listed(query.order_by(desc(JobPost.PostingDate)).offset(skip).limit(limit).all(), include_description)
+
+@timed_crud
+def count_jobs(db: Session, search_params: Optional[JobSearch] = None, mode: str = "estimated") -> tuple[int, str, str]:
+    """
+    Total for a job listing as (total, method, accuracy).
+
+    mode "exact": COUNT(*) capped at COUNT_EXACT_MAX rows; past the cap the
+    total is a lower bound. mode "estimated": planner statistics (reltuples
+    when unfiltered, the EXPLAIN row estimate otherwise), replaced by an exact
+    count when the estimate is at most COUNT_EXACT_THRESHOLD. Keyword searches
+    served by the search index are always counted exactly in memory.
+    """
+    if _uses_search_index(search_params):
+        total = search_index.count(search_params.keyword, _index_filters(search_params))
+        if total is not None:
+            return total, "exact", "exact"
+
+    query = _filtered_jobs(db, search_params)
+    if mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        filtered = bool(search_params and any(search_params.model_dump().values()))
+        if not filtered:
+            estimate = _table_estimate(db)
+            if estimate is not None:
+                return estimate, "estimated", "table-statistics"
+        else:
+            estimate = _planner_estimate(db, query)
+            if estimate > settings.COUNT_EXACT_THRESHOLD:
+                return estimate, "estimated", "planner-estimate"
+    return _capped_count(db, query, settings.COUNT_EXACT_MAX)
+
+def _capped_count(db: Session, query, cap: int) -> tuple[int, str, str]:
+    # Counting over a LIMITed subquery bounds the cost of huge result sets
+    capped = query.with_entities(JobPost.id).limit(cap + 1).subquery()
+    total = db.query(func.count()).select_from(capped).scalar()
+    if total > cap:
+        return cap, "exact", "lower-bound"
+    return total, "exact", "exact"
 
+def _table_estimate(db: Session) -> Optional[int]:
+    # job_posts is partitioned: sum the partitions' statistics (-1: never analyzed)
+    reltuples = db.execute(text(
+        "SELECT sum(c.reltuples) FILTER (WHERE c.reltuples >= 0) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = 'job_posts'::regclass"
+    )).scalar()
+    return int(reltuples) if reltuples is not None else None
+
+def _planner_estimate(db: Session, query) -> int:
+    # render_postcompile expands IN lists (near=) into plain bind parameters the driver can take
+    compiled = query.with_entities(JobPost.id).statement.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True},
+    )
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+class DuplicateJobError(Exception):
+    """create_job under DEDUP_POLICY=reject: the post is a near-duplicate of an existing job."""
+    def __init__(self, existing_id: uuid.UUID):
+        super().__init__(f"Near-duplicate of job {existing_id}")
+        self.existing_id = existing_id
+
+def _set_location(db_job: JobPost) -> None:
+    """Coordinates of the gazetteer place the free-text Location names (cleared when it names none)."""
+    place = geo.resolve(db_job.Location)
+    db_job.latitude = place.lat if place else None
+    db_job.longitude = place.lon if place else None
+    db_job.geohash = place.geohash if place else None
+
+def _set_fingerprint(db_job: JobPost) -> int:
+    fp = dedup.fingerprint(db_job.CompanyName, db_job.RoleName, db_job.JobDescription)
+    db_job.simhash = dedup.to_signed(fp)
+    db_job.simhash_bands = dedup.bands(fp)
+    return fp
+
+@timed_crud
+def find_near_duplicate(
+    db: Session, fp: int, exclude_id: Optional[uuid.UUID] = None, posted_before: Optional[datetime] = None,
+) -> JobPost | None:
+    """Closest job within DEDUP_MAX_DISTANCE bits of `fp` (newest wins ties), found through the band index."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None # The band lookup needs Postgres array operators and GIN
+    # popcount(simhash XOR fp)
+    xor_bits = cast(JobPost.simhash.op("#")(literal(dedup.to_signed(fp), BigInteger)), BIT(64))
+    distance = func.length(func.replace(cast(xor_bits, String), "0", ""))
+    query = db.query(JobPost).filter(
+        JobPost.simhash_bands.overlap(dedup.bands(fp)),
+        distance <= settings.DEDUP_MAX_DISTANCE,
+    )
+    if exclude_id is not None:
+        query = query.filter(JobPost.id != exclude_id)
+    if posted_before is not None:
+        query = query.filter(JobPost.PostingDate < posted_before)
+    return query.order_by(distance, desc(JobPost.PostingDate)).first()
+
+def _touch(db_job: JobPost) -> None:
+    # The description is a job_descriptions row: editing only it leaves job_posts (and its updated_at
+    # onupdate) alone, and the search index, invalidation versions and snapshots all version on updated_at
+    db_job.updated_at = datetime.now(timezone.utc)
+
+def _merge_into(db: Session, existing: JobPost, job_data: dict) -> JobPost:
+    """DEDUP_POLICY=merge: a repost refreshes the existing job instead of adding a copy."""
+    old_stat = crud_job_stats.stat_key(existing)
+    for key, value in job_data.items():
+        if value is not None:
+            setattr(existing, key, value)
+    existing.PostingDate = datetime.utcnow()
+    if job_data.get("JobDescription") is not None:
+        _touch(existing)
+    _set_fingerprint(existing)
+    _set_location(existing)
+    db.flush()
+    existing.dedup_outcome = "merged"
+    crud_job_stats.adjust_job_stats(db, old_stat, crud_job_stats.stat_key(existing))
+    search_index.stage_upsert(db, existing)
+    invalidation.stage(db, "job", existing.id, existing.updated_at)
+    crud_saved_search.record_matches(db, existing) # The repost may now match searches the old text did not
+    crud_job_change.record_job_change(db, "update", existing)
+    return existing
+
+@timed_crud
 def create_job(db: Session, job: JobPostCreate) -> JobPost:
     job_data = job.model_dump()
     # Convert HttpUrl to string if it's the ApplicationLink
@@ -49,11 +237,26 @@ def create_job(db: Session, job: JobPostCreate) -> JobPost:
         **job_data,
         PostingDate=datetime.utcnow() # Server sets the posting date
     )
+    fp = _set_fingerprint(db_job)
+    _set_location(db_job)
+    if settings.DEDUP_POLICY != "off":
+        duplicate = find_near_duplicate(db, fp)
+        if duplicate is not None:
+            if settings.DEDUP_POLICY == "reject":
+                raise DuplicateJobError(duplicate.id)
+            if settings.DEDUP_POLICY == "merge":
+                return _merge_into(db, duplicate, job_data)
+            db_job.duplicate_of = duplicate.id # flag
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    db.flush()
+    crud_job_stats.adjust_job_stats(db, None, crud_job_stats.stat_key(db_job)) # Rollups, in the same transaction
+    search_index.stage_upsert(db, db_job)
+    invalidation.stage(db, "job", db_job.id, db_job.updated_at) # Other workers' caches, on COMMIT
+    crud_saved_search.record_matches(db, db_job) # Saved-search inboxes, in the same transaction
+    crud_job_change.record_job_change(db, "create", db_job)
     return db_job
 
+@timed_crud
 def update_job(db: Session, db_job: JobPost, job_in: JobPostUpdate) -> JobPost:
     job_data = job_in.model_dump(exclude_unset=True)
 
@@ -61,26 +264,70 @@ def update_job(db: Session, db_job: JobPost, job_in: JobPostUpdate) -> JobPost:
     if 'ApplicationLink' in job_data and job_data['ApplicationLink'] is not None:
         job_data['ApplicationLink'] = str(job_data['ApplicationLink'])
 
+    old_stat = crud_job_stats.stat_key(db_job)
     for key, value in job_data.items():
         setattr(db_job, key, value)
+    if "JobDescription" in job_data:
+        _touch(db_job)
+    if job_data.keys() & {"CompanyName", "RoleName", "JobDescription"}:
+        _set_fingerprint(db_job)
+    if "Location" in job_data:
+        _set_location(db_job)
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    db.flush()
+    crud_job_stats.adjust_job_stats(db, old_stat, crud_job_stats.stat_key(db_job))
+    search_index.stage_upsert(db, db_job)
+    invalidation.stage(db, "job", db_job.id, db_job.updated_at)
+    crud_job_change.record_job_change(db, "update", db_job)
     return db_job
 
+@timed_crud
 def delete_job(db: Session, job_id: uuid.UUID) -> JobPost | None:
     db_job = db.query(JobPost).filter(JobPost.id == job_id).first()
     if db_job:
-        db.delete(db_job)
-        db.commit()
+        # No foreign keys point into partitioned job_posts: clear the references the database used to cascade
+        db.query(SavedSearchMatch).filter(SavedSearchMatch.job_id == job_id).delete(synchronize_session=False)
+        db.query(JobPost).filter(JobPost.duplicate_of == job_id).update(
+            {JobPost.duplicate_of: None}, synchronize_session=False,
+        )
+        db.delete(db_job) # The description goes with it (ORM cascade)
+        db.flush()
+        crud_job_stats.adjust_job_stats(db, crud_job_stats.stat_key(db_job), None)
+        search_index.stage_delete(db, job_id)
+        invalidation.stage(db, "job", job_id)
+        crud_job_change.record_job_change(db, "delete", job_id=job_id)
     return db_job
 
+# Suggestion lists (a DISTINCT over job_posts each) are cached per column for
+# SUGGESTIONS_CACHE_SECONDS and dropped on any job write, ours or another worker's.
+_suggestions: dict[str, tuple[float, list[str]]] = {} # column -> (monotonic expiry, values)
+_suggestions_lock = threading.Lock()
+_suggestions_generation = 0 # Bumped on eviction, so a read that raced a write does not cache its result
+
+def _evict_suggestions(keys=None) -> None:
+    global _suggestions_generation
+    with _suggestions_lock:
+        _suggestions.clear()
+        _suggestions_generation += 1
+
+invalidation.register("job", _evict_suggestions, _evict_suggestions, local=True)
+
+@timed_crud
 def get_distinct_job_attributes(db: Session, column_name: str) -> list[str]:
     """Fetches distinct non-null and non-empty values for a given column in JobPost."""
     # Ensure the column_name is a valid attribute of JobPost to prevent SQL injection like issues
     if not hasattr(JobPost, column_name):
         raise ValueError(f"Invalid column name: {column_name}")
+    cached = _suggestions.get(column_name)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    generation = _suggestions_generation
     
     query_result = db.query(getattr(JobPost, column_name)).distinct().all()
     # Filter out None or empty strings and convert to list of strings
-    return [value for value, in query_result if value and str(value).strip()]
+    values = [value for value, in query_result if value and str(value).strip()]
+    if settings.SUGGESTIONS_CACHE_SECONDS > 0:
+        with _suggestions_lock:
+            if generation == _suggestions_generation:
+                _suggestions[column_name] = (time.monotonic() + settings.SUGGESTIONS_CACHE_SECONDS, values)
+    return values
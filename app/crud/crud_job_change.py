@@ -0,0 +1,64 @@
+# app/crud/crud_job_change.py
+from sqlalchemy.orm import Session
+from sqlalchemy import literal_column, tuple_
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from app.models.job import JobPost, JobChange
+from app.core.server_timing import timed_crud
+from app.schemas.job import JobPostListItem
+
+Cursor = tuple[int, int] # (tx_id, id)
+START: Cursor = (0, 0)
+
+_CURRENT_XID = literal_column("pg_current_xact_id()::text::bigint")
+# Every transaction still in flight has an xid >= this, so rows below it are final
+_VISIBLE_HORIZON = literal_column("pg_snapshot_xmin(pg_current_snapshot())::text::bigint")
+
+def format_cursor(cursor: Cursor) -> str:
+    return f"{cursor[0]}-{cursor[1]}"
+
+def parse_cursor(value: Optional[str]) -> Cursor:
+    """'<tx_id>-<id>' as returned in next_cursor / SSE ids; empty means from the beginning."""
+    if not value:
+        return START
+    tx_id, _, change_id = value.partition("-")
+    return int(tx_id), int(change_id)
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+@timed_crud
+def record_job_change(db: Session, op: str, job: Optional[JobPost] = None, job_id: Optional[uuid.UUID] = None) -> None:
+    """Appends to the outbox in the caller's transaction (call after flushing the job)."""
+    payload = None
+    if job is not None:
+        job_id = job.id
+        payload = JobPostListItem.model_validate(job).model_dump(mode="json", exclude={"JobDescription"})
+    db.add(JobChange(
+        tx_id=_CURRENT_XID if _is_postgres(db) else 0,
+        job_id=job_id,
+        op=op,
+        payload=payload,
+    ))
+    db.flush()
+
+def _visible(db: Session, query):
+    return query.filter(JobChange.tx_id < _VISIBLE_HORIZON) if _is_postgres(db) else query
+
+@timed_crud
+def get_job_changes(db: Session, since: Cursor = START, limit: int = 100) -> list[JobChange]:
+    query = db.query(JobChange).filter(tuple_(JobChange.tx_id, JobChange.id) > tuple_(*since))
+    return _visible(db, query).order_by(JobChange.tx_id, JobChange.id).limit(limit).all()
+
+@timed_crud
+def get_latest_job_change_cursor(db: Session) -> Cursor:
+    latest = _visible(db, db.query(JobChange.tx_id, JobChange.id)).order_by(
+        JobChange.tx_id.desc(), JobChange.id.desc()
+    ).first()
+    return (latest.tx_id, latest.id) if latest else START
+
+@timed_crud
+def prune_job_changes(db: Session, older_than: datetime) -> int:
+    return db.query(JobChange).filter(JobChange.changed_at < older_than).delete(synchronize_session=False)
@@ -0,0 +1,119 @@
+# app/crud/crud_job_stats.py
+from sqlalchemy.orm import Session
+from sqlalchemy import Date, cast, desc, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from collections import Counter
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from app.models.job import JobPost, JobStat
+from app.core.server_timing import timed_crud
+
+StatKey = tuple[date, str, str] # (day, CompanyName or '', Location or '')
+
+# group_by values -> rollup columns
+GROUP_COLUMNS = {"day": JobStat.day, "company": JobStat.CompanyName, "location": JobStat.Location}
+
+def stat_key(job: JobPost) -> StatKey:
+    """The rollup row a job is counted in: the UTC day it was posted, its company and its location."""
+    posted = job.PostingDate
+    posted = posted.astimezone(timezone.utc) if posted.tzinfo else posted # Naive values are UTC (utcnow)
+    return posted.date(), job.CompanyName or "", job.Location or ""
+
+def _insert(db: Session):
+    return (pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert)(JobStat)
+
+@timed_crud
+def adjust_job_stats(db: Session, old: Optional[StatKey], new: Optional[StatKey]) -> None:
+    """
+    Moves one posting from rollup row `old` to `new` (None: the job did not
+    exist before / no longer exists). Concurrent writers counting into the
+    same row queue on its lock until the first commits.
+    """
+    if old == new:
+        return
+    deltas = Counter()
+    if old is not None:
+        deltas[old] -= 1
+    if new is not None:
+        deltas[new] += 1
+    statement = _insert(db).values([ # One statement; sorted so two moves lock their rows in the same order
+        {"day": day, "CompanyName": company, "Location": location, "postings": delta}
+        for (day, company, location), delta in sorted(deltas.items())
+    ])
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[JobStat.day, JobStat.CompanyName, JobStat.Location],
+        set_={"postings": JobStat.postings + statement.excluded.postings},
+    ))
+
+@timed_crud
+def get_job_stats(
+    db: Session,
+    group_by: list[str],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    CompanyName: Optional[str] = None,
+    Location: Optional[str] = None,
+    limit: int = 1000,
+) -> list[dict]:
+    """Postings per group over [date_from, date_to] (days, inclusive); busiest groups first, by day when grouped by day."""
+    columns = [GROUP_COLUMNS[name].label(name) for name in group_by]
+    postings = func.sum(JobStat.postings)
+    query = db.query(*columns, postings.label("postings"))
+    if date_from is not None:
+        query = query.filter(JobStat.day >= date_from)
+    if date_to is not None:
+        query = query.filter(JobStat.day <= date_to)
+    if CompanyName is not None:
+        query = query.filter(JobStat.CompanyName == CompanyName)
+    if Location is not None:
+        query = query.filter(JobStat.Location == Location)
+    if group_by:
+        query = query.group_by(*[GROUP_COLUMNS[name] for name in group_by])
+    order = [JobStat.day] if "day" in group_by else []
+    query = query.having(postings > 0).order_by(*order, desc(postings), *[GROUP_COLUMNS[name] for name in group_by])
+    return [row._asdict() for row in query.limit(limit).all()]
+
+def _posting_day(db: Session):
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.timezone("UTC", JobPost.PostingDate), Date)
+    return func.date(JobPost.PostingDate)
+
+@timed_crud
+def rebuild_job_stats(db: Session, date_from: Optional[date] = None, date_to: Optional[date] = None) -> int:
+    """
+    Recomputes the rollup rows for [date_from, date_to] from job_posts
+    (defaults: the first and last day with a job); returns the rows written.
+    Rows outside the range, e.g. months whose partitions were archived, are
+    kept. Writers block until the rebuild commits, so none is lost or
+    counted twice.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.connection().exec_driver_sql("LOCK TABLE job_stats IN EXCLUSIVE MODE")
+    day = _posting_day(db)
+    if date_from is None or date_to is None:
+        first, last = db.query(func.min(day), func.max(day)).one()
+        if first is None:
+            return 0
+        date_from = date_from or _as_date(first)
+        date_to = date_to or _as_date(last)
+    db.query(JobStat).filter(JobStat.day >= date_from, JobStat.day <= date_to).delete(synchronize_session=False)
+    aggregate = (
+        select(
+            day.label("day"),
+            func.coalesce(JobPost.CompanyName, "").label("CompanyName"),
+            func.coalesce(JobPost.Location, "").label("Location"),
+            func.count().label("postings"),
+        )
+        .where(day >= date_from, day <= date_to)
+        .group_by(day, func.coalesce(JobPost.CompanyName, ""), func.coalesce(JobPost.Location, ""))
+    )
+    result = db.execute(JobStat.__table__.insert().from_select(["day", "CompanyName", "Location", "postings"], aggregate))
+    db.flush()
+    return result.rowcount
+
+def _as_date(value) -> date:
+    if isinstance(value, str): # SQLite returns date() as text
+        return date.fromisoformat(value)
+    return value.date() if isinstance(value, datetime) else value
@@ -0,0 +1,75 @@
+# app/crud/crud_saved_search.py
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import func, insert, literal, select
+
+from app.models.job import JobPost
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.core.server_timing import timed_crud
+from app.services import invalidation, percolator
+from app.schemas.saved_search import SavedSearchCreate
+
+@timed_crud
+def get_saved_searches(db: Session, user_id: int) -> list[SavedSearch]:
+    return db.query(SavedSearch).filter(SavedSearch.user_id == user_id).order_by(SavedSearch.id).all()
+
+@timed_crud
+def count_saved_searches(db: Session, user_id: int) -> int:
+    return db.query(func.count(SavedSearch.id)).filter(SavedSearch.user_id == user_id).scalar()
+
+@timed_crud
+def create_saved_search(db: Session, user_id: int, search_in: SavedSearchCreate) -> SavedSearch:
+    db_search = SavedSearch(user_id=user_id, **search_in.model_dump())
+    db.add(db_search)
+    db.flush()
+    percolator.stage_add(db, db_search)
+    invalidation.stage(db, "saved_search", db_search.id)
+    return db_search
+
+@timed_crud
+def delete_saved_search(db: Session, user_id: int, search_id: int) -> SavedSearch | None:
+    db_search = db.query(SavedSearch).filter(SavedSearch.id == search_id, SavedSearch.user_id == user_id).first()
+    if db_search:
+        db.delete(db_search)
+        db.flush()
+        percolator.stage_remove(db, search_id)
+        invalidation.stage(db, "saved_search", search_id)
+    return db_search
+
+@timed_crud
+def get_inbox(db: Session, user_id: int, after: int = 0, limit: int = 50) -> list[SavedSearchMatch]:
+    matches = (
+        db.query(SavedSearchMatch)
+        .options(joinedload(SavedSearchMatch.job).options(raiseload(JobPost.description_row)))
+        .filter(SavedSearchMatch.user_id == user_id, SavedSearchMatch.id > after)
+        .order_by(SavedSearchMatch.id)
+        .limit(limit)
+        .all()
+    )
+    for match in matches:
+        if match.job is not None:
+            match.job.omit_description() # Inbox entries carry no description
+    return matches
+
+@timed_crud
+def record_matches(db: Session, job: JobPost) -> int:
+    """
+    Percolates a new (or merged, i.e. reposted) job against all saved searches
+    and fills the matching users' inboxes; a search the job already matched
+    gets no second entry.
+    """
+    percolator.ensure_loaded(db)
+    matches = percolator.match({field: getattr(job, field) for field in percolator.KEYWORD_FIELDS})
+    if not matches:
+        return 0
+    already = select(SavedSearchMatch.id).where(
+        SavedSearchMatch.saved_search_id == SavedSearch.id, SavedSearchMatch.job_id == job.id,
+    )
+    # INSERT ... SELECT skips saved searches another worker deleted since they were loaded
+    result = db.execute(
+        insert(SavedSearchMatch).from_select(
+            ["saved_search_id", "user_id", "job_id", "created_at"],
+            select(SavedSearch.id, SavedSearch.user_id, literal(job.id, JobPost.id.type), func.now())
+            .where(SavedSearch.id.in_([search_id for search_id, _ in matches]), ~already.exists()),
+        )
+    )
+    return result.rowcount
@@ -1,27 +1,34 @@
 # app/crud/crud_user.py
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, exc as sa_exc # Added sa_exc for handling unique constraint errors
+from sqlalchemy import or_
 from datetime import datetime, timedelta, timezone
 # import uuid # uuid is not used for User/OTP IDs anymore
 
 from app.models.user import User, OTP
 from app.schemas.user import UserCreate, UserUpdate, OTPRequest, UserProfileUpdate # Added UserProfileUpdate
 from app.core.config import settings
+from app.core.server_timing import timed_crud
+from app.services import invalidation
 
 # User CRUD operations
+@timed_crud
 def get_user(db: Session, user_id: int) -> User | None: # Changed user_id type to int
     return db.query(User).filter(User.id == user_id).first()
 
+@timed_crud
 def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
+@timed_crud
 def get_user_by_mobile(db: Session, mobile_number: str) -> User | None:
     return db.query(User).filter(User.mobile_number == mobile_number).first()
 
+@timed_crud
 def get_user_by_identifier(db: Session, identifier: str) -> User | None:
     """Gets a user by either email or mobile number."""
     return db.query(User).filter(or_(User.email == identifier, User.mobile_number == identifier)).first()
 
+@timed_crud
 def create_user(db: Session, user_in: UserCreate) -> User:
     db_user = User(
         email=user_in.email,
@@ -31,25 +38,21 @@ def create_user(db: Session, user_in: UserCreate) -> User:
         is_admin=False 
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
+    invalidation.stage(db, "user", db_user.id, db_user.updated_at)
     return db_user
 
+@timed_crud
 def update_user(db: Session, db_user: User, user_in: UserUpdate) -> User:
     update_data = user_in.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_user, key, value)
-    try:
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-    except sa_exc.IntegrityError: # Catch potential unique constraint violations (e.g., email/mobile)
-        db.rollback()
-        # Depending on which field caused it, you might want to raise a specific HTTPException
-        # For now, re-raise to be handled by the endpoint or a generic error handler
-        raise
+    db.add(db_user)
+    db.flush() # IntegrityError (email/mobile taken) propagates; deps.get_db rolls the request back
+    invalidation.stage(db, "user", db_user.id, db_user.updated_at)
     return db_user
 
+@timed_crud
 def update_user_profile(db: Session, db_user: User, profile_in: UserProfileUpdate) -> User:
     """Updates a user's full_name and/or mobile_number."""
     updated = False
@@ -68,16 +71,13 @@ def update_user_profile(db: Session, db_user: User, profile_in: UserProfileUpdat
         updated = True
     
     if updated:
-        try:
-            db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
-        except sa_exc.IntegrityError: # Should be less likely here if checks are done above
-            db.rollback()
-            raise # Re-raise to be handled by endpoint
+        db.add(db_user)
+        db.flush() # A racing duplicate mobile raises IntegrityError; the endpoint answers 400 and get_db rolls back
+        invalidation.stage(db, "user", db_user.id, db_user.updated_at)
     return db_user
 
 # OTP CRUD operations
+@timed_crud
 def create_otp(db: Session, otp_code: str, identifier: str, expires_delta: timedelta, user_id: int | None = None) -> OTP: # Changed user_id type to int
     expires_at = datetime.now(timezone.utc) + expires_delta
     db_otp = OTP(
@@ -89,10 +89,10 @@ def create_otp(db: Session, otp_code: str, identifier: str, expires_delta: timed
         used=False
     )
     db.add(db_otp)
-    db.commit()
-    db.refresh(db_otp)
+    db.flush()
     return db_otp
 
+@timed_crud
 def get_valid_otp(db: Session, otp_code: str, identifier: str) -> OTP | None:
     """Retrieves an OTP if it exists, is not used, and has not expired."""
     now = datetime.now(timezone.utc)
@@ -112,9 +112,9 @@ def get_valid_otp(db: Session, otp_code: str, identifier: str) -> OTP | None:
     
     return query.first()
 
+@timed_crud
 def mark_otp_as_used(db: Session, db_otp: OTP) -> OTP:
     db_otp.used = True
     db.add(db_otp)
-    db.commit()
-    db.refresh(db_otp)
+    db.flush()
     return db_otp
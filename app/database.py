@@ -1,19 +1,117 @@
 # app/database.py
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.requests import Request
 
 from app.core.config import settings
+from app.core import metrics, query_limits, sql_monitor
+from app.core.request_context import BATCH_SESSION, get_request_state
+from app.core.server_timing import phase
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.record(metrics.DB_POOL_CHECKOUT_WAIT.observe, time.perf_counter() - start)
+
 
 engine = create_engine(
-    settings.DATABASE_URL
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-# Dependency to get DB session
-def get_db():
+
+@event.listens_for(engine.pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.record(metrics.DB_POOL_IN_USE.inc)
+    query_limits.track_checkout(dbapi_connection, connection_record)
+
+
+@event.listens_for(engine.pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    metrics.record(metrics.DB_POOL_IN_USE.dec)
+    query_limits.track_checkin(dbapi_connection, connection_record)
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    state = get_request_state()
+    if state is not None:
+        state.sql_count += 1
+        state.sql_seconds += elapsed
+        metrics.observe_sql(state, elapsed)
+    if settings.SQL_INSTRUMENTATION_ENABLED:
+        sql_monitor.on_statement(state, statement, parameters, elapsed)
+
+
+@event.listens_for(engine, "handle_error")
+def _on_error(context):
+    # after_cursor_execute does not run for a failed statement
+    if context.connection is not None and context.execution_context is not None:
+        starts = context.connection.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+def warm_pool(connections: int) -> None:
+    """Opens `connections` pooled connections up front so first requests skip the connect handshake."""
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for conn in opened:
+            conn.close()  # Returns it to the pool, still open
+
+# Dependency to get DB session (unit of work: one commit per request)
+def get_db(request: Request):
+    """
+    Yields a session whose work is committed once when the request succeeds
+    and rolled back if anything raises. CRUD functions only flush.
+    """
+    shared = request.scope.get(BATCH_SESSION)
+    if shared is not None:
+        yield shared # Sub-request of POST /batch: the batch's session, committed by the batch
+        return
+    db = SessionLocal()
+    db.info[query_limits.STATEMENT_TIMEOUT_KEY] = query_limits.statement_timeout_ms(request.scope)
+    try:
+        yield db
+        with phase("commit"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+# Opt-out dependency for endpoints that need intermediate commits
+def get_db_manual_commit():
+    """
+    Yields a session without the implicit commit. The endpoint is responsible
+    for calling db.commit(); anything left uncommitted is rolled back on close.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -1,4 +1,6 @@
 # app/models/__init__.py
 from app.database import Base # Import Base
-from .job import JobPost
+from .job import JobPost, JobPostDescription, JobChange, JobStat
 from .user import User, OTP  # Add User and OTP models
+from .saved_search import SavedSearch, SavedSearchMatch
+from .idempotency import IdempotencyKey
@@ -0,0 +1,17 @@
+# app/models/idempotency.py
+from sqlalchemy import Column, String, DateTime, Integer, SmallInteger, LargeBinary, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.database import Base
+
+class IdempotencyKey(Base):
+    """Stored response of a create request sent with an Idempotency-Key, replayed to retries until it expires."""
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True) # Keys are per client
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False) # sha256 of operation + payload; a reused key must match
+    status_code = Column(SmallInteger, nullable=False)
+    response_body = Column(LargeBinary, nullable=False) # Serialized JSON, as sent
+    response_headers = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True) # Endpoint-specific headers only
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True) # IDEMPOTENCY_TTL_SECONDS; pruned by a command
@@ -1,24 +1,124 @@
 # app/models/job.py
-from sqlalchemy import Column, String, Text, DateTime, Enum as SQLAlchemyEnum
-from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy import Column, String, Text, Date, DateTime, Float, Index, BigInteger, Integer, JSON, Enum as SQLAlchemyEnum
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from sqlalchemy import inspect
+from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import text
 from datetime import datetime, timezone # Import timezone
 
+from app.core import ids
 from app.database import Base # Ensure Base is imported from your database setup
 
 class JobPost(Base):
     __tablename__ = "job_posts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    PostingDate = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=True) # Made nullable, added timezone
+    # Range-partitioned by month on PostingDate (app/services/job_partitions.py), so the table's
+    # primary key is (id, PostingDate); the ORM still identifies a post by id alone (__mapper_args__)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=ids.uuid7) # Time-ordered: inserts append to the PK index
+    PostingDate = Column(DateTime(timezone=True), primary_key=True, default=lambda: datetime.now(timezone.utc), nullable=False, index=True) # Partition key; indexed for the default recency ordering
     RoleName = Column(String, index=True, nullable=True) # Added index
     DepartmentName = Column(String, nullable=True)
     Location = Column(String, index=True, nullable=True) # Added index
     CompanyName = Column(String, index=True, nullable=True) # Added index
     ContactEmail = Column(String, nullable=True)
     ApplicationLink = Column(String, nullable=True)
-    JobDescription = Column(Text, nullable=True) # Made nullable
     ReferralStatus = Column(String, nullable=True) # Changed from Enum to String
 
+    # Near-duplicate detection (app/services/dedup.py): SimHash and its tagged LSH bands
+    simhash = Column(BigInteger, nullable=True)
+    simhash_bands = Column(ARRAY(Integer).with_variant(JSON, "sqlite"), nullable=True)
+    duplicate_of = Column(UUID(as_uuid=True), nullable=True) # DEDUP_POLICY=flag; no FK (see job_id below), cleared by crud.delete_job
+
+    # Location resolved against the offline gazetteer (app/services/geo.py); null when it names no known place
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True) # The place's centre; near= searches look places up by it
+
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False) # Renamed to snake_case
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False) # Renamed to snake_case
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False, index=True) # Renamed to snake_case; indexed for incremental snapshots
+
+    # Transient (not a column): set by crud.create_job to "merged" when DEDUP_POLICY=merge folded the post into this one
+    dedup_outcome = None
+
+    # The (wide) description lives in job_descriptions so list scans over
+    # job_posts read narrow rows; crud loads it only when it is needed.
+    # Deleted by the ORM cascade: there is no FK for the database to cascade.
+    description_row = relationship(
+        "JobPostDescription", uselist=False, back_populates="job",
+        primaryjoin="JobPost.id == foreign(JobPostDescription.job_id)",
+        cascade="all, delete-orphan",
+    )
+
+    @property
+    def JobDescription(self) -> str | None:
+        row = self.description_row
+        return row.body if row is not None else None
+
+    @JobDescription.setter
+    def JobDescription(self, value: str | None) -> None:
+        if value is None:
+            self.description_row = None
+        elif self.description_row is None:
+            self.description_row = JobPostDescription(body=value)
+        else:
+            self.description_row.body = value
+
+    def omit_description(self) -> None:
+        """For jobs loaded with raiseload on the description: JobDescription then reads None instead of raising."""
+        if "description_row" in inspect(self).unloaded: # Already loaded in this session: keep it
+            set_committed_value(self, "description_row", None)
+
+    __mapper_args__ = {"primary_key": [id]}
+
+    # Trigram GIN indexes so the ilike '%...%' filters in crud.get_jobs can use an index
+    __table_args__ = (
+        Index("ix_job_posts_RoleName_trgm", "RoleName", postgresql_using="gin", postgresql_ops={"RoleName": "gin_trgm_ops"}),
+        Index("ix_job_posts_CompanyName_trgm", "CompanyName", postgresql_using="gin", postgresql_ops={"CompanyName": "gin_trgm_ops"}),
+        Index("ix_job_posts_Location_trgm", "Location", postgresql_using="gin", postgresql_ops={"Location": "gin_trgm_ops"}),
+        Index("ix_job_posts_DepartmentName_trgm", "DepartmentName", postgresql_using="gin", postgresql_ops={"DepartmentName": "gin_trgm_ops"}),
+        # Near-duplicate candidate lookup: simhash_bands && ARRAY[...]
+        Index("ix_job_posts_simhash_bands", "simhash_bands", postgresql_using="gin"),
+        Index("ix_job_posts_duplicate_of", "duplicate_of", postgresql_where=text('duplicate_of IS NOT NULL')),
+        {"postgresql_partition_by": 'RANGE ("PostingDate")'},
+    )
+
+
+class JobPostDescription(Base):
+    __tablename__ = "job_descriptions"
+
+    # No FK: a foreign key into partitioned job_posts would have to include PostingDate
+    job_id = Column(UUID(as_uuid=True), primary_key=True)
+    body = Column(Text, nullable=False) # Column compression is set by the migration (JOB_DESCRIPTION_COMPRESSION)
+
+    job = relationship(
+        "JobPost", back_populates="description_row", primaryjoin="foreign(JobPostDescription.job_id) == JobPost.id",
+    )
+
+
+class JobChange(Base):
+    """Transactional outbox: one row per job create/update/delete, written in the writer's transaction."""
+    __tablename__ = "job_changes"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    # pg_current_xact_id() of the writing transaction; the feed orders by (tx_id, id) and only
+    # serves transactions older than every in-flight one, so cursors never skip a late commit
+    tx_id = Column(BigInteger, nullable=False, default=0)
+    job_id = Column(UUID(as_uuid=True), nullable=False) # No FK: delete events outlive the job
+    op = Column(String(8), nullable=False) # create | update | delete
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True) # Job fields (no description); null for deletes
+    changed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_job_changes_tx_id_id", "tx_id", "id"),
+    )
+
+
+class JobStat(Base):
+    """Postings per (UTC day of PostingDate, company, location), kept current by crud_job in the writer's transaction."""
+    __tablename__ = "job_stats"
+
+    day = Column(Date, primary_key=True)
+    CompanyName = Column(String, primary_key=True) # '' stands for no company (key columns cannot be null)
+    Location = Column(String, primary_key=True) # '' stands for no location
+    postings = Column(Integer, nullable=False, default=0)
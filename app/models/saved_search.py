@@ -0,0 +1,42 @@
+# app/models/saved_search.py
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+
+from app.database import Base
+
+# Same criteria as schemas.JobSearch; all set criteria must match (ilike substring semantics)
+CRITERIA_FIELDS = ("RoleName", "CompanyName", "Location", "DepartmentName", "keyword")
+
+class SavedSearch(Base):
+    __tablename__ = "saved_searches"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String, nullable=True)
+    RoleName = Column(String, nullable=True)
+    CompanyName = Column(String, nullable=True)
+    Location = Column(String, nullable=True)
+    DepartmentName = Column(String, nullable=True)
+    keyword = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+class SavedSearchMatch(Base):
+    """Per-user inbox entry: a newly created job that matched one of the user's saved searches."""
+    __tablename__ = "saved_search_matches"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True) # Inbox cursor
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    saved_search_id = Column(Integer, ForeignKey("saved_searches.id", ondelete="CASCADE"), nullable=False, index=True) # Indexed for the cascades
+    job_id = Column(UUID(as_uuid=True), nullable=False, index=True) # No FK into partitioned job_posts; cleared by crud.delete_job
+
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    job = relationship("JobPost", primaryjoin="foreign(SavedSearchMatch.job_id) == JobPost.id")
+
+    # Inbox polling: WHERE user_id = ? AND id > ? ORDER BY id LIMIT n
+    __table_args__ = (
+        Index("ix_saved_search_matches_user_id_id", "user_id", "id"),
+    )
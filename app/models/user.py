@@ -9,7 +9,7 @@ from app.database import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True) # Changed to Integer
+    id = Column(Integer, primary_key=True, autoincrement=True) # Changed to Integer
     full_name = Column(String, index=True, nullable=True) # Added full_name
     email = Column(String, unique=True, index=True, nullable=True)
     mobile_number = Column(String, unique=True, index=True, nullable=True)
@@ -23,8 +23,8 @@ class User(Base):
 class OTP(Base):
     __tablename__ = "otps"
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True) # Changed to Integer
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True) # Changed to Integer
+    id = Column(Integer, primary_key=True, autoincrement=True) # Changed to Integer
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True) # Changed to Integer; indexed for get_valid_otp
     email = Column(String, index=True, nullable=True)
     mobile_number = Column(String, index=True, nullable=True)
     otp_code = Column(String, nullable=False)
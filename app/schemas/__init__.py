@@ -1,3 +1,6 @@
 # app/schemas/__init__.py
-from .job import JobPostCreate, JobPostUpdate, JobPostInDB, JobPostBase, JobSearch, SuggestionList
+from .job import JobPostCreate, JobPostUpdate, JobPostInDB, JobPostListItem, JobPostBase, JobSearch, JobListSearch, SuggestionList, JobChange, JobChangeFeed, JobBatchGet, JobBatchGetResult, JobStatsRow, JobStats
 from .user import User, UserCreate, UserUpdate, OTPRequest, OTPVerify, Token, TokenPayload, Msg
+from .admin import ProfileInfo, ProfileList, SnapshotCreate, SnapshotInfo, SnapshotList
+from .saved_search import SavedSearchCreate, SavedSearch, SavedSearchMatch, SavedSearchInbox
+from .batch import BatchSubRequest, BatchSubResponse, BatchRequest, BatchResponse
@@ -0,0 +1,30 @@
+# app/schemas/admin.py
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+
+class ProfileInfo(BaseModel):
+    name: str
+    size_bytes: int
+    created_at: datetime
+
+class ProfileList(BaseModel):
+    profiles: List[ProfileInfo]
+
+class SnapshotCreate(BaseModel):
+    incremental: bool = False # Only what changed since the newest snapshot's watermark
+    include_users: bool = True
+    include_otps: bool = True
+    include_descriptions: bool = False
+
+class SnapshotInfo(BaseModel):
+    name: str
+    created_at: datetime
+    incremental: bool
+    since: Optional[datetime] = None
+    watermark: datetime
+    include_descriptions: bool
+    tables: Dict[str, int] # File (without .parquet) -> rows
+
+class SnapshotList(BaseModel):
+    snapshots: List[SnapshotInfo]
@@ -0,0 +1,21 @@
+# app/schemas/batch.py
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+# One read-only sub-request of POST /batch
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = Field(None, example="bookmarks") # Echoed back to correlate responses
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., example="/api/v1/jobs/?limit=20&Location=Pune") # API path with optional query string
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Any = None # Decoded JSON, or text for other content types
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse] # In request order
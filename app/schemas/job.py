@@ -1,7 +1,7 @@
 # app/schemas/job.py
 from pydantic import BaseModel, HttpUrl, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 import uuid
 
 # Schema for creating a new job post (request)
@@ -38,6 +38,8 @@ class JobPostBase(BaseModel):
     ApplicationLink: Optional[HttpUrl] = None
     JobDescription: str
     ReferralStatus: Optional[str] = None # Changed from Literal to Optional[str]
+    latitude: Optional[float] = None # Of the place Location resolved to (gazetteer); null if unknown
+    longitude: Optional[float] = None
 
     class Config:
         from_attributes = True # Replaces orm_mode = True in Pydantic v2
@@ -46,6 +48,10 @@ class JobPostBase(BaseModel):
 class JobPostInDB(JobPostBase):
     pass # Inherits all fields and config from JobPostBase
 
+# List responses: the description is only loaded when explicitly requested (include_description)
+class JobPostListItem(JobPostBase):
+    JobDescription: Optional[str] = None
+
 class JobSearch(BaseModel):
     RoleName: Optional[str] = None
     CompanyName: Optional[str] = None
@@ -54,5 +60,42 @@ class JobSearch(BaseModel):
     keyword: Optional[str] = Field(None, example="Python Developer") # Generic keyword search
     # Add any other fields you want to be searchable
 
+# GET /jobs filters: the saved-search criteria plus a radius around a gazetteer place (not percolated)
+class JobListSearch(JobSearch):
+    near: Optional[str] = Field(None, example="Bengaluru")
+    radius_km: Optional[float] = None
+
+# Multi-get (POST /jobs/batch-get)
+class JobBatchGet(BaseModel):
+    ids: List[uuid.UUID] = Field(..., min_length=1)
+    include_description: bool = True
+
+class JobBatchGetResult(BaseModel):
+    jobs: List[JobPostListItem] # In request order, duplicates collapsed
+    missing: List[uuid.UUID] # Requested ids with no job
+
+# Change feed (GET /jobs/changes and the SSE stream)
+class JobChange(BaseModel):
+    cursor: str # Resume after this change with since=<cursor> (SSE: the event id / Last-Event-ID)
+    op: str # create | update | delete
+    job_id: uuid.UUID
+    changed_at: datetime
+    job: Optional[dict] = None # Job fields without JobDescription; null for deletes
+
+class JobChangeFeed(BaseModel):
+    changes: List[JobChange]
+    next_cursor: str
+
+# Rollups (GET /jobs/stats); only the grouped fields are set
+class JobStatsRow(BaseModel):
+    day: Optional[date] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    postings: int
+
+class JobStats(BaseModel):
+    group_by: List[str]
+    rows: List[JobStatsRow]
+
 class SuggestionList(BaseModel):
     suggestions: List[str]
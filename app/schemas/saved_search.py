@@ -0,0 +1,38 @@
+# app/schemas/saved_search.py
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from datetime import datetime
+
+from app.schemas.job import JobSearch, JobPostListItem
+
+# Schema for saving a search (request); criteria are the same as GET /jobs filters
+class SavedSearchCreate(JobSearch):
+    name: Optional[str] = Field(None, example="Python roles in Pune")
+
+    @model_validator(mode="after")
+    def require_criteria(self):
+        if not any(getattr(self, field) for field in JobSearch.model_fields):
+            raise ValueError("At least one search criterion is required")
+        return self
+
+# Schema for a saved search (response)
+class SavedSearch(JobSearch):
+    id: int
+    name: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SavedSearchMatch(BaseModel):
+    id: int # Inbox cursor
+    saved_search_id: int
+    job: JobPostListItem
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SavedSearchInbox(BaseModel):
+    matches: List[SavedSearchMatch]
+    next_cursor: int # Pass as `after` on the next poll
@@ -0,0 +1,168 @@
+# app/services/change_feed.py
+"""
+Server-Sent Events over the job_changes outbox.
+
+Each worker runs at most one poller (only while it has SSE subscribers); it
+reads new outbox rows once and fans them out to every connected client's
+queue, so N open streams cost one query per CHANGE_FEED_POLL_SECONDS rather
+than N. A client first catches up from its own cursor straight from the DB,
+then switches to the shared queue, skipping anything it already sent. A
+poller started for the client begins at the newest change, which may be past
+where the client's catch-up ended, so the client keeps reading the DB up to
+the poller's start. Job writes on any worker wake the poller early through
+the invalidation bus.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app import crud, schemas
+from app.core.config import settings
+from app.crud.crud_job_change import Cursor, format_cursor
+from app.database import SessionLocal
+from app.services import invalidation
+
+logger = logging.getLogger("app.change_feed")
+
+
+def to_schema(change) -> schemas.JobChange:
+    return schemas.JobChange(
+        cursor=format_cursor((change.tx_id, change.id)),
+        op=change.op,
+        job_id=change.job_id,
+        changed_at=change.changed_at,
+        job=change.payload,
+    )
+
+
+def _fetch(since: Cursor, limit: int) -> list[tuple[Cursor, schemas.JobChange]]:
+    with SessionLocal() as db:
+        return [((c.tx_id, c.id), to_schema(c)) for c in crud.get_job_changes(db, since=since, limit=limit)]
+
+
+def _latest() -> Cursor:
+    with SessionLocal() as db:
+        return crud.get_latest_job_change_cursor(db)
+
+
+class _Subscriber:
+    __slots__ = ("queue", "overflowed", "poller_start")
+
+    def __init__(self, poller_start: asyncio.Future):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHANGE_FEED_QUEUE_SIZE)
+        self.overflowed = False
+        self.poller_start = poller_start # Cursor the poller delivers after; everything up to it comes from the DB
+
+
+class ChangeFeed:
+    def __init__(self):
+        self._subscribers: set[_Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._start: Optional[asyncio.Future] = None
+
+    def subscribe(self) -> _Subscriber:
+        if self._task is None or self._task.done():
+            self._loop, self._wakeup = asyncio.get_running_loop(), asyncio.Event()
+            self._start = self._loop.create_future()
+            self._task = asyncio.create_task(self._poll(self._start))
+        subscriber = _Subscriber(self._start)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def wake(self, keys=None) -> None:
+        """Polls now rather than after CHANGE_FEED_POLL_SECONDS; safe from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError: # Loop closed
+            pass
+
+    def unsubscribe(self, subscriber: _Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    async def _poll(self, start: asyncio.Future) -> None:
+        cursor = None
+        while cursor is None and self._subscribers:
+            try:
+                cursor = await run_in_threadpool(_latest)
+            except Exception:
+                logger.exception("change feed poller cannot start")
+                await asyncio.sleep(settings.CHANGE_FEED_POLL_SECONDS)
+        if cursor is None:
+            return
+        start.set_result(cursor)
+        while self._subscribers:
+            try:
+                changes = await run_in_threadpool(_fetch, cursor, settings.CHANGE_FEED_PAGE_MAX)
+            except Exception:
+                logger.exception("change feed poll failed")
+                changes = []
+            for item in changes:
+                for subscriber in list(self._subscribers):
+                    try:
+                        subscriber.queue.put_nowait(item)
+                    except asyncio.QueueFull:
+                        # Too far behind: end its stream; the client resumes from its last event id
+                        subscriber.overflowed = True
+                        self._subscribers.discard(subscriber)
+            if changes:
+                cursor = changes[-1][0]
+            if len(changes) < settings.CHANGE_FEED_PAGE_MAX:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.CHANGE_FEED_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+    async def shutdown(self) -> None:
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._start is not None and not self._start.done():
+            self._start.cancel()
+
+
+feed = ChangeFeed()
+invalidation.register("job", feed.wake, feed.wake, local=True)
+
+
+def _event(change: schemas.JobChange) -> str:
+    return f"id: {change.cursor}\nevent: {change.op}\ndata: {change.model_dump_json()}\n\n"
+
+
+async def stream(since: Cursor) -> AsyncIterator[str]:
+    """SSE body: catch-up from `since`, then live events from the shared poller."""
+    subscriber = feed.subscribe() # Subscribe before catching up so nothing falls in between
+    try:
+        sent, poller_start = since, None
+        while True:
+            page = await run_in_threadpool(_fetch, sent, settings.CHANGE_FEED_PAGE_MAX)
+            for cursor, change in page:
+                yield _event(change)
+                sent = cursor
+            if len(page) == settings.CHANGE_FEED_PAGE_MAX:
+                continue
+            if poller_start is not None:
+                break # This read began once everything up to the poller's start was visible
+            # The poller may start past the end of this page: read on from the DB up to its start
+            poller_start = await subscriber.poller_start
+            if sent >= poller_start:
+                break
+        while not subscriber.overflowed:
+            try:
+                cursor, change = await asyncio.wait_for(subscriber.queue.get(), settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if cursor > sent:
+                yield _event(change)
+                sent = cursor
+    finally:
+        feed.unsubscribe(subscriber)
@@ -0,0 +1,73 @@
+# app/services/dedup.py
+"""
+Near-duplicate detection for job posts with 64-bit SimHash.
+
+The fingerprint is built from word 2-shingles of the description plus the
+company and role (weighted so two companies sharing a boilerplate
+description stay far apart). Reposts with small wording changes land within
+a few bits of each other.
+
+Lookup is banded LSH: the fingerprint is split into six bands (11/11/11/11/
+10/10 bits) stored as tagged integers in one GIN-indexed array column. Two
+fingerprints within Hamming distance 5 must agree on at least one band
+(pigeonhole), so candidates come from an index probe (`bands && ARRAY[...]`)
+instead of a scan, and are then checked exactly.
+"""
+import hashlib
+import re
+from typing import Optional
+
+BAND_BITS = (11, 11, 11, 11, 10, 10)
+BANDS = len(BAND_BITS)
+MAX_GUARANTEED_DISTANCE = BANDS - 1
+SHINGLE_WORDS = 2
+IDENTITY_WEIGHT = 8 # company/role features vs. 1 per description shingle
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def _hash64(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+
+
+def _features(company: Optional[str], role: Optional[str], description: Optional[str]) -> dict[str, int]:
+    words = _WORD.findall((description or "").lower())
+    features: dict[str, int] = {}
+    for i in range(max(len(words) - SHINGLE_WORDS + 1, 1 if words else 0)):
+        shingle = " ".join(words[i:i + SHINGLE_WORDS])
+        features[shingle] = features.get(shingle, 0) + 1
+    features[f"company:{(company or '').strip().lower()}"] = IDENTITY_WEIGHT
+    features[f"role:{(role or '').strip().lower()}"] = IDENTITY_WEIGHT
+    return features
+
+
+def fingerprint(company: Optional[str], role: Optional[str], description: Optional[str]) -> int:
+    """Unsigned 64-bit SimHash."""
+    weights = [0] * 64
+    for feature, weight in _features(company, role, description).items():
+        h = _hash64(feature)
+        for bit in range(64):
+            weights[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def bands(fp: int) -> list[int]:
+    """Band values tagged with their band number (band << 16 | value), so equal values in different bands differ."""
+    tagged, shift = [], 0
+    for band, width in enumerate(BAND_BITS):
+        tagged.append(band << 16 | (fp >> shift) & ((1 << width) - 1))
+        shift += width
+    return tagged
+
+
+def distance(a: int, b: int) -> int:
+    return ((a ^ b) & 0xFFFFFFFFFFFFFFFF).bit_count()
+
+
+def to_signed(fp: int) -> int:
+    """Postgres BIGINT is signed."""
+    return fp - (1 << 64) if fp >= 1 << 63 else fp
+
+
+def to_unsigned(value: int) -> int:
+    return value & 0xFFFFFFFFFFFFFFFF
@@ -1,8 +1,26 @@
 # app/services/email_service.py
+import time
 import httpx
 from typing import List, Dict, Any
 
 from app.core.config import settings
+from app.core import metrics
+from app.core.server_timing import phase
+
+# One pooled client per worker (keeps TLS connections to Brevo alive); closed by the app lifespan.
+_http_client: httpx.AsyncClient | None = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 async def send_email_brevo(
     recipient_email: str,
@@ -16,6 +34,7 @@ async def send_email_brevo(
     """
     if not settings.BREVO_API_KEY:
         print("BREVO_API_KEY not configured. Email not sent.")
+        metrics.record(metrics.EMAIL_SEND_ERRORS.labels("not_configured").inc)
         # In a real app, you might want to raise an error or log more formally
         return False
 
@@ -42,26 +61,34 @@ async def send_email_brevo(
         "htmlContent": html_content
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
+    start = time.perf_counter()
+    client = get_http_client()
+    try:
+        with phase("ext"):
             response = await client.post(api_url, headers=headers, json=data)
-            response.raise_for_status() # Raises an HTTPError for bad responses (4XX or 5XX)
-            # Brevo API returns 201 Created for successful email sending
-            if response.status_code == 201:
-                print(f"Email sent successfully to {recipient_email}")
-                return True
-            else:
-                print(f"Failed to send email. Status: {response.status_code}, Response: {response.text}")
-                return False
-        except httpx.HTTPStatusError as e:
-            print(f"HTTP error occurred while sending email: {e.response.status_code} - {e.response.text}")
-            return False
-        except httpx.RequestError as e:
-            print(f"Request error occurred while sending email: {e}")
-            return False
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
+        response.raise_for_status() # Raises an HTTPError for bad responses (4XX or 5XX)
+        # Brevo API returns 201 Created for successful email sending
+        if response.status_code == 201:
+            print(f"Email sent successfully to {recipient_email}")
+            return True
+        else:
+            print(f"Failed to send email. Status: {response.status_code}, Response: {response.text}")
+            metrics.record(metrics.EMAIL_SEND_ERRORS.labels("unexpected_status").inc)
             return False
+    except httpx.HTTPStatusError as e:
+        print(f"HTTP error occurred while sending email: {e.response.status_code} - {e.response.text}")
+        metrics.record(metrics.EMAIL_SEND_ERRORS.labels("http_status").inc)
+        return False
+    except httpx.RequestError as e:
+        print(f"Request error occurred while sending email: {e}")
+        metrics.record(metrics.EMAIL_SEND_ERRORS.labels("request_error").inc)
+        return False
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        metrics.record(metrics.EMAIL_SEND_ERRORS.labels("unexpected").inc)
+        return False
+    finally:
+        metrics.record(metrics.EMAIL_SEND_DURATION.observe, time.perf_counter() - start)
 
 async def send_otp_email(
     email_to: str,
@@ -0,0 +1,154 @@
+# app/services/geo.py
+"""
+Offline geocoding of the free-text job Location against the bundled
+gazetteer (gazetteer.csv: Indian cities, their state, centre coordinates and
+common alternative names), and radius queries over the gazetteer.
+
+A Location such as "Bangalore (Hybrid)" or "Pune / Mumbai" resolves to the
+first place one of its segments names; a state segment ("Aurangabad,
+Maharashtra") settles places that share a name. Unresolvable text
+("Remote") has no coordinates.
+
+A job's coordinates are its place's centre, so "jobs within r km of X" is
+"jobs whose place is within r km of X": the places are found in memory
+through a one-degree grid over the gazetteer, and the jobs by their stored
+geohash (ix_job_posts_geohash), one index probe per place.
+"""
+import csv
+import functools
+import math
+import os
+import re
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "gazetteer.csv")
+GEOHASH_PRECISION = 9 # ~5 m cells: each place's centre gets its own geohash
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_SEPARATORS = re.compile(r"[,/;|]|\s+-\s+|\s+or\s+|\s+and\s+")
+_NOISE = re.compile(r"\(.*?\)|\b(hybrid|remote|onsite|on-site|wfh|india)\b", re.IGNORECASE)
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    lat: float
+    lon: float
+    geohash: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.state}"
+
+
+def geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lon_range, lon) if even else (lat_range, lat)
+        middle = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle (haversine) distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _key(text: str) -> str:
+    return " ".join(text.lower().replace(".", " ").split())
+
+
+class Gazetteer:
+    def __init__(self, places: list[Place], aliases: dict[str, list[Place]]):
+        self.places = places
+        self.by_name = aliases # normalised name or alias -> places with it
+        self.states = {_key(place.state) for place in places}
+        self.grid: dict[tuple[int, int], list[Place]] = defaultdict(list) # (floor lat, floor lon) -> places
+        for place in places:
+            self.grid[(math.floor(place.lat), math.floor(place.lon))].append(place)
+
+    @classmethod
+    def load(cls, path: str = GAZETTEER_PATH) -> "Gazetteer":
+        places, aliases = [], defaultdict(list)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                lat, lon = float(row["lat"]), float(row["lon"])
+                place = Place(row["name"], row["state"], lat, lon, geohash(lat, lon))
+                places.append(place)
+                for name in [row["name"], *filter(None, row["aliases"].split("|"))]:
+                    aliases[_key(name)].append(place)
+        return cls(places, dict(aliases))
+
+    def resolve(self, text: Optional[str]) -> Optional[Place]:
+        """The place a free-text location names, or None."""
+        if not text:
+            return None
+        segments = [_key(_NOISE.sub(" ", segment)) for segment in _SEPARATORS.split(text)]
+        segments = [segment for segment in segments if segment]
+        states = {segment for segment in segments if segment in self.states}
+
+        def pick(candidates: list[Place]) -> Optional[Place]:
+            if states: # A named state rules out same-named places elsewhere
+                candidates = [place for place in candidates if _key(place.state) in states]
+            return candidates[0] if candidates else None
+
+        for segment in segments:
+            place = pick(self.by_name.get(segment, []))
+            if place is not None:
+                return place
+        for segment in segments: # "Electronic City Bengaluru": a known name inside the segment
+            words = segment.split()
+            for size in range(min(len(words), 4), 0, -1):
+                for start in range(len(words) - size + 1):
+                    place = pick(self.by_name.get(" ".join(words[start:start + size]), []))
+                    if place is not None:
+                        return place
+        return None
+
+    def within(self, lat: float, lon: float, radius_km: float) -> list[tuple[Place, float]]:
+        """Places within `radius_km` of a point, nearest first, with their distance."""
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        found = []
+        for cell_lat in range(math.floor(lat - dlat), math.floor(lat + dlat) + 1):
+            for cell_lon in range(math.floor(lon - dlon), math.floor(lon + dlon) + 1):
+                for place in self.grid.get((cell_lat, cell_lon), ()):
+                    distance = distance_km(lat, lon, place.lat, place.lon)
+                    if distance <= radius_km:
+                        found.append((place, distance))
+        return sorted(found, key=lambda item: item[1])
+
+
+@functools.lru_cache(maxsize=1)
+def gazetteer() -> Gazetteer:
+    return Gazetteer.load()
+
+
+@functools.lru_cache(maxsize=4096)
+def resolve(text: Optional[str]) -> Optional[Place]:
+    return gazetteer().resolve(text)
+
+
+def geohashes_near(place: Place, radius_km: float) -> list[str]:
+    """Geohashes of every place within `radius_km` of `place` (itself included)."""
+    return [found.geohash for found, _ in gazetteer().within(place.lat, place.lon, radius_km)]
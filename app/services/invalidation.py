@@ -0,0 +1,253 @@
+# app/services/invalidation.py
+"""
+Cross-worker invalidation of in-process caches over Postgres LISTEN/NOTIFY,
+so a write on one worker (or host) is seen by every worker's caches without
+an external broker.
+
+- Write paths stage (entity, key, version) on the Session. Just before
+  COMMIT they go out as one pg_notify on INVALIDATION_CHANNEL; Postgres
+  delivers it only if the transaction commits.
+- Each worker runs one listener thread on its own connection (outside the
+  pool) and hands the keys to the handlers registered for the entity.
+  Messages a worker sent itself are skipped: handlers registered with
+  local=True are already called after COMMIT for this worker's writes.
+- Messages sent while a listener is disconnected are lost, so a reconnect
+  flushes all caches, as does a transaction that touched too many keys for
+  one payload. The first connect does not: the caches have just loaded, and
+  their periodic refresh covers the moments between loading and listening.
+
+Without Postgres (or with INVALIDATION_ENABLED off) only the local
+handlers run; caches fall back on their own refresh or TTL.
+"""
+import json
+import logging
+import os
+import select as select_module
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.invalidation")
+
+_HOST_NONCE = uuid.uuid4().hex[:8] # Shared by workers forked from one preloaded master; the pid tells them apart
+MAX_PAYLOAD_BYTES = 7900 # NOTIFY payloads must stay under 8000 bytes
+
+Keys = list[tuple[str, Optional[str]]] # (key, version); version is None for deletes or when unknown
+
+
+class Handler(NamedTuple):
+    on_keys: Callable[[Keys], None]
+    on_flush: Callable[[], None]
+    local: bool
+
+
+_handlers: dict[str, dict[Callable, Handler]] = defaultdict(dict) # entity -> on_keys -> handler
+
+
+def register(entity: str, on_keys: Callable[[Keys], None], on_flush: Callable[[], None], local: bool = False) -> None:
+    """
+    Calls `on_keys` with the keys of `entity` other workers changed, and
+    `on_flush` when changes may have been missed. With `local`, `on_keys`
+    also runs after COMMIT for this worker's own writes. Registering the
+    same `on_keys` again replaces it.
+    """
+    _handlers[entity][on_keys] = Handler(on_keys, on_flush, local)
+
+
+def origin() -> str:
+    """Identifies this worker's own messages."""
+    return f"{_HOST_NONCE}-{os.getpid()}"
+
+
+def _call(entity: str, handler: Callable, *args) -> None:
+    try:
+        handler(*args)
+    except Exception:
+        logger.exception("cache invalidation handler for %s failed", entity)
+
+
+def apply(entity: str, keys: Keys) -> None:
+    for handler in list(_handlers.get(entity, {}).values()):
+        _call(entity, handler.on_keys, keys)
+    metrics.record(metrics.CACHE_INVALIDATIONS.labels(entity, "keys").inc)
+
+
+def flush(entities: Optional[list[str]] = None) -> None:
+    for entity in list(_handlers) if entities is None else entities:
+        for handler in list(_handlers.get(entity, {}).values()):
+            _call(entity, handler.on_flush)
+        metrics.record(metrics.CACHE_INVALIDATIONS.labels(entity, "flush").inc)
+
+
+def dispatch(payloads: list[str]) -> None:
+    """Applies NOTIFY payloads received together, one handler call per entity; this worker's own are ignored."""
+    flushed, changed, own = set(), defaultdict(dict), origin()
+    for payload in payloads:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("ignoring malformed invalidation message %.200r", payload)
+            continue
+        if message.get("origin") == own:
+            continue
+        flushed.update(message.get("flush", ()))
+        for entity, keys in message.get("keys", {}).items():
+            changed[entity].update((key, version) for key, version in keys)
+    if flushed:
+        flush(sorted(flushed))
+    for entity, keys in changed.items():
+        if entity not in flushed:
+            apply(entity, list(keys.items()))
+
+
+# -- write path: staged on the Session, sent with the COMMIT ----------------
+
+_PENDING_KEY = "invalidation_pending"
+_SENT_KEY = "invalidation_sent"
+
+
+def stage(db: Session, entity: str, key, version=None) -> None:
+    """Marks `key` of `entity` changed by this transaction; `version` (e.g. updated_at) lets caches skip what they already hold."""
+    pending = db.info.setdefault(_PENDING_KEY, defaultdict(dict))
+    pending[entity][str(key)] = version.isoformat() if hasattr(version, "isoformat") else version
+
+
+def _payload(pending: dict[str, dict[str, Optional[str]]]) -> str:
+    keys = {entity: [[key, version] for key, version in changed.items()] for entity, changed in pending.items()}
+    payload = json.dumps({"origin": origin(), "keys": keys}, separators=(",", ":"))
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        payload = json.dumps({"origin": origin(), "flush": sorted(pending)}, separators=(",", ":"))
+    return payload
+
+
+@event.listens_for(Session, "before_commit")
+def _send_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    session.info[_SENT_KEY] = pending
+    if settings.INVALIDATION_ENABLED and session.get_bind().dialect.name == "postgresql":
+        session.connection().execute(select(func.pg_notify(settings.INVALIDATION_CHANNEL, _payload(pending))))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_local(session: Session) -> None:
+    sent = session.info.pop(_SENT_KEY, None)
+    if not sent:
+        return
+    for entity, changed in sent.items():
+        keys = list(changed.items())
+        for handler in list(_handlers.get(entity, {}).values()):
+            if handler.local:
+                _call(entity, handler.on_keys, keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_SENT_KEY, None)
+
+
+# -- listener ----------------------------------------------------------------
+
+class Listener:
+    """LISTENs on a dedicated connection and dispatches notifications until stopped."""
+
+    POLL_SECONDS = 1.0 # How often the loop checks for stop()
+
+    def __init__(self, engine: Engine, channel: Optional[str] = None):
+        self.engine = engine
+        self.channel = channel or settings.INVALIDATION_CHANNEL
+        self.connected = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _connect(self):
+        # Outside the pool: the connection is held for the worker's lifetime
+        cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+        conn = self.engine.dialect.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _run(self) -> None:
+        backoff, reconnect = 0.5, False
+        while not self._stop.is_set():
+            try:
+                conn = self._connect()
+            except Exception as e:
+                logger.warning("invalidation listener cannot connect (%s); retrying in %.1fs", e, backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, settings.INVALIDATION_RECONNECT_MAX_SECONDS)
+                continue
+            backoff = 0.5
+            if reconnect:
+                flush() # Anything sent while this worker was not listening is lost
+            reconnect = True
+            self.connected.set()
+            try:
+                self._listen(conn)
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning("invalidation listener lost its connection (%s); reconnecting", e)
+            finally:
+                self.connected.clear()
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _listen(self, conn) -> None:
+        idle = 0.0
+        while not self._stop.is_set():
+            if not select_module.select([conn], [], [], self.POLL_SECONDS)[0]:
+                idle += self.POLL_SECONDS
+                if idle >= settings.INVALIDATION_KEEPALIVE_SECONDS: # A dead connection only shows when used
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    idle = 0.0
+                continue
+            idle = 0.0
+            conn.poll()
+            payloads = [notify.payload for notify in conn.notifies]
+            conn.notifies.clear()
+            dispatch(payloads)
+
+
+_listener: Optional[Listener] = None
+
+
+def startup(engine: Engine) -> None:
+    """Starts this worker's listener (Postgres only)."""
+    global _listener
+    if not settings.INVALIDATION_ENABLED or engine.dialect.name != "postgresql" or _listener is not None:
+        return
+    _listener = Listener(engine)
+    _listener.start()
+
+
+def shutdown() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
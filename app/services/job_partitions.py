@@ -0,0 +1,157 @@
+# app/services/job_partitions.py
+"""
+Monthly range partitions of job_posts on PostingDate.
+
+Partitions are named job_posts_pYYYYMM and hold [first of the month, first
+of the next month) in UTC. There is deliberately no DEFAULT partition: with
+only bounded, non-overlapping partitions Postgres appends them in PostingDate
+order, so get_jobs' ORDER BY PostingDate DESC LIMIT n walks the newest
+partition's index and stops there, and a PostingDate predicate prunes whole
+months. The price is that a row outside every partition cannot be inserted,
+so JOB_PARTITION_MONTHS_AHEAD months are kept ready (at startup and by
+python -m app.commands.maintain_job_partitions).
+
+Partitions entirely older than JOB_RETENTION_MONTHS are detached and either
+moved to JOB_ARCHIVE_SCHEMA together with their descriptions, or dropped.
+Nothing references job_posts through a foreign key (it would have to include
+PostingDate), so rows pointing into an archived month (descriptions, saved
+search matches, duplicate_of) are cleaned up here.
+"""
+import re
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+
+PARENT = "job_posts"
+_NAME = re.compile(r"^job_posts_p(\d{4})(\d{2})$")
+_LOCK_KEY = 0x6A6F6270 # pg_advisory_xact_lock key serialising partition DDL across workers
+
+
+def month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT}_p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    match = _NAME.match(name)
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc) if match else None
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """False before the partitioning migration has run (or on a non-Postgres database)."""
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass(:parent)"), {"parent": PARENT}
+    ).scalar() is True
+
+
+def attached_partitions(conn: Connection) -> dict[str, bool]:
+    """Partition name -> whether a concurrent detach of it was interrupted (still pending)."""
+    rows = conn.execute(text(
+        "SELECT c.relname, i.inhdetachpending FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass) ORDER BY c.relname"
+    ), {"parent": PARENT})
+    return dict(rows.all())
+
+
+def _detached_leftovers(conn: Connection) -> list[str]:
+    # Detached by an earlier run that stopped before archiving them
+    rows = conn.execute(text(
+        "SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = current_schema() AND c.relkind = 'r' AND NOT c.relispartition "
+        "AND c.relname LIKE 'job\\_posts\\_p%' ORDER BY c.relname"
+    ))
+    return [name for name, in rows if _NAME.match(name)]
+
+
+def ensure_partitions(conn: Connection, first: datetime, last: datetime) -> list[str]:
+    """Creates the missing monthly partitions from `first`'s month through `last`'s; returns their names."""
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    existing = attached_partitions(conn)
+    created = []
+    month, last = month_start(first), month_start(last)
+    while month <= last:
+        name = partition_name(month)
+        if name not in existing:
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def ensure_ahead(engine: Engine, months_ahead: Optional[int] = None) -> list[str]:
+    """Partitions for the current month and the next `months_ahead` (JOB_PARTITION_MONTHS_AHEAD)."""
+    months_ahead = settings.JOB_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        if not is_partitioned(conn):
+            return []
+        return ensure_partitions(conn, now, add_months(month_start(now), months_ahead))
+
+
+def _detach(engine: Engine, name: str, pending: bool) -> None:
+    # CONCURRENTLY only takes SHARE UPDATE EXCLUSIVE on job_posts, but cannot run in a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name} {'FINALIZE' if pending else 'CONCURRENTLY'}"))
+
+
+def _archive_detached(conn: Connection, name: str, mode: str) -> int:
+    rows = conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+    schema = settings.JOB_ARCHIVE_SCHEMA
+    if mode == "detach":
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        conn.execute(text(
+            f"CREATE TABLE {schema}.job_descriptions_{name.rsplit('_', 1)[1]} AS "
+            f"SELECT d.* FROM job_descriptions d JOIN {name} p ON p.id = d.job_id"
+        ))
+    conn.execute(text(f"DELETE FROM job_descriptions d USING {name} p WHERE d.job_id = p.id"))
+    conn.execute(text(f"DELETE FROM saved_search_matches m USING {name} p WHERE m.job_id = p.id"))
+    conn.execute(text(f"UPDATE {PARENT} SET duplicate_of = NULL WHERE duplicate_of IN (SELECT id FROM {name})"))
+    if mode == "detach":
+        conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+    else:
+        conn.execute(text(f"DROP TABLE {name}"))
+    return rows
+
+
+def archive_expired(engine: Engine, retention_months: int, mode: str, now: Optional[datetime] = None) -> dict[str, int]:
+    """Detaches and archives (mode "detach") or drops (mode "drop") partitions older than the window; name -> rows."""
+    if mode not in ("detach", "drop"):
+        raise ValueError(f"Unknown archive mode: {mode}")
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -retention_months)
+    with engine.connect() as conn:
+        if not is_partitioned(conn):
+            return {}
+        attached = attached_partitions(conn)
+        leftovers = _detached_leftovers(conn)
+
+    expired = []
+    for name, pending in attached.items():
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            _detach(engine, name, pending)
+            expired.append(name)
+    expired += [name for name in leftovers if add_months(partition_month(name), 1) <= cutoff]
+
+    archived = {}
+    for name in expired:
+        with engine.begin() as conn: # One transaction per month: a failure leaves that month detached, retried next run
+            archived[name] = _archive_detached(conn, name, mode)
+    return archived
@@ -0,0 +1,245 @@
+# app/services/percolator.py
+"""
+In-memory percolator for saved searches: instead of re-running every saved
+query when a job is created, the saved criteria are indexed and the new job
+is matched against them.
+
+Criteria have get_jobs semantics (case-insensitive substring per field; the
+keyword may occur in any searchable field; all set criteria must hold). Each
+saved search is anchored under one trigram of its longest needle, per field:
+a job can only match if its text for that field contains the trigram. Matching
+a job therefore looks up the job's trigrams, and only those candidates are
+verified in full. Needles shorter than three characters are always verified.
+
+Saved searches are loaded at startup. Those committed by this worker are
+applied after COMMIT; those created or deleted by other workers arrive over
+the invalidation bus (LISTEN/NOTIFY). As a backstop, a background thread
+reloads them all every SAVED_SEARCH_RELOAD_SECONDS, off the write path.
+Changes applied while a reload reads the DB are replayed onto the reloaded
+percolator before it is swapped in, so none are lost.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services import invalidation
+
+logger = logging.getLogger("app.percolator")
+
+CRITERIA_FIELDS = ("RoleName", "CompanyName", "Location", "DepartmentName", "keyword")
+# Fields the generic keyword is matched against (as in crud.get_jobs)
+KEYWORD_FIELDS = ("RoleName", "CompanyName", "Location", "DepartmentName", "JobDescription", "ContactEmail")
+
+
+class Criteria(NamedTuple):
+    user_id: int
+    needles: tuple[tuple[str, str], ...] # (field, lowercased needle)
+
+
+Change = tuple[int, Optional[int], Optional[dict[str, Optional[str]]]] # (search id, user id, criteria; None removes)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class Percolator:
+    def __init__(self):
+        self.searches: dict[int, Criteria] = {}
+        self.buckets: dict[tuple[str, str], set[int]] = defaultdict(set) # (field, trigram) -> search ids
+        self.anchor_of: dict[int, tuple[str, str]] = {}
+        self.unanchored: set[int] = set()
+
+    def add(self, search_id: int, user_id: int, criteria: dict[str, Optional[str]]) -> None:
+        self.remove(search_id)
+        needles = tuple((field, value.lower()) for field, value in criteria.items() if value)
+        if not needles:
+            return
+        self.searches[search_id] = Criteria(user_id, needles)
+        field, needle = max(needles, key=lambda n: len(n[1]))
+        grams = _trigrams(needle)
+        if not grams:
+            self.unanchored.add(search_id)
+            return
+        # Spread searches across buckets: anchor on the least crowded trigram
+        gram = min(sorted(grams), key=lambda g: len(self.buckets.get((field, g), ())))
+        self.buckets[(field, gram)].add(search_id)
+        self.anchor_of[search_id] = (field, gram)
+
+    def remove(self, search_id: int) -> None:
+        if self.searches.pop(search_id, None) is None:
+            return
+        self.unanchored.discard(search_id)
+        anchor = self.anchor_of.pop(search_id, None)
+        if anchor is not None:
+            bucket = self.buckets[anchor]
+            bucket.discard(search_id)
+            if not bucket:
+                del self.buckets[anchor]
+
+    def match(self, job: dict[str, Optional[str]]) -> list[tuple[int, int]]:
+        """(saved search id, user id) for every saved search the job satisfies."""
+        texts = {field: (job.get(field) or "").lower() for field in KEYWORD_FIELDS}
+        texts["keyword"] = "\n".join(texts[field] for field in KEYWORD_FIELDS)
+        candidates = set(self.unanchored)
+        for field in CRITERIA_FIELDS:
+            for gram in _trigrams(texts[field]):
+                bucket = self.buckets.get((field, gram))
+                if bucket:
+                    candidates |= bucket
+        matches = []
+        for search_id in candidates:
+            criteria = self.searches[search_id]
+            if all(needle in texts[field] for field, needle in criteria.needles):
+                matches.append((search_id, criteria.user_id))
+        return matches
+
+
+# -- process-wide percolator ------------------------------------------------
+
+_percolator = Percolator()
+_lock = threading.Lock()
+_reloading = threading.Lock() # One full load at a time
+_replay: Optional[list[Change]] = None # While a load reads the DB: changes applied meanwhile
+_loaded_at = 0.0 # monotonic time of the last full load (0 = never)
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+_session_factory = None # Set by startup(); used by the refresher and flushes
+
+
+def _criteria(search) -> dict[str, Optional[str]]:
+    return {field: getattr(search, field) for field in CRITERIA_FIELDS}
+
+
+def _apply_to(percolator: Percolator, changes: list[Change]) -> None:
+    for search_id, user_id, criteria in changes:
+        if criteria is None:
+            percolator.remove(search_id)
+        else:
+            percolator.add(search_id, user_id, criteria)
+
+
+def _apply(changes: list[Change]) -> None:
+    with _lock:
+        _apply_to(_percolator, changes)
+        if _replay is not None:
+            _replay.extend(changes)
+
+
+def load(db: Session) -> None:
+    """Replaces the percolator with every saved search in the DB."""
+    global _percolator, _loaded_at, _replay
+    from app.models.saved_search import SavedSearch
+    with _reloading:
+        with _lock:
+            _replay = []
+        try:
+            fresh = Percolator()
+            for search in db.execute(select(SavedSearch)).scalars():
+                fresh.add(search.id, search.user_id, _criteria(search))
+            with _lock:
+                # Changes the SELECT may have missed; those it saw are re-applied, which is harmless
+                _apply_to(fresh, _replay)
+                _percolator, _loaded_at = fresh, time.monotonic()
+        finally:
+            with _lock:
+                _replay = None
+
+
+def ensure_loaded(db: Session) -> None:
+    """Loads once if startup() did not (scripts, tests); never a per-write poll."""
+    if not _loaded_at:
+        load(db)
+
+
+def match(job: dict[str, Optional[str]]) -> list[tuple[int, int]]:
+    with _lock:
+        return _percolator.match(job)
+
+
+def refresh(session_factory) -> None:
+    with session_factory() as db:
+        load(db)
+
+
+def startup(session_factory) -> None:
+    """Loads the saved searches and starts the periodic reload."""
+    global _refresher, _session_factory
+    _session_factory = session_factory
+    refresh(session_factory)
+    if settings.SAVED_SEARCH_RELOAD_SECONDS > 0 and _refresher is None:
+        _stop.clear()
+        _refresher = threading.Thread(target=_refresh_loop, args=(session_factory,), name="percolator-refresh", daemon=True)
+        _refresher.start()
+
+
+def shutdown() -> None:
+    global _refresher
+    _stop.set()
+    if _refresher is not None:
+        _refresher.join(timeout=5)
+        _refresher = None
+
+
+def _refresh_loop(session_factory) -> None:
+    while not _stop.wait(settings.SAVED_SEARCH_RELOAD_SECONDS):
+        try:
+            refresh(session_factory)
+        except Exception:
+            logger.exception("saved search reload failed")
+
+
+def _flush() -> None:
+    """Changes may have been missed: reload now, or on next use before startup()."""
+    global _loaded_at
+    if _session_factory is not None:
+        refresh(_session_factory)
+    else:
+        _loaded_at = 0.0
+
+
+def _invalidate(keys: invalidation.Keys) -> None:
+    """Saved searches another worker created or deleted: re-read them by id."""
+    from app.database import SessionLocal
+    from app.models.saved_search import SavedSearch
+    search_ids = [int(key) for key, _ in keys]
+    with (_session_factory or SessionLocal)() as db:
+        found = db.execute(select(SavedSearch).where(SavedSearch.id.in_(search_ids))).scalars().all()
+    _apply(
+        [(search_id, None, None) for search_id in search_ids]
+        + [(search.id, search.user_id, _criteria(search)) for search in found]
+    )
+
+
+invalidation.register("saved_search", _invalidate, _flush)
+
+
+# -- saved-search writes, applied once the transaction commits --------------
+
+_PENDING_KEY = "percolator_pending"
+
+
+def stage_add(db: Session, search) -> None:
+    db.info.setdefault(_PENDING_KEY, []).append((search.id, search.user_id, _criteria(search)))
+
+
+def stage_remove(db: Session, search_id: int) -> None:
+    db.info.setdefault(_PENDING_KEY, []).append((search_id, None, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,644 @@
+# app/services/search_index.py
+"""
+Embedded inverted-index search over job posts (SEARCH_INDEX_ENABLED).
+
+- RoleName, CompanyName, Location, DepartmentName and JobDescription are
+  tokenized into per-field posting lists: parallel array('I') doc ordinals
+  and array('H') term frequencies, appended in ordinal order.
+- Queries match all terms and rank with BM25F (per-field boosts and length
+  normalisation); the four short fields double as substring filters, like
+  the ilike filters in crud.get_jobs.
+- Deletes are tombstones; updates are delete + re-add. Compaction drops
+  dead ordinals when the index is snapshotted.
+- Snapshots are one file (JSON header + raw arrays). Posting lists are used
+  straight from the mmap, so a restart (and every worker) shares the page
+  cache instead of rebuilding; anything written since the snapshot's
+  watermark is caught up from the DB: rows by updated_at, deletes from the
+  job_changes outbox, archived months by the oldest PostingDate left.
+- Searches share the index; writes take it exclusively. A snapshot is
+  written and reloaded outside the lock from an index frozen for the
+  duration (this worker's writes meanwhile queue and are replayed onto the
+  reloaded index before it is swapped in).
+- crud stages changes on the Session; they are applied after COMMIT (and
+  dropped on rollback), so the index never shows uncommitted rows. Other
+  workers' writes arrive over the invalidation bus (LISTEN/NOTIFY) and are
+  re-read by id; the periodic refresh is the backstop.
+"""
+import contextlib
+import fcntl
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import threading
+import time
+import uuid
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services import invalidation
+
+logger = logging.getLogger("app.search")
+
+FIELDS = ("RoleName", "CompanyName", "Location", "DepartmentName", "JobDescription")
+FILTER_FIELDS = FIELDS[:4]
+K1 = 1.2
+B = 0.75
+MAX_TF = 0xFFFF
+SNAPSHOT_MAGIC = b"JOBIDX1\n"
+# Re-read rows updated slightly before the watermark: a transaction that
+# committed late may carry an older updated_at. Re-adding a doc is idempotent.
+CATCH_UP_OVERLAP = timedelta(seconds=30)
+
+_TOKEN = re.compile(r"[^\W_]+")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class SearchIndex:
+    """Not thread-safe by itself; the module-level functions guard it with _rw."""
+
+    def __init__(self):
+        self.boosts = [float(settings.SEARCH_FIELD_BOOSTS.get(field, 1.0)) for field in FIELDS]
+        self.ids = bytearray() # 16 bytes per ordinal
+        self.live = bytearray() # 1 = live, 0 = tombstone
+        self.dates = array("d") # PostingDate as epoch seconds (tie-break / recency)
+        self.updated = array("d") # updated_at as epoch seconds, to skip unchanged rows on catch-up
+        self.lengths = [array("I") for _ in FIELDS]
+        self.total_lengths = [0] * len(FIELDS)
+        self.values = [[""] for _ in FILTER_FIELDS] # distinct lowercased filter values, 0 = empty
+        self.value_lookup = [{"": 0} for _ in FILTER_FIELDS]
+        self.value_ids = [array("I") for _ in FILTER_FIELDS]
+        self.ordinal_of: dict[bytes, int] = {}
+        # Postings: `postings` (mutable arrays) shadows `base_vocab` (offsets into the mmap)
+        self.postings: list[dict[str, tuple[array, array]]] = [{} for _ in FIELDS]
+        self.base_vocab: list[dict[str, tuple[int, int]]] = [{} for _ in FIELDS]
+        self.base_docs: list = [None] * len(FIELDS)
+        self.base_tfs: list = [None] * len(FIELDS)
+        self._mmap: Optional[mmap.mmap] = None
+        self.watermark: Optional[datetime] = None
+        self.deletes_checked_at: Optional[datetime] = None # job_changes deletes applied up to here
+        self.posting_floor: Optional[datetime] = None # Oldest PostingDate in the DB at the last catch-up
+        self.changes_since_snapshot = 0
+
+    # -- documents ---------------------------------------------------------
+
+    @property
+    def live_count(self) -> int:
+        return len(self.ordinal_of)
+
+    @property
+    def dead_count(self) -> int:
+        return len(self.live) - self.live_count
+
+    def add(self, doc: tuple) -> None:
+        """doc: (id, PostingDate, RoleName, CompanyName, Location, DepartmentName, JobDescription, updated_at)."""
+        job_id, posting_date, *texts, updated_at = doc
+        self.remove(job_id)
+        ordinal = len(self.live)
+        key = job_id.bytes
+        self.ids += key
+        self.live.append(1)
+        self.ordinal_of[key] = ordinal
+        self.dates.append((_aware(posting_date) or _EPOCH).timestamp())
+        self.updated.append((_aware(updated_at) or _EPOCH).timestamp())
+        for f, text in enumerate(texts):
+            tokens = tokenize(text)
+            self.lengths[f].append(len(tokens))
+            self.total_lengths[f] += len(tokens)
+            for term, tf in Counter(tokens).items():
+                docs, tfs = self._mutable_postings(f, term)
+                docs.append(ordinal)
+                tfs.append(min(tf, MAX_TF))
+            if f < len(FILTER_FIELDS):
+                self.value_ids[f].append(self._value_id(f, (text or "").lower()))
+        updated_at = _aware(updated_at)
+        if updated_at is not None and (self.watermark is None or updated_at > self.watermark):
+            self.watermark = updated_at
+        self.changes_since_snapshot += 1
+
+    def is_current(self, job_id: uuid.UUID, updated_at: Optional[datetime]) -> bool:
+        ordinal = self.ordinal_of.get(job_id.bytes)
+        return ordinal is not None and self.updated[ordinal] == (_aware(updated_at) or _EPOCH).timestamp()
+
+    def remove(self, job_id: uuid.UUID) -> bool:
+        ordinal = self.ordinal_of.pop(job_id.bytes, None)
+        if ordinal is None:
+            return False
+        self.live[ordinal] = 0
+        for f in range(len(FIELDS)):
+            self.total_lengths[f] -= self.lengths[f][ordinal]
+        self.changes_since_snapshot += 1
+        return True
+
+    def _value_id(self, f: int, value: str) -> int:
+        vid = self.value_lookup[f].get(value)
+        if vid is None:
+            vid = self.value_lookup[f][value] = len(self.values[f])
+            self.values[f].append(value)
+        return vid
+
+    # -- postings ----------------------------------------------------------
+
+    def _base_postings(self, f: int, term: str):
+        location = self.base_vocab[f].get(term)
+        if location is None:
+            return None
+        offset, count = location
+        return self.base_docs[f][offset:offset + count], self.base_tfs[f][offset:offset + count]
+
+    def _get_postings(self, f: int, term: str):
+        return self.postings[f].get(term) or self._base_postings(f, term)
+
+    def _mutable_postings(self, f: int, term: str) -> tuple[array, array]:
+        entry = self.postings[f].get(term)
+        if entry is None:
+            base = self._base_postings(f, term)
+            entry = (array("I", base[0]), array("H", base[1])) if base else (array("I"), array("H"))
+            self.postings[f][term] = entry
+        return entry
+
+    def _terms(self, f: int) -> Iterable[str]:
+        return set(self.base_vocab[f]) | set(self.postings[f])
+
+    # -- search ------------------------------------------------------------
+
+    def search(self, query: str, filters: Optional[dict[str, str]] = None, skip: int = 0, limit: int = 100) -> list[uuid.UUID]:
+        if limit <= 0:
+            return []
+        hits, scores = self._match(query, filters)
+        top = heapq.nlargest(skip + limit, hits, key=lambda o: (scores[o], self.dates[o]))
+        return [uuid.UUID(bytes=bytes(self.ids[o * 16:o * 16 + 16])) for o in top[skip:]]
+
+    def count(self, query: str, filters: Optional[dict[str, str]] = None) -> int:
+        return len(self._match(query, filters)[0])
+
+    def _match(self, query: str, filters: Optional[dict[str, str]]) -> tuple[list[int], dict[int, float]]:
+        """Live ordinals matching every query term and the filters, with their BM25F scores."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return [], {}
+        allowed = self._allowed_values(filters)
+        if allowed is not None and any(not vids for vids in allowed.values()):
+            return [], {}
+        n = self.live_count
+        averages = [(total / n) if n else 1.0 for total in self.total_lengths]
+        scores: dict[int, float] = {}
+        matched: Optional[set[int]] = None
+        for term in terms:
+            weighted: dict[int, float] = {}
+            for f in range(len(FIELDS)):
+                entry = self._get_postings(f, term)
+                if not entry:
+                    continue
+                lengths, boost, average = self.lengths[f], self.boosts[f], averages[f] or 1.0
+                for ordinal, tf in zip(*entry):
+                    if self.live[ordinal]:
+                        norm = 1 - B + B * lengths[ordinal] / average
+                        weighted[ordinal] = weighted.get(ordinal, 0.0) + boost * tf / norm
+            if not weighted:
+                return [], {}
+            idf = math.log(1 + (n - len(weighted) + 0.5) / (len(weighted) + 0.5))
+            matched = set(weighted) if matched is None else matched & weighted.keys() # all terms must match
+            for ordinal in matched:
+                w = weighted[ordinal]
+                scores[ordinal] = scores.get(ordinal, 0.0) + idf * w * (K1 + 1) / (K1 + w)
+
+        hits = [o for o in matched if allowed is None or self._passes(o, allowed)]
+        return hits, scores
+
+    def _allowed_values(self, filters: Optional[dict[str, str]]) -> Optional[dict[int, set[int]]]:
+        if not filters:
+            return None
+        allowed = {}
+        for field, needle in filters.items():
+            if not needle:
+                continue
+            f = FILTER_FIELDS.index(field)
+            needle = needle.lower()
+            allowed[f] = {vid for vid, value in enumerate(self.values[f]) if needle in value}
+        return allowed or None
+
+    def _passes(self, ordinal: int, allowed: dict[int, set[int]]) -> bool:
+        return all(self.value_ids[f][ordinal] in vids for f, vids in allowed.items())
+
+    # -- snapshots ---------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Writes a compacted snapshot atomically (tmp file + rename)."""
+        live = [o for o in range(len(self.live)) if self.live[o]]
+        remap = {old: new for new, old in enumerate(live)}
+        blobs: dict[str, array | bytes] = {
+            "ids": b"".join(bytes(self.ids[o * 16:o * 16 + 16]) for o in live),
+            "dates": array("d", (self.dates[o] for o in live)),
+            "updated": array("d", (self.updated[o] for o in live)),
+        }
+        vocab = []
+        for f, field in enumerate(FIELDS):
+            blobs[f"len_{field}"] = array("I", (self.lengths[f][o] for o in live))
+            if f < len(FILTER_FIELDS):
+                blobs[f"vid_{field}"] = array("I", (self.value_ids[f][o] for o in live))
+            docs_out, tfs_out, field_vocab = array("I"), array("H"), {}
+            for term in sorted(self._terms(f)):
+                start = len(docs_out)
+                for ordinal, tf in zip(*self._get_postings(f, term)):
+                    new = remap.get(ordinal)
+                    if new is not None:
+                        docs_out.append(new)
+                        tfs_out.append(tf)
+                if len(docs_out) > start:
+                    field_vocab[term] = (start, len(docs_out) - start)
+            blobs[f"docs_{field}"], blobs[f"tfs_{field}"] = docs_out, tfs_out
+            vocab.append(field_vocab)
+
+        layout, offset = {}, 0
+        for name, blob in blobs.items():
+            nbytes = len(blob) * blob.itemsize if isinstance(blob, array) else len(blob)
+            layout[name] = (offset, nbytes)
+            offset += nbytes + (-nbytes % 8) # 8-byte alignment for the casts on load
+        header = json.dumps({
+            "docs": len(live),
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "deletes_checked_at": self.deletes_checked_at.isoformat() if self.deletes_checked_at else None,
+            "posting_floor": self.posting_floor.isoformat() if self.posting_floor else None,
+            "values": self.values,
+            "vocab": vocab,
+            "layout": layout,
+        }).encode()
+        header += b" " * (-(len(SNAPSHOT_MAGIC) + 8 + len(header)) % 8)
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(SNAPSHOT_MAGIC + len(header).to_bytes(8, "little") + header)
+            for name, blob in blobs.items():
+                data = blob.tobytes() if isinstance(blob, array) else blob
+                fh.write(data + b"\0" * (-len(data) % 8))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SearchIndex":
+        with open(path, "rb") as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            mm.close()
+            raise ValueError(f"{path} is not a job search index snapshot")
+        header_start = len(SNAPSHOT_MAGIC) + 8
+        header_len = int.from_bytes(mm[len(SNAPSHOT_MAGIC):header_start], "little")
+        header = json.loads(mm[header_start:header_start + header_len])
+        data = memoryview(mm)[header_start + header_len:]
+
+        def blob(name: str, typecode: str):
+            offset, nbytes = header["layout"][name]
+            return data[offset:offset + nbytes].cast(typecode) if typecode != "B" else data[offset:offset + nbytes]
+
+        index = cls()
+        index._mmap = mm
+        count = header["docs"]
+        index.ids = bytearray(blob("ids", "B"))
+        index.live = bytearray(b"\1" * count)
+        index.dates = array("d", blob("dates", "d"))
+        index.updated = array("d", blob("updated", "d"))
+        index.ordinal_of = {bytes(index.ids[o * 16:o * 16 + 16]): o for o in range(count)}
+        for f, field in enumerate(FIELDS):
+            index.lengths[f] = array("I", blob(f"len_{field}", "I"))
+            index.total_lengths[f] = sum(index.lengths[f])
+            # Posting lists stay in the mmap until a write touches the term
+            index.base_docs[f], index.base_tfs[f] = blob(f"docs_{field}", "I"), blob(f"tfs_{field}", "H")
+            index.base_vocab[f] = {term: tuple(loc) for term, loc in header["vocab"][f].items()}
+            if f < len(FILTER_FIELDS):
+                index.value_ids[f] = array("I", blob(f"vid_{field}", "I"))
+                index.values[f] = header["values"][f]
+                index.value_lookup[f] = {value: vid for vid, value in enumerate(index.values[f])}
+        index.watermark = datetime.fromisoformat(header["watermark"]) if header["watermark"] else None
+        for name in ("deletes_checked_at", "posting_floor"): # Absent from older snapshots: the first catch-up diffs ids
+            setattr(index, name, datetime.fromisoformat(header[name]) if header.get(name) else None)
+        return index
+
+    def ordinals_before(self, moment: datetime) -> list[uuid.UUID]:
+        """Live docs posted before `moment`."""
+        cutoff = moment.timestamp()
+        return [uuid.UUID(bytes=key) for key, o in self.ordinal_of.items() if self.dates[o] < cutoff]
+
+
+# -- DB sync ----------------------------------------------------------------
+
+def _doc_query():
+    from app.models.job import JobPost, JobPostDescription
+    return (
+        select(
+            JobPost.id, JobPost.PostingDate, JobPost.RoleName, JobPost.CompanyName, JobPost.Location,
+            JobPost.DepartmentName, JobPostDescription.body, JobPost.updated_at,
+        )
+        .outerjoin(JobPostDescription, JobPostDescription.job_id == JobPost.id)
+        .execution_options(yield_per=5000)
+    )
+
+
+def doc_from_job(job) -> tuple:
+    return (
+        job.id, job.PostingDate, job.RoleName, job.CompanyName, job.Location,
+        job.DepartmentName, job.JobDescription, job.updated_at,
+    )
+
+
+def build(db: Session) -> SearchIndex:
+    index = SearchIndex()
+    index.deletes_checked_at = datetime.now(timezone.utc)
+    for row in db.execute(_doc_query()):
+        index.add(tuple(row))
+    return index
+
+
+# Changes are (op, payload) pairs: ("upsert", doc), ("delete", job_id), or
+# ("checked", (deletes_checked_at, posting_floor)) recording how far a catch-up got.
+Change = tuple[str, object]
+
+
+def apply(index: SearchIndex, changes: list[Change]) -> int:
+    """Applies changes, skipping docs the index already holds at that version; returns docs changed."""
+    changed = 0
+    for op, payload in changes:
+        if op == "upsert":
+            if not index.is_current(payload[0], payload[-1]):
+                index.add(payload)
+                changed += 1
+        elif op == "delete":
+            changed += index.remove(payload)
+        else:
+            index.deletes_checked_at, index.posting_floor = payload
+    return changed
+
+
+def catch_up(index: SearchIndex, db: Session, lock: Optional["_ReadWriteLock"] = None) -> list[Change]:
+    """
+    Changes since the index's watermarks: rows updated since `watermark`,
+    jobs deleted since `deletes_checked_at` (job_changes) and jobs older than
+    the oldest PostingDate left (archived months). Only reads the index, as a
+    reader of `lock` if given. Without a usable delete watermark (older snapshot, or
+    older than the outbox retention) live ids are diffed against the table.
+    """
+    from app.models.job import JobChange, JobPost
+    reading = lock.read if lock is not None else contextlib.nullcontext
+    checked_at = datetime.now(timezone.utc)
+    query = _doc_query()
+    if index.watermark is not None:
+        query = query.where(JobPost.updated_at >= index.watermark - CATCH_UP_OVERLAP)
+    changes: list[Change] = [("upsert", tuple(row)) for row in db.execute(query)]
+
+    since = index.deletes_checked_at
+    if since is not None and since > checked_at - timedelta(days=settings.JOB_CHANGES_RETENTION_DAYS):
+        changes += [("delete", job_id) for job_id in db.execute(
+            select(JobChange.job_id).where(JobChange.op == "delete", JobChange.changed_at >= since - CATCH_UP_OVERLAP)
+        ).scalars()]
+    else:
+        existing = {job_id.bytes for job_id in db.execute(select(JobPost.id).execution_options(yield_per=50000)).scalars()}
+        with reading():
+            changes += [("delete", uuid.UUID(bytes=key)) for key in list(index.ordinal_of) if key not in existing]
+
+    floor = _aware(db.execute(select(func.min(JobPost.PostingDate))).scalar())
+    if floor is not None and (index.posting_floor is None or floor > index.posting_floor):
+        with reading():
+            changes += [("delete", job_id) for job_id in index.ordinals_before(floor)]
+    changes.append(("checked", (checked_at, floor)))
+    return changes
+
+
+# -- process-wide index -----------------------------------------------------
+
+class _ReadWriteLock:
+    """Any number of readers or one writer; a waiting writer holds back new readers so it is not starved."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextlib.contextmanager
+    def read(self):
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+_index: Optional[SearchIndex] = None
+_rw = _ReadWriteLock() # Searches read concurrently; writes and the swap after a snapshot are exclusive
+_replay: Optional[list[Change]] = None # While a snapshot is written: changes held back from the frozen index
+_stop = threading.Event()
+_refresher: Optional[threading.Thread] = None
+_session_factory = None # Set by startup(); used to re-read jobs other workers changed
+
+
+def is_ready() -> bool:
+    return _index is not None
+
+
+def search(query: str, filters: Optional[dict[str, str]] = None, skip: int = 0, limit: int = 100) -> Optional[list[uuid.UUID]]:
+    """Ranked job ids, or None when the index is not loaded (callers fall back to SQL)."""
+    with _rw.read():
+        if _index is None:
+            return None
+        return _index.search(query, filters, skip, limit)
+
+
+def count(query: str, filters: Optional[dict[str, str]] = None) -> Optional[int]:
+    """Exact number of matching jobs, or None when the index is not loaded."""
+    with _rw.read():
+        if _index is None:
+            return None
+        return _index.count(query, filters)
+
+
+def _write(changes: list[Change]) -> int:
+    """Applies changes to the live index, or holds them back while it is frozen for a snapshot."""
+    with _rw.write():
+        if _index is None:
+            return 0
+        if _replay is not None:
+            _replay.extend(changes)
+            return 0
+        return apply(_index, changes)
+
+
+def _snapshot_and_reload(index: SearchIndex) -> SearchIndex:
+    path = settings.SEARCH_INDEX_PATH
+    index.save(path)
+    return SearchIndex.load(path)
+
+
+def _snapshot() -> None:
+    """Snapshots the live index without blocking searches, then swaps in the reloaded (compacted) one."""
+    global _index, _replay
+    with open(f"{settings.SEARCH_INDEX_PATH}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if _index is None or _index.changes_since_snapshot < settings.SEARCH_INDEX_SNAPSHOT_EVERY:
+            return # Another thread snapshotted while this one waited for the file lock
+        with _rw.write():
+            index, _replay = _index, []
+        fresh = None
+        try:
+            fresh = _snapshot_and_reload(index) # Frozen: searches still read it, writes queue in _replay
+        finally:
+            with _rw.write():
+                target = fresh or index
+                apply(target, _replay)
+                _index, _replay = target, None
+
+
+def startup(session_factory) -> None:
+    """Loads the snapshot (or builds one from the DB), catches up, and starts the refresh thread."""
+    global _index, _refresher, _session_factory
+    path = settings.SEARCH_INDEX_PATH
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    started = time.perf_counter()
+    # One worker builds/refreshes the snapshot while the others wait, then load it
+    with open(f"{path}.lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        with session_factory() as db:
+            index = None
+            if os.path.exists(path):
+                try:
+                    index = SearchIndex.load(path)
+                except (ValueError, KeyError, OSError) as e:
+                    logger.warning("search index snapshot %s unusable (%s); rebuilding", path, e)
+            if index is None:
+                index = build(db)
+                index = _snapshot_and_reload(index)
+            elif apply(index, catch_up(index, db)) >= settings.SEARCH_INDEX_SNAPSHOT_EVERY:
+                index = _snapshot_and_reload(index)
+    with _rw.write():
+        _index = index
+    _session_factory = session_factory
+    logger.info("search index ready: %d docs in %.2fs", index.live_count, time.perf_counter() - started)
+    if settings.SEARCH_INDEX_REFRESH_SECONDS > 0 and _refresher is None:
+        _stop.clear()
+        _refresher = threading.Thread(target=_refresh_loop, args=(session_factory,), name="search-index-refresh", daemon=True)
+        _refresher.start()
+
+
+def shutdown() -> None:
+    global _refresher
+    _stop.set()
+    if _refresher is not None:
+        _refresher.join(timeout=5)
+        _refresher = None
+
+
+def refresh(session_factory) -> None:
+    """Picks up writes made by other workers; re-snapshots once enough has changed."""
+    index = _index
+    if index is None:
+        return
+    with session_factory() as db:
+        changes = catch_up(index, db, _rw)
+    _write(changes)
+    if _index is not None and _index.changes_since_snapshot >= settings.SEARCH_INDEX_SNAPSHOT_EVERY:
+        _snapshot()
+
+
+def apply_changes(keys: invalidation.Keys) -> int:
+    """Re-reads the jobs another worker changed, skipping versions the index already holds; returns docs changed."""
+    from app.models.job import JobPost
+    index = _index
+    if index is None or _session_factory is None:
+        return 0
+    stale = []
+    with _rw.read():
+        for key, version in keys:
+            job_id = uuid.UUID(key)
+            if version is None or not index.is_current(job_id, datetime.fromisoformat(version)):
+                stale.append(job_id)
+    if not stale:
+        return 0
+    with _session_factory() as db:
+        rows = [tuple(row) for row in db.execute(_doc_query().where(JobPost.id.in_(stale)))]
+    found = {row[0] for row in rows}
+    _write([("upsert", row) for row in rows] + [("delete", job_id) for job_id in stale if job_id not in found])
+    return len(stale)
+
+
+def _flush() -> None:
+    if _session_factory is not None:
+        refresh(_session_factory)
+
+
+invalidation.register("job", apply_changes, _flush)
+
+
+def _refresh_loop(session_factory) -> None:
+    while not _stop.wait(settings.SEARCH_INDEX_REFRESH_SECONDS):
+        try:
+            refresh(session_factory)
+        except Exception:
+            logger.exception("search index refresh failed")
+
+
+# -- write path: crud stages changes, applied once the transaction commits --
+
+_PENDING_KEY = "search_index_pending"
+
+
+def stage_upsert(db: Session, job) -> None:
+    if _index is not None:
+        db.info.setdefault(_PENDING_KEY, []).append(("upsert", doc_from_job(job)))
+
+
+def stage_delete(db: Session, job_id: uuid.UUID) -> None:
+    if _index is not None:
+        db.info.setdefault(_PENDING_KEY, []).append(("delete", job_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _write(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,282 @@
+# app/services/snapshots.py
+"""
+Columnar (Parquet) snapshots of job data for analytics, so ad-hoc queries
+run against files instead of the primary.
+
+Every table of a snapshot is read in one READ ONLY, REPEATABLE READ
+transaction, so the files agree with each other as of a single moment (the
+manifest's `watermark`). Rows are streamed through a server-side cursor and
+written one row group per SNAPSHOT_BATCH_ROWS rows, so memory stays bounded
+by a batch whatever the table size.
+
+    <SNAPSHOT_DIR>/<name>/job_posts.parquet      all columns but the description (unless asked for)
+                         /users.parquet          no contact details (email, mobile stay in the primary)
+                         /otp_daily.parquet      OTPs issued/used per day
+                         /job_deletes.parquet    incremental only: jobs deleted since `since`
+                         /manifest.json
+
+An incremental snapshot holds the jobs and users with updated_at after
+`since`: by default the previous snapshot's watermark minus
+SNAPSHOT_WATERMARK_OVERLAP_SECONDS, because a transaction that started
+before that watermark may commit after it. Consumers upsert by id, keeping
+the row with the latest updated_at, and drop the ids in job_deletes.
+
+One snapshot is written at a time across all workers and hosts: the writer
+holds a Postgres advisory lock, released by the server if the process dies.
+Leftover `.partial` directories are therefore from crashed writers and are
+removed by the next one.
+
+pyarrow is an optional dependency, imported only here.
+"""
+import contextlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import Date, cast, func, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.models.job import JobChange, JobPost, JobPostDescription
+from app.models.user import OTP, User
+
+logger = logging.getLogger("app.snapshots")
+
+MANIFEST = "manifest.json"
+_NAME = re.compile(r"^\d{8}T\d{6}Z(-incremental)?$")
+_LOCK_KEY = 0x736E6170 # pg_try_advisory_lock key ("snap") of the single snapshot writer
+_local = threading.Lock() # Without Postgres (dev): one writer per process
+
+
+class SnapshotUnavailable(RuntimeError):
+    """pyarrow is not installed."""
+
+
+class SnapshotInProgress(RuntimeError):
+    pass
+
+
+def available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def running(engine: Engine) -> bool:
+    """Whether any worker is writing a snapshot."""
+    if engine.dialect.name != "postgresql":
+        return _local.locked()
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' AND classid = 0 AND objid = :key AND objsubid = 1)"
+        ), {"key": _LOCK_KEY}).scalar()
+
+
+@contextlib.contextmanager
+def _single_writer(engine: Engine):
+    if engine.dialect.name != "postgresql":
+        if not _local.acquire(blocking=False):
+            raise SnapshotInProgress("A snapshot is already being written")
+        try:
+            yield
+        finally:
+            _local.release()
+        return
+    # A session-level lock on a connection of its own, held (outside any transaction) while the snapshot is written
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if not conn.execute(select(func.pg_try_advisory_lock(_LOCK_KEY))).scalar():
+            raise SnapshotInProgress("A snapshot is already being written")
+        try:
+            yield
+        finally:
+            conn.execute(select(func.pg_advisory_unlock(_LOCK_KEY)))
+
+
+def _arrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise SnapshotUnavailable("Snapshots need pyarrow: pip install pyarrow") from None
+    return pyarrow, pyarrow.parquet
+
+
+def _text(value) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _tables(pa, since: Optional[datetime], include_users: bool, include_otps: bool, include_descriptions: bool):
+    """(file name, SELECT, [(column, arrow type, converter)]) for every table of the snapshot."""
+    timestamp = pa.timestamp("us", tz="UTC")
+    job_columns = [
+        (JobPost.id, pa.string(), _text),
+        (JobPost.PostingDate, timestamp, None),
+        (JobPost.RoleName, pa.string(), None),
+        (JobPost.DepartmentName, pa.string(), None),
+        (JobPost.Location, pa.string(), None),
+        (JobPost.CompanyName, pa.string(), None),
+        (JobPost.ContactEmail, pa.string(), None),
+        (JobPost.ApplicationLink, pa.string(), None),
+        (JobPost.ReferralStatus, pa.string(), None),
+        (JobPost.latitude, pa.float64(), None),
+        (JobPost.longitude, pa.float64(), None),
+        (JobPost.duplicate_of, pa.string(), _text),
+        (JobPost.created_at, timestamp, None),
+        (JobPost.updated_at, timestamp, None),
+    ]
+    jobs = select(*[column for column, _, _ in job_columns])
+    if include_descriptions:
+        job_columns.append((JobPostDescription.body.label("JobDescription"), pa.string(), None))
+        jobs = jobs.add_columns(JobPostDescription.body.label("JobDescription")).outerjoin(
+            JobPostDescription, JobPostDescription.job_id == JobPost.id,
+        )
+    if since is not None:
+        jobs = jobs.where(JobPost.updated_at > since) # ix_job_posts_updated_at
+    tables = [("job_posts", jobs, job_columns)]
+
+    if include_users:
+        user_columns = [
+            (User.id, pa.int64(), None),
+            (User.full_name, pa.string(), None),
+            (User.is_active, pa.bool_(), None),
+            (User.is_admin, pa.bool_(), None),
+            (User.created_at, timestamp, None),
+            (User.updated_at, timestamp, None),
+        ]
+        users = select(*[column for column, _, _ in user_columns])
+        if since is not None:
+            users = users.where(User.updated_at > since)
+        tables.append(("users", users, user_columns))
+
+    if include_otps:
+        day = cast(OTP.created_at, Date).label("day")
+        otp_columns = [
+            (day, pa.date32(), None),
+            (func.count().label("issued"), pa.int64(), None),
+            (func.count().filter(OTP.used.is_(True)).label("used"), pa.int64(), None),
+            (func.count(OTP.user_id.distinct()).label("users"), pa.int64(), None),
+        ]
+        otps = select(*[column for column, _, _ in otp_columns]).group_by(day).order_by(day)
+        if since is not None: # Whole days, recomputed: the day `since` falls in is partial in the previous snapshot
+            otps = otps.where(OTP.created_at >= since.replace(hour=0, minute=0, second=0, microsecond=0))
+        tables.append(("otp_daily", otps, otp_columns))
+
+    if since is not None:
+        delete_columns = [(JobChange.job_id, pa.string(), _text), (JobChange.changed_at.label("deleted_at"), timestamp, None)]
+        deletes = select(*[column for column, _, _ in delete_columns]).where(
+            JobChange.op == "delete", JobChange.changed_at > since,
+        )
+        tables.append(("job_deletes", deletes, delete_columns))
+    return tables
+
+
+def _write_table(conn: Connection, pa, pq, path: str, statement, columns, batch_rows: int) -> int:
+    schema = pa.schema([(column.key if column.key else column.name, arrow_type) for column, arrow_type, _ in columns])
+    converters = [convert for _, _, convert in columns]
+    result = conn.execution_options(stream_results=True, yield_per=batch_rows).execute(statement)
+    written = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for rows in result.partitions():
+            arrays = []
+            for values, convert, field in zip(zip(*rows), converters, schema):
+                arrays.append(pa.array([convert(v) for v in values] if convert else values, type=field.type))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema), row_group_size=batch_rows)
+            written += len(rows)
+    return written
+
+
+def list_snapshots(directory: Optional[str] = None) -> list[dict]:
+    """Manifests of the completed snapshots, newest first."""
+    directory = directory or settings.SNAPSHOT_DIR
+    try:
+        names = [name for name in os.listdir(directory) if _NAME.match(name)]
+    except FileNotFoundError:
+        return []
+    manifests = []
+    for name in sorted(names, reverse=True):
+        try:
+            with open(os.path.join(directory, name, MANIFEST)) as f:
+                manifests.append(json.load(f))
+        except FileNotFoundError:
+            continue
+    return manifests
+
+
+def snapshot_file(name: str, file: str, directory: Optional[str] = None) -> Optional[str]:
+    """Path of one file of a listed snapshot; None if unknown."""
+    if not _NAME.match(name) or os.path.basename(file) != file or not file.endswith((".parquet", ".json")):
+        return None
+    path = os.path.join(directory or settings.SNAPSHOT_DIR, name, file)
+    return path if os.path.isfile(path) else None
+
+
+def _previous_watermark(directory: str) -> Optional[datetime]:
+    for manifest in list_snapshots(directory):
+        return datetime.fromisoformat(manifest["watermark"])
+    return None
+
+
+def create_snapshot(
+    engine: Engine,
+    incremental: bool = False,
+    since: Optional[datetime] = None,
+    include_users: bool = True,
+    include_otps: bool = True,
+    include_descriptions: bool = False,
+    batch_rows: Optional[int] = None,
+    directory: Optional[str] = None,
+) -> dict:
+    """
+    Writes a snapshot and returns its manifest. `incremental` without `since`
+    continues from the newest snapshot (a full one is taken if there is none).
+    """
+    pa, pq = _arrow()
+    directory = directory or settings.SNAPSHOT_DIR
+    batch_rows = batch_rows or settings.SNAPSHOT_BATCH_ROWS
+    with _single_writer(engine):
+        if os.path.isdir(directory):
+            for stale in (name for name in os.listdir(directory) if name.endswith(".partial")):
+                shutil.rmtree(os.path.join(directory, stale), ignore_errors=True) # Left by a writer that died
+        if incremental and since is None:
+            previous = _previous_watermark(directory)
+            if previous is not None:
+                since = previous - timedelta(seconds=settings.SNAPSHOT_WATERMARK_OVERLAP_SECONDS)
+        started = datetime.now(timezone.utc)
+        name = started.strftime("%Y%m%dT%H%M%SZ") + ("-incremental" if since is not None else "")
+        final = os.path.join(directory, name)
+        partial = final + ".partial"
+        os.makedirs(partial, exist_ok=False)
+        try:
+            with engine.connect() as conn:
+                postgres = conn.dialect.name == "postgresql"
+                if postgres:
+                    conn = conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+                with conn.begin():
+                    # The first statement fixes the snapshot every table is read from
+                    watermark = conn.execute(select(func.now())).scalar() if postgres else started
+                    rows = {}
+                    for table, statement, columns in _tables(pa, since, include_users, include_otps, include_descriptions):
+                        rows[table] = _write_table(
+                            conn, pa, pq, os.path.join(partial, f"{table}.parquet"), statement, columns, batch_rows,
+                        )
+            manifest = {
+                "name": name,
+                "created_at": started.isoformat(),
+                "incremental": since is not None,
+                "since": since.isoformat() if since is not None else None,
+                "watermark": watermark.astimezone(timezone.utc).isoformat() if watermark.tzinfo else watermark.isoformat(),
+                "include_descriptions": include_descriptions,
+                "tables": rows,
+            }
+            with open(os.path.join(partial, MANIFEST), "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.rename(partial, final) # Readers only ever see complete snapshots
+            logger.info("snapshot %s written: %s", name, rows)
+        except BaseException:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise
+        return manifest
@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# In-process and socket load-test suite for the API (python -m benchmarks.run).
@@ -0,0 +1,94 @@
+# benchmarks/buffer_reads.py
+"""
+Buffer reads of the job list queries with JobDescription inline in
+the heap ("inline", the old job_posts layout) versus in job_descriptions
+("split", the current layout), on the same data.
+
+    python -m benchmarks.buffer_reads --seed-jobs 2000000 --output buffers.json
+
+Both layouts are materialised as temp tables from the seeded job_posts /
+job_descriptions with identical indexes, then each query is run with
+EXPLAIN (ANALYZE, BUFFERS) and its block counts (hit + read) reported. Temp
+tables are read through local buffers, so those counters are included.
+"""
+import argparse
+import json
+import sys
+
+from sqlalchemy import text
+
+from app.database import engine
+from benchmarks import dataset
+
+NARROW_COLUMNS = (
+    'id, "PostingDate", "RoleName", "DepartmentName", "Location", "CompanyName", '
+    '"ContactEmail", "ApplicationLink", "ReferralStatus", created_at, updated_at'
+)
+
+LAYOUTS = {
+    "inline": (
+        'CREATE TEMP TABLE bench_jobs AS SELECT p.*, d.body AS "JobDescription" '
+        'FROM job_posts p LEFT JOIN job_descriptions d ON d.job_id = p.id'
+    ),
+    "split": "CREATE TEMP TABLE bench_jobs AS SELECT * FROM job_posts",
+}
+
+# Shapes get_jobs issues without include_description (the list endpoint default)
+QUERIES = {
+    "recent_page": f'SELECT {NARROW_COLUMNS} FROM bench_jobs ORDER BY "PostingDate" DESC LIMIT 20',
+    "deep_page": f'SELECT {NARROW_COLUMNS} FROM bench_jobs ORDER BY "PostingDate" DESC OFFSET 10000 LIMIT 20',
+    "location_filter": (
+        f'SELECT {NARROW_COLUMNS} FROM bench_jobs WHERE "Location" ILIKE \'%Kochi%\' '
+        f'ORDER BY "PostingDate" DESC LIMIT 20'
+    ),
+    "no_match_scan": (  # No company matches: reads the whole heap
+        f'SELECT {NARROW_COLUMNS} FROM bench_jobs WHERE "CompanyName" ILIKE \'%Soylent Payments%\' '
+        f'ORDER BY "PostingDate" DESC LIMIT 20'
+    ),
+    "suggestions_distinct": 'SELECT DISTINCT "RoleName" FROM bench_jobs',
+}
+
+BLOCK_COUNTERS = ("Shared Hit Blocks", "Shared Read Blocks", "Local Hit Blocks", "Local Read Blocks")
+
+
+def measure_layout(conn, layout: str) -> dict:
+    conn.execute(text("DROP TABLE IF EXISTS bench_jobs"))
+    conn.execute(text(LAYOUTS[layout]))
+    conn.execute(text('CREATE INDEX ON bench_jobs ("PostingDate")'))
+    conn.execute(text("ANALYZE bench_jobs"))
+    pages = conn.execute(text("SELECT pg_relation_size('bench_jobs') / current_setting('block_size')::int")).scalar()
+    queries = {}
+    for name, sql in QUERIES.items():
+        plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")).scalar()[0]["Plan"]
+        blocks = {counter.lower().replace(" blocks", "").replace(" ", "_"): plan.get(counter, 0) for counter in BLOCK_COUNTERS}
+        blocks["total"] = sum(blocks.values())
+        queries[name] = blocks
+    return {"heap_pages": pages, "queries": queries}
+
+
+def run(seed_jobs: int = 0) -> dict:
+    if seed_jobs:
+        dataset.seed(jobs=seed_jobs, users=1)
+    with engine.connect() as conn:
+        # Temp tables are read through local buffers: size them so neither layout spills differently
+        conn.execute(text("SET temp_buffers = '1GB'"))
+        report = {layout: measure_layout(conn, layout) for layout in LAYOUTS}
+        conn.rollback()
+    for name in QUERIES:
+        before, after = report["inline"]["queries"][name]["total"], report["split"]["queries"][name]["total"]
+        report.setdefault("reduction", {})[name] = round(1 - after / before, 3) if before else None
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed-jobs", type=int, default=0, help="truncate and load this many job posts first")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    result = json.dumps(run(args.seed_jobs), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(result)
+    else:
+        sys.stdout.write(result + "\n")
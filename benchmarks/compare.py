@@ -0,0 +1,39 @@
+# benchmarks/compare.py
+"""
+Compares two benchmark reports produced by benchmarks.run.
+
+    python -m benchmarks.compare baseline.json candidate.json
+"""
+import json
+import sys
+
+
+def _delta(old: float, new: float) -> str:
+    if not old:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def compare(baseline: dict, candidate: dict) -> list[str]:
+    lines = [f"{'operation':<34}{'metric':<10}{'baseline':>12}{'candidate':>12}{'delta':>10}"]
+    for scenario, result in candidate["scenarios"].items():
+        base = baseline["scenarios"].get(scenario)
+        if base is None:
+            continue
+        lines.append(f"{scenario + ' (rps)':<34}{'rps':<10}{base['throughput_rps']:>12}{result['throughput_rps']:>12}"
+                     f"{_delta(base['throughput_rps'], result['throughput_rps']):>10}")
+        for op, stats in result["operations"].items():
+            base_op = base["operations"].get(op)
+            if base_op is None:
+                continue
+            for metric in ("p50", "p95", "p99"):
+                old, new = base_op["latency_ms"][metric], stats["latency_ms"][metric]
+                lines.append(f"{op:<34}{metric:<10}{old:>12}{new:>12}{_delta(old, new):>10}")
+    return lines
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    with open(sys.argv[1]) as a, open(sys.argv[2]) as b:
+        print("\n".join(compare(json.load(a), json.load(b))))
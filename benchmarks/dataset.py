@@ -0,0 +1,178 @@
+# benchmarks/dataset.py
+"""
+Deterministic synthetic dataset for benchmarks, loaded with COPY.
+
+Rows are generated from a seeded RNG and streamed to Postgres in chunks, so
+millions of job posts load in seconds without materialising them in memory.
+"""
+import csv
+import io
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.crud import crud_job_stats
+from app.database import SessionLocal, engine
+from app.services import geo, job_partitions
+
+ROLES = [
+    "Software Engineer", "Senior Software Engineer", "Backend Developer", "Frontend Developer",
+    "Data Scientist", "Data Engineer", "Product Manager", "DevOps Engineer", "QA Engineer",
+    "Engineering Manager", "Machine Learning Engineer", "Mobile Developer", "Site Reliability Engineer",
+    "Business Analyst", "UX Designer", "Technical Writer", "Security Engineer", "Solutions Architect",
+]
+DEPARTMENTS = [
+    "Engineering", "Product Development", "Data", "Infrastructure", "Design", "Quality",
+    "Security", "Platform", "Growth", "Analytics",
+]
+LOCATIONS = [
+    "Bengaluru, Karnataka", "Hyderabad, Telangana", "Pune, Maharashtra", "Mumbai, Maharashtra",
+    "Chennai, Tamil Nadu", "Gurugram, Haryana", "Noida, Uttar Pradesh", "Kolkata, West Bengal",
+    "Ahmedabad, Gujarat", "Kochi, Kerala", "Jaipur, Rajasthan", "Remote",
+]
+COMPANY_PREFIXES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Cyberdyne", "Soylent"]
+COMPANY_SUFFIXES = ["Labs", "Systems", "Technologies", "Corporation", "Software", "Analytics", "Networks", "Solutions"]
+DESCRIPTION_WORDS = (
+    "python java go rust kubernetes docker aws gcp azure postgres redis kafka spark react typescript "
+    "microservices distributed systems scalable backend frontend api design testing ownership mentoring "
+    "collaborate stakeholders agile remote hybrid onsite startup enterprise growth impact customers "
+    "machine learning analytics pipelines reliability observability security compliance payments fintech"
+).split()
+
+JOB_COLUMNS = (
+    "id", "PostingDate", "RoleName", "DepartmentName", "Location", "CompanyName", "ContactEmail",
+    "ApplicationLink", "ReferralStatus", "created_at", "updated_at", "latitude", "longitude", "geohash",
+)
+DESCRIPTION_COLUMNS = ("job_id", "body")
+USER_COLUMNS = ("email", "mobile_number", "full_name", "is_active", "is_admin", "created_at", "updated_at")
+OTP_COLUMNS = ("user_id", "email", "mobile_number", "otp_code", "expires_at", "used", "created_at")
+
+COPY_CHUNK_ROWS = 50_000
+
+
+def company_names(count: int = 400) -> list[str]:
+    rng = random.Random(0)
+    names = [f"{p} {s}" for p in COMPANY_PREFIXES for s in COMPANY_SUFFIXES]
+    while len(names) < count:
+        names.append(f"{rng.choice(COMPANY_PREFIXES)}{len(names)} {rng.choice(COMPANY_SUFFIXES)}")
+    return names[:count]
+
+
+def user_email(index: int) -> str:
+    return f"user{index}@bench.example.com"
+
+
+def user_mobile(index: int) -> str:
+    return f"+9190000{index:05d}"
+
+
+def _job_rows(count: int, seed: int, days: int, descriptions: bool = False):
+    """job_posts rows, or (with `descriptions`) the matching job_descriptions rows from the same RNG stream."""
+    rng = random.Random(seed)
+    companies = company_names()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    for _ in range(count):
+        company = rng.choice(companies)
+        posted = now - timedelta(seconds=rng.randrange(days * 86400))
+        description = " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(40, 160)))
+        job_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        role, department, location = rng.choice(ROLES), rng.choice(DEPARTMENTS), rng.choice(LOCATIONS)
+        link, referral = f"https://jobs.example/{rng.getrandbits(32):08x}", rng.choice(["yes", "no", ""])
+        place = geo.resolve(location) # As crud.create_job would set it
+        if descriptions:
+            yield (job_id, description)
+            continue
+        yield (
+            job_id,
+            posted.isoformat(),
+            role,
+            department,
+            location,
+            company,
+            f"careers@{company.split()[0].lower()}.example",
+            link,
+            referral,
+            posted.isoformat(),
+            posted.isoformat(),
+            place.lat if place else None,
+            place.lon if place else None,
+            place.geohash if place else None,
+        )
+
+
+def _user_rows(count: int):
+    now = datetime.now(timezone.utc).isoformat()
+    for i in range(count):
+        # User 0 doubles as the admin/automation user (deps expects id 1).
+        yield (user_email(i), user_mobile(i), f"Bench User {i}", "t", "t" if i == 0 else "f", now, now)
+
+
+def _otp_rows(count: int, users: int, seed: int):
+    # Mostly expired/used history, like a long-running deployment accumulates.
+    rng = random.Random(seed + 1)
+    now = datetime.now(timezone.utc)
+    for _ in range(count):
+        index = rng.randrange(users)
+        created = now - timedelta(seconds=rng.randrange(30 * 86400))
+        yield (
+            index + 1, user_email(index), None, f"{rng.randrange(10**6):06d}",
+            (created + timedelta(minutes=5)).isoformat(), "t" if rng.random() < 0.8 else "f", created.isoformat(),
+        )
+
+
+def _copy(raw_conn, table: str, columns: tuple[str, ...], rows) -> int:
+    """Streams rows into `table` with COPY ... FROM STDIN in fixed-size chunks."""
+    column_list = ", ".join(f'"{c}"' for c in columns)
+    sql = f"COPY {table} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '')"
+    total = 0
+    with raw_conn.cursor() as cur:
+        while True:
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            n = 0
+            for row in rows:
+                writer.writerow(row)
+                n += 1
+                if n == COPY_CHUNK_ROWS:
+                    break
+            if n == 0:
+                break
+            buf.seek(0)
+            cur.copy_expert(sql, buf)
+            total += n
+            if n < COPY_CHUNK_ROWS:
+                break
+    return total
+
+
+def seed(jobs: int, users: int, otps: int = 0, seed: int = 42, days: int = 365, reset: bool = True) -> dict:
+    """
+    Loads `users` users, `otps` historical OTPs and `jobs` job posts. With
+    `reset`, existing users, OTPs and job posts are truncated first so runs
+    are reproducible. Returns the row counts loaded.
+    """
+    with engine.begin() as conn: # Monthly partitions covering the generated PostingDates
+        if job_partitions.is_partitioned(conn):
+            now = datetime.now(timezone.utc)
+            job_partitions.ensure_partitions(conn, now - timedelta(days=days), now)
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            if reset:
+                cur.execute("TRUNCATE otps, users, job_posts, job_descriptions, job_stats RESTART IDENTITY CASCADE")
+        loaded_users = _copy(raw_conn, "users", USER_COLUMNS, _user_rows(users))
+        loaded_otps = _copy(raw_conn, "otps", OTP_COLUMNS, _otp_rows(otps, users, seed)) if users else 0
+        loaded_jobs = _copy(raw_conn, "job_posts", JOB_COLUMNS, _job_rows(jobs, seed, days))
+        _copy(raw_conn, "job_descriptions", DESCRIPTION_COLUMNS, _job_rows(jobs, seed, days, descriptions=True))
+        with raw_conn.cursor() as cur:
+            cur.execute("ANALYZE users")
+            cur.execute("ANALYZE otps")
+            cur.execute("ANALYZE job_posts")
+            cur.execute("ANALYZE job_descriptions")
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+    with SessionLocal() as db: # COPY bypassed the incremental rollups
+        crud_job_stats.rebuild_job_stats(db)
+        db.commit()
+    return {"users": loaded_users, "otps": loaded_otps, "jobs": loaded_jobs}
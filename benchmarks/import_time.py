@@ -0,0 +1,87 @@
+# benchmarks/import_time.py
+"""
+Measures the cold import cost of the app (what a fresh worker pays before it
+can serve its first request) using `python -X importtime` in clean
+subprocesses, and checks it against benchmarks/import_budget.json.
+
+    python -m benchmarks.import_time            # report + budget check
+    python -m benchmarks.import_time --top 30 --runs 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGET_FILE = Path(__file__).resolve().parent / "import_budget.json"
+
+
+def load_budget(path: Path = BUDGET_FILE) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _parse(stderr: str) -> list[tuple[str, int, int]]:
+    """`-X importtime` lines -> [(module, self_us, cumulative_us)], in import order."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_once(module: str) -> dict:
+    """Imports `module` in a fresh interpreter; returns total time, per-module timings and loaded top-level packages."""
+    probe = f"import sys, json, {module}; print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    rows = _parse(proc.stderr)
+    total_us = next((cum for name, _, cum in reversed(rows) if name == module), 0)
+    return {"total_ms": total_us / 1000, "modules": rows, "loaded": json.loads(proc.stdout.strip().splitlines()[-1])}
+
+
+def measure(module: str, runs: int = 3) -> dict:
+    """Best of `runs` (the least noisy estimate of the real cost)."""
+    return min((measure_once(module) for _ in range(runs)), key=lambda r: r["total_ms"])
+
+
+def violations(result: dict, budget: dict) -> list[str]:
+    problems = []
+    if result["total_ms"] > budget["max_total_ms"]:
+        problems.append(f"import took {result['total_ms']:.0f} ms, budget is {budget['max_total_ms']} ms")
+    for name in budget.get("forbidden_modules", []):
+        if name in result["loaded"]:
+            problems.append(f"{name} is imported eagerly; it must stay lazy")
+    return problems
+
+
+def report(result: dict, top: int) -> list[str]:
+    lines = [f"total: {result['total_ms']:.1f} ms", f"{'module':<60}{'self ms':>10}{'cum ms':>10}"]
+    heaviest = sorted(result["modules"], key=lambda r: r[2], reverse=True)[:top]
+    for name, self_us, cumulative_us in heaviest:
+        lines.append(f"{name:<60}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    budget = load_budget()
+    result = measure(budget["module"], args.runs)
+    print("\n".join(report(result, args.top)))
+    problems = violations(result, budget)
+    for problem in problems:
+        print(f"BUDGET: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
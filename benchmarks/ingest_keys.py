@@ -0,0 +1,117 @@
+# benchmarks/ingest_keys.py
+"""
+Insert cost of random (UUIDv4) versus time-ordered (UUIDv7, app.core.ids)
+primary keys on the same job_posts-shaped table.
+
+    python -m benchmarks.ingest_keys --rows 2000000 --batch 100 --output keys.json
+
+Each scheme loads `rows` rows into a fresh table with a uuid primary key, in
+committed multi-row INSERT batches of `batch` rows (ingest-sized
+transactions). Reported per scheme: throughput, WAL written (random keys
+dirty a different leaf page per row, and each first touch after a
+checkpoint writes a full-page image), and the primary key index size and
+leaf density (pgstattuple, when installed) left behind by page splits.
+Use more rows than fit in shared_buffers to see the cache-miss effect.
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+
+from psycopg2.extras import execute_values
+
+from app.core import ids
+from app.database import engine
+
+SCHEMES = {"uuid4": uuid.uuid4, "uuid7": ids.uuid7}
+TABLE = "bench_ingest_keys"
+PAYLOAD = "x" * 120 # Roughly the narrow job_posts row
+
+
+def _scalar(raw_conn, sql: str):
+    with raw_conn.cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchone()[0]
+
+
+def _leaf_stats(raw_conn) -> dict:
+    try:
+        with raw_conn.cursor() as cur:
+            cur.execute(f"SELECT avg_leaf_density, leaf_fragmentation FROM pgstatindex('{TABLE}_pkey')")
+            density, fragmentation = cur.fetchone()
+        return {"avg_leaf_density": density, "leaf_fragmentation": fragmentation}
+    except Exception: # pgstattuple not installed
+        raw_conn.rollback()
+        return {}
+
+
+def measure_scheme(raw_conn, scheme: str, rows: int, batch: int) -> dict:
+    new_id = SCHEMES[scheme]
+    with raw_conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        cur.execute(f'CREATE TABLE {TABLE} (id uuid PRIMARY KEY, "PostingDate" timestamptz NOT NULL, payload text)')
+    raw_conn.commit()
+
+    wal_before = _scalar(raw_conn, "SELECT pg_current_wal_lsn()")
+    raw_conn.commit()
+    started = time.perf_counter()
+    done = 0
+    with raw_conn.cursor() as cur:
+        while done < rows:
+            n = min(batch, rows - done)
+            values = [(str(new_id()), PAYLOAD) for _ in range(n)]
+            execute_values(cur, f"INSERT INTO {TABLE} VALUES %s", values, template="(%s, now(), %s)")
+            raw_conn.commit()
+            done += n
+    elapsed = time.perf_counter() - started
+
+    with raw_conn.cursor() as cur:
+        cur.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", (wal_before,))
+        wal_bytes = int(cur.fetchone()[0])
+        cur.execute(f"SELECT pg_relation_size('{TABLE}_pkey'), pg_relation_size('{TABLE}')")
+        index_bytes, heap_bytes = cur.fetchone()
+    raw_conn.commit()
+    return {
+        "rows": rows,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_s": round(rows / elapsed, 1),
+        "wal_bytes": wal_bytes,
+        "wal_bytes_per_row": round(wal_bytes / rows, 1),
+        "pkey_bytes": index_bytes,
+        "heap_bytes": heap_bytes,
+        **_leaf_stats(raw_conn),
+    }
+
+
+def run(rows: int, batch: int) -> dict:
+    raw_conn = engine.raw_connection()
+    try:
+        report = {scheme: measure_scheme(raw_conn, scheme, rows, batch) for scheme in SCHEMES}
+        with raw_conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {TABLE}")
+        raw_conn.commit()
+    finally:
+        raw_conn.close()
+    before, after = report["uuid4"], report["uuid7"]
+    report["uuid7_vs_uuid4"] = {
+        "throughput": round(after["rows_per_s"] / before["rows_per_s"], 3),
+        "wal_bytes": round(after["wal_bytes"] / before["wal_bytes"], 3),
+        "pkey_bytes": round(after["pkey_bytes"] / before["pkey_bytes"], 3),
+    }
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=100, help="rows per committed INSERT")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    result = json.dumps(run(args.rows, args.batch), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(result)
+    else:
+        sys.stdout.write(result + "\n")
@@ -0,0 +1,184 @@
+# benchmarks/run.py
+"""
+Runs the benchmark scenarios against the ASGI app and prints a JSON report.
+
+    python -m benchmarks.run --seed-jobs 2000000 --seed-users 5000
+    python -m benchmarks.run --transport socket --concurrency 32 --output run.json
+    python -m benchmarks.compare before.json after.json
+
+The app is driven in-process through httpx's ASGI transport, or over a real
+TCP socket with uvicorn serving the same app object from a background thread
+(so both modes share settings, including SECRET_KEY). Only a local Postgres
+at settings.DATABASE_URL is required; nothing touches the network.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import httpx
+
+from benchmarks import dataset
+from benchmarks.scenarios import SCENARIOS
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+def summarize(samples: dict[str, list[float]], errors: dict[str, int], elapsed: float) -> dict:
+    operations = {}
+    for name, values in sorted(samples.items()):
+        values.sort()
+        operations[name] = {
+            "count": len(values),
+            "errors": errors.get(name, 0),
+            "latency_ms": {
+                "p50": round(percentile(values, 50) * 1000, 3),
+                "p95": round(percentile(values, 95) * 1000, 3),
+                "p99": round(percentile(values, 99) * 1000, 3),
+                "mean": round(sum(values) / len(values) * 1000, 3),
+                "max": round(values[-1] * 1000, 3),
+            },
+        }
+    total = sum(len(v) for v in samples.values())
+    return {
+        "requests": total,
+        "errors": sum(errors.values()),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "operations": operations,
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, name: str, operations: int, concurrency: int, seed: int) -> dict:
+    scenario = SCENARIOS[name]
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+
+    def record(op: str, seconds: float, ok: bool) -> None:
+        samples.setdefault(op, []).append(seconds)
+        if not ok:
+            errors[op] = errors.get(op, 0) + 1
+
+    remaining = iter(range(operations))
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        for _ in remaining:
+            await scenario(client, rng, record)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(samples, errors, time.perf_counter() - start)
+
+
+def _auth_headers() -> dict:
+    # Mint a token for the seeded admin user instead of walking the OTP flow.
+    from app.core import security
+    token = security.create_access_token(subject="1", expires_delta=timedelta(hours=1))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@asynccontextmanager
+async def asgi_client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=_auth_headers()) as client:
+        yield client
+
+
+@asynccontextmanager
+async def socket_client(app, concurrency: int):
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", headers=_auth_headers(), limits=limits) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    from main import app
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "transport": args.transport,
+            "concurrency": args.concurrency,
+            "operations": args.operations,
+            "seed": args.seed,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "scenarios": {},
+    }
+    if args.seed_jobs or args.seed_users:
+        start = time.perf_counter()
+        loaded = dataset.seed(jobs=args.seed_jobs, users=args.seed_users, otps=args.seed_users * 5, seed=args.seed)
+        report["meta"]["dataset"] = {**loaded, "seed_seconds": round(time.perf_counter() - start, 2)}
+
+    client_cm = asgi_client(app) if args.transport == "asgi" else socket_client(app, args.concurrency)
+    async with client_cm as client:
+        for name in args.scenarios:
+            if args.warmup:
+                await run_scenario(client, name, args.warmup, args.concurrency, args.seed + 1)
+            report["scenarios"][name] = await run_scenario(client, name, args.operations, args.concurrency, args.seed)
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["asgi", "socket"], default="asgi")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--operations", type=int, default=2000, help="operations per scenario")
+    parser.add_argument("--warmup", type=int, default=100, help="untimed operations before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed for data and request mix")
+    parser.add_argument("--seed-jobs", type=int, default=0, help="truncate and load this many job posts first")
+    parser.add_argument("--seed-users", type=int, default=0, help="truncate and load this many users first")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(main_async(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# gunicorn.conf.py
+# Production launcher: gunicorn -c gunicorn.conf.py main:app  (see start_prod.sh)
+#
+# Graceful restart: `kill -HUP <master>` replaces workers one by one without
+# dropping in-flight requests. With preload_app the code is loaded once in the
+# master, so HUP does not pick up new code; deploy new code with USR2 (new
+# master) followed by WINCH/QUIT on the old one, or a full restart.
+import glob
+import os
+
+from app.core.config import settings, ensure_stable_secret_key
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = settings.WEB_CONCURRENCY
+worker_class = "app.core.workers.ProductionUvicornWorker"
+preload_app = True  # Import once in the master; workers fork with the app already loaded
+timeout = int(os.environ.get("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+max_requests = int(os.environ.get("MAX_REQUESTS", "0"))  # Recycle workers after N requests (0 = never)
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", "0"))
+accesslog = "-"
+
+_multiproc_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+
+def on_starting(server):
+    ensure_stable_secret_key(server.cfg.workers)
+    if _multiproc_dir:
+        # Stale metric files from a previous run would be summed into the new one
+        os.makedirs(_multiproc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(_multiproc_dir, "*.db")):
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    # Never share pooled DB sockets inherited from the master across processes
+    from app.database import engine
+    engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    if _multiproc_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
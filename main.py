@@ -1,8 +1,19 @@
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware # Import CORSMiddleware
+from sqlalchemy.exc import OperationalError
 
 from app.api.v1 import api_router as api_v1_router # Import the v1 router
-from app.database import engine #, Base # Import engine and Base
+from app.database import engine, warm_pool, SessionLocal #, Base # Import engine and Base
+from app.core import metrics, profiler, query_limits
+from app.core.load_shedding import LoadSheddingMiddleware
+from app.core.server_timing import ServerTimingMiddleware
+from app.core.config import settings, ensure_stable_secret_key
+from app.core.request_context import RequestContextMiddleware
+from app.services import change_feed, invalidation, job_partitions, percolator, search_index
 # from app.models import * # Ensure models are imported if not done elsewhere for Base
 
 # Create database tables (Alembic is preferred for production)
@@ -10,7 +21,33 @@ from app.database import engine #, Base # Import engine and Base
 # from app.models.job import JobPost # Ensure your models are imported before create_all
 # Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="The Referral Network API - Structured")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup (runs in every worker, after the fork when preloaded)
+    ensure_stable_secret_key(settings.WEB_CONCURRENCY)
+    await run_in_threadpool(warm_pool, settings.DB_POOL_SIZE)
+    await run_in_threadpool(job_partitions.ensure_ahead, engine) # Inserts fail without a partition for their month
+    if settings.SEARCH_INDEX_ENABLED:
+        await run_in_threadpool(search_index.startup, SessionLocal)
+    await run_in_threadpool(percolator.startup, SessionLocal)
+    invalidation.startup(engine) # After the caches load; their periodic refresh covers writes in between
+    yield
+    invalidation.shutdown()
+    percolator.shutdown()
+    search_index.shutdown()
+    await change_feed.feed.shutdown()
+    # Shutdown: close pooled HTTP and DB connections
+    email_service = sys.modules.get("app.services.email_service") # Only loaded if an email was sent
+    if email_service is not None:
+        await email_service.close_http_client()
+    engine.dispose()
+
+app = FastAPI(title="The Referral Network API - Structured", lifespan=lifespan)
+app.add_exception_handler(OperationalError, query_limits.query_canceled_handler) # Statement timeout / cancelled -> 503
+
+# Innermost, so CORS preflights are never limited and refused requests still get CORS headers
+if settings.LOAD_SHED_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
 
 # CORS Middleware Configuration
 app.add_middleware(
@@ -19,13 +56,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Total-Count", "X-Total-Count-Mode", "X-Total-Count-Accuracy", "X-Duplicate-Of"], # Listing totals, dedup
 )
 
+# Middleware added last runs first: request context -> query cancel -> metrics -> profiler -> server timing -> CORS -> load shedding -> app
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(profiler.ProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.PrometheusMiddleware)
+if settings.CANCEL_QUERIES_ON_DISCONNECT:
+    app.add_middleware(query_limits.QueryCancelMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
 app.include_router(api_v1_router, prefix="/api/v1")
 
+if settings.METRICS_ENABLED:
+    app.add_route("/metrics", metrics.metrics_endpoint, include_in_schema=False)
+
 @app.get("/")
 async def read_root():
     return {"message": "Welcome to The Referral Network API - Structured Version"}
 
 # The Uvicorn run command should be executed from the terminal:
 # uvicorn main:app --reload
+# Production (multi-worker): ./start_prod.sh (gunicorn -c gunicorn.conf.py main:app)
@@ -1 +1 @@
-uvicorn main:app --reload --host 0.0.0.0
\ No newline at end of file
+SQL_INSTRUMENTATION_ENABLED=${SQL_INSTRUMENTATION_ENABLED:-true} uvicorn main:app --reload --host 0.0.0.0
\ No newline at end of file
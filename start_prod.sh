@@ -0,0 +1,4 @@
+# Production entry point: multi-worker gunicorn + uvicorn workers (uvloop/httptools).
+# Requires a stable SECRET_KEY when WEB_CONCURRENCY > 1, e.g.:
+#   SECRET_KEY=... WEB_CONCURRENCY=4 PROMETHEUS_MULTIPROC_DIR=/tmp/prometheus ./start_prod.sh
+exec gunicorn -c gunicorn.conf.py main:app
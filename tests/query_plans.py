@@ -0,0 +1,161 @@
+# tests/query_plans.py
+"""
+Helpers for query-plan regression tests: capture the SQL an endpoint emits,
+EXPLAIN it, and check plan properties with a readable diff on failure.
+
+Each plan's shape must also match the golden shape recorded under
+tests/query_plans/ from the seeded database. Set UPDATE_QUERY_PLANS=1 to
+re-record them after an intentional change, and review the diff.
+"""
+import difflib
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "query_plans")
+
+
+@dataclass
+class PlanExpectation:
+    no_seq_scan_on: tuple[str, ...] = ("job_posts", "users")
+    any_index: tuple[str, ...] = ()  # at least one of these indexes must be used
+    max_cost: float | None = None  # ceiling on the root node's total cost
+    max_blocks: int | None = None  # ceiling on shared buffers the statement touches when run (EXPLAIN ANALYZE)
+
+
+@dataclass
+class CapturedStatement:
+    statement: str
+    parameters: object = field(default=None)
+
+
+@contextmanager
+def capture_sql(engine):
+    """Collects every statement executed on `engine` inside the block."""
+    captured: list[CapturedStatement] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append(CapturedStatement(statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(engine, captured: CapturedStatement, analyze: bool = False) -> dict:
+    """
+    Runs EXPLAIN (FORMAT JSON) for a captured statement and returns the root
+    plan node; with `analyze` the statement is run and its buffer counts are
+    included, which the planner's estimates do not show under a LIMIT. Partitions and partition indexes are reported under their
+    parent's name (job_posts_p202601 -> job_posts), so expectations and
+    recorded shapes do not depend on which months exist.
+    """
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+            cur.execute(f"EXPLAIN ({options}) " + captured.statement, captured.parameters)
+            (result,) = cur.fetchone()
+            cur.execute(
+                "SELECT c.relname, p.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent"
+            )
+            parents = dict(cur.fetchall())
+        raw_conn.rollback()
+    finally:
+        raw_conn.close()
+    if isinstance(result, str):
+        result = json.loads(result)
+    plan = result[0]["Plan"]
+    for node in iter_nodes(plan):
+        for key in ("Relation Name", "Index Name"):
+            if node.get(key) in parents:
+                node[key] = parents[node[key]]
+    return plan
+
+
+def iter_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+APPEND_NODES = ("Append", "Merge Append")
+
+
+def render(plan: dict, depth: int = 0) -> list[str]:
+    """
+    Plan shape as indented text, without costs/row estimates so diffs stay
+    stable. An Append's children (one per partition) are listed once per
+    distinct subtree, sorted: the shape does not change as months roll over.
+    """
+    label = plan["Node Type"]
+    if plan.get("Scan Direction") == "Backward":
+        label += " Backward"
+    if "Relation Name" in plan:
+        label += f" on {plan['Relation Name']}"
+    if "Index Name" in plan:
+        label += f" using {plan['Index Name']}"
+    children = [tuple(render(child, depth + 1)) for child in plan.get("Plans", [])]
+    if plan["Node Type"] in APPEND_NODES:
+        children = sorted(set(children))
+    lines = ["  " * depth + label]
+    for child in children:
+        lines.extend(child)
+    return lines
+
+
+def violations(plan: dict, expectation: PlanExpectation) -> list[str]:
+    problems = []
+    nodes = list(iter_nodes(plan))
+    for node in nodes:
+        if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in expectation.no_seq_scan_on:
+            problems.append(f"Seq Scan on {node['Relation Name']}")
+    if expectation.any_index:
+        used = {node["Index Name"] for node in nodes if "Index Name" in node}
+        if not used & set(expectation.any_index):
+            problems.append(f"none of {sorted(expectation.any_index)} used (used: {sorted(used) or 'no indexes'})")
+    if expectation.max_cost is not None and plan["Total Cost"] > expectation.max_cost:
+        problems.append(f"estimated cost {plan['Total Cost']:.1f} exceeds ceiling {expectation.max_cost:.1f}")
+    if expectation.max_blocks is not None:
+        blocks = plan["Shared Hit Blocks"] + plan["Shared Read Blocks"]
+        if blocks > expectation.max_blocks:
+            problems.append(f"{blocks} shared blocks touched, ceiling {expectation.max_blocks}")
+    return problems
+
+
+def check_plan(name: str, statement: CapturedStatement, plan: dict, expectation: PlanExpectation) -> None:
+    """Asserts the expectation, failing with the plan and a diff against the recorded shape."""
+    shape = render(plan)
+    golden_path = os.path.join(GOLDEN_DIR, f"{name}.plan")
+    if os.environ.get("UPDATE_QUERY_PLANS"):
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(golden_path, "w") as fh:
+            fh.write("\n".join(shape) + "\n")
+
+    problems = violations(plan, expectation)
+    recorded = None
+    if os.path.exists(golden_path):
+        with open(golden_path) as fh:
+            recorded = fh.read().splitlines()
+        if recorded != shape:
+            problems.append(f"plan shape differs from {os.path.relpath(golden_path)} (UPDATE_QUERY_PLANS=1 re-records)")
+    else:
+        problems.append(f"no recorded plan shape at {os.path.relpath(golden_path)} (UPDATE_QUERY_PLANS=1 records it)")
+    if not problems:
+        return
+
+    message = [f"query plan regression in {name!r}:"]
+    message += [f"  - {p}" for p in problems]
+    message += ["", "SQL:", "  " + " ".join(statement.statement.split()), ""]
+    if recorded is not None:
+        message += list(difflib.unified_diff(recorded, shape, "recorded plan", "current plan", lineterm=""))
+    else:
+        message += ["current plan:"] + shape
+    raise AssertionError("\n".join(message))
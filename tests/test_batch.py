@@ -0,0 +1,56 @@
+# tests/test_batch.py
+"""POST /jobs/batch-get and POST /batch against the seeded Postgres database."""
+import uuid
+
+
+def _job_ids(client, auth_headers, n):
+    response = client.get("/api/v1/jobs/", params={"limit": n}, headers=auth_headers)
+    return [job["id"] for job in response.json()]
+
+
+def test_batch_get_keeps_request_order_and_reports_missing(client, auth_headers):
+    first, second = _job_ids(client, auth_headers, 2)
+    unknown = str(uuid.uuid4())
+    response = client.post(
+        "/api/v1/jobs/batch-get", json={"ids": [second, unknown, first, second]}, headers=auth_headers,
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [job["id"] for job in body["jobs"]] == [second, first]
+    assert body["missing"] == [unknown]
+    assert body["jobs"][0]["JobDescription"]
+
+
+def test_batch_authenticates_once(client, auth_headers, monkeypatch):
+    from app.core import security
+
+    decodes = []
+    verify_token = security.verify_token
+    monkeypatch.setattr(security, "verify_token", lambda *a, **kw: decodes.append(1) or verify_token(*a, **kw))
+    (job_id,) = _job_ids(client, auth_headers, 1)
+    decodes.clear()
+
+    response = client.post("/api/v1/batch", json={"requests": [
+        {"id": "me", "path": "/api/v1/users/me"},
+        {"id": "page", "path": "/api/v1/jobs/?limit=3&count=exact"},
+        {"id": "job", "path": f"/api/v1/jobs/{job_id}"},
+        {"id": "gone", "path": f"/api/v1/jobs/{uuid.uuid4()}"},
+        {"id": "nowhere", "path": "/api/v1/nowhere"},
+        {"id": "stream", "path": "/api/v1/jobs/changes/stream"},
+    ]}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(decodes) == 1
+    results = {sub["id"]: sub for sub in response.json()["responses"]}
+    assert results["me"]["status"] == 200 and results["me"]["body"]["id"] == 1
+    assert results["page"]["status"] == 200 and len(results["page"]["body"]) == 3
+    assert "x-total-count" in results["page"]["headers"]
+    assert results["job"]["body"]["id"] == job_id
+    assert results["gone"]["status"] == 404
+    assert results["nowhere"]["status"] == 404
+    assert results["stream"]["status"] == 400
+
+
+def test_batch_requires_authentication(client):
+    response = client.post("/api/v1/batch", json={"requests": [{"path": "/api/v1/users/me"}]})
+    assert response.status_code in (401, 403)
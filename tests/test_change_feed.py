@@ -0,0 +1,132 @@
+# tests/test_change_feed.py
+"""
+The job_changes outbox feed (GET /jobs/changes and the SSE stream). Cursor
+parsing needs no database; the rest runs against the seeded Postgres
+database (TEST_DATABASE_URL).
+"""
+import asyncio
+import threading
+import uuid
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud.crud_job_change import START, format_cursor, parse_cursor
+
+
+def test_cursor_round_trip():
+    assert parse_cursor(format_cursor((812, 40))) == (812, 40)
+    assert parse_cursor(None) == parse_cursor("") == START
+    with pytest.raises(ValueError):
+        parse_cursor("not-a-cursor")
+
+
+# -- against Postgres -------------------------------------------------------
+
+def _record(pg_engine, job_id=None) -> uuid.UUID:
+    """Commits one delete event in its own transaction."""
+    job_id = job_id or uuid.uuid4()
+    with Session(pg_engine) as db:
+        crud.record_job_change(db, "delete", job_id=job_id)
+        db.commit()
+    return job_id
+
+
+def _latest(pg_engine):
+    with Session(pg_engine) as db:
+        return crud.get_latest_job_change_cursor(db)
+
+
+def _changes(pg_engine, since, limit=100):
+    with Session(pg_engine) as db:
+        return [(c.tx_id, c.id, c.job_id) for c in crud.get_job_changes(db, since=since, limit=limit)]
+
+
+def test_changes_are_ordered_by_transaction(pg_engine):
+    since = _latest(pg_engine)
+    with Session(pg_engine) as db: # Two events in one transaction share its tx_id
+        first, second = uuid.uuid4(), uuid.uuid4()
+        crud.record_job_change(db, "delete", job_id=first)
+        crud.record_job_change(db, "delete", job_id=second)
+        db.commit()
+    third = _record(pg_engine)
+
+    changes = _changes(pg_engine, since)
+    assert [job_id for _, _, job_id in changes] == [first, second, third]
+    assert changes[0][0] == changes[1][0] < changes[2][0]
+    assert changes == sorted(changes)
+
+
+def test_late_commit_is_held_back_then_delivered(pg_engine):
+    since = _latest(pg_engine)
+    with Session(pg_engine) as slow:
+        late = uuid.uuid4()
+        crud.record_job_change(slow, "delete", job_id=late) # Takes an xid older than the next commit's
+        early = _record(pg_engine)
+
+        # `early` is committed, but a reader that advanced past it now would skip `late` for good
+        assert _changes(pg_engine, since) == []
+        slow.commit()
+
+    assert [job_id for _, _, job_id in _changes(pg_engine, since)] == [late, early]
+
+
+def test_changes_endpoint_pages_by_cursor(client, auth_headers, pg_engine):
+    since = format_cursor(_latest(pg_engine))
+    recorded = [_record(pg_engine) for _ in range(3)]
+
+    first = client.get("/api/v1/jobs/changes", params={"since": since, "limit": 2}, headers=auth_headers).json()
+    second = client.get("/api/v1/jobs/changes", params={"since": first["next_cursor"], "limit": 2}, headers=auth_headers).json()
+    empty = client.get("/api/v1/jobs/changes", params={"since": second["next_cursor"]}, headers=auth_headers).json()
+
+    assert [c["job_id"] for c in first["changes"] + second["changes"]] == [str(job_id) for job_id in recorded]
+    assert all(c["op"] == "delete" and c["job"] is None for c in first["changes"])
+    assert empty == {"changes": [], "next_cursor": second["next_cursor"]}
+    bad = client.get("/api/v1/jobs/changes", params={"since": "garbage"}, headers=auth_headers)
+    assert bad.status_code == 400
+
+
+def _job_id(event: str) -> str:
+    data = next(line for line in event.splitlines() if line.startswith("data: "))
+    return data.split('"job_id":"', 1)[1].split('"', 1)[0]
+
+
+def test_stream_hands_off_from_catch_up_to_the_poller_without_gaps(pg_engine, monkeypatch):
+    from app.services import change_feed
+
+    monkeypatch.setattr(change_feed.settings, "CHANGE_FEED_POLL_SECONDS", 0.05)
+    since = _latest(pg_engine)
+    before = _record(pg_engine)
+
+    # Commit another change after the client's catch-up read but before the poller takes its start cursor
+    caught_up, gap = threading.Event(), []
+    fetch, latest = change_feed._fetch, change_feed._latest
+
+    def fetch_then_signal(*args):
+        page = fetch(*args)
+        caught_up.set()
+        return page
+
+    def latest_after_a_commit():
+        caught_up.wait(5)
+        gap.append(_record(pg_engine))
+        return latest()
+
+    monkeypatch.setattr(change_feed, "_fetch", fetch_then_signal)
+    monkeypatch.setattr(change_feed, "_latest", latest_after_a_commit)
+
+    async def scenario():
+        events = change_feed.stream(since)
+        try:
+            received = [await asyncio.wait_for(anext(events), 5) for _ in range(2)]
+            live = await asyncio.to_thread(_record, pg_engine) # Delivered by the poller
+            received.append(await asyncio.wait_for(anext(events), 5))
+            return received, live
+        finally:
+            await events.aclose()
+            await change_feed.feed.shutdown()
+
+    received, live = asyncio.run(scenario())
+    assert [_job_id(event) for event in received] == [str(before), str(gap[0]), str(live)]
+    assert all(event.startswith("id: ") and "\nevent: delete\n" in event for event in received)
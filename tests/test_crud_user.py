@@ -0,0 +1,24 @@
+# tests/test_crud_user.py
+"""User CRUD leaves the transaction to the request's session dependency (SQLite, no Postgres needed)."""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.crud import crud_user
+from app.models.user import User
+from app.schemas.user import UserCreate, UserUpdate
+
+
+def test_integrity_errors_propagate_without_rolling_back_the_request():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    with Session(engine) as db:
+        crud_user.create_user(db, UserCreate(email="taken@example.com"))
+        db.commit()
+        user = crud_user.create_user(db, UserCreate(email="new@example.com")) # Earlier work of the same request
+        with pytest.raises(IntegrityError):
+            crud_user.update_user(db, user, UserUpdate(email="taken@example.com"))
+        assert db.in_transaction() # Still the request's transaction: get_db decides to roll it back
+        db.rollback()
+        assert db.query(User).filter(User.email == "new@example.com").first() is None
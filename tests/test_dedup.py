@@ -0,0 +1,43 @@
+# tests/test_dedup.py
+"""SimHash fingerprints: reposts land close, different posts far apart, and close pairs always share a band."""
+import random
+
+from app.services import dedup
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design, build and operate the services behind our "
+    "payments platform. You will work with Python, PostgreSQL and Kafka, own features end to end, "
+    "review code, mentor junior engineers and take part in the on-call rotation. Experience with "
+    "distributed systems, observability and cloud infrastructure is a plus."
+)
+
+
+def test_small_edits_stay_within_distance():
+    original = dedup.fingerprint("Acme", "Backend Engineer", DESCRIPTION)
+    repost = dedup.fingerprint("ACME ", "backend engineer", DESCRIPTION.replace("is a plus", "is nice to have"))
+    assert dedup.distance(original, repost) <= dedup.MAX_GUARANTEED_DISTANCE
+
+
+def test_other_company_or_description_is_far():
+    original = dedup.fingerprint("Acme", "Backend Engineer", DESCRIPTION)
+    other_company = dedup.fingerprint("Globex", "Backend Engineer", DESCRIPTION)
+    other_post = dedup.fingerprint("Acme", "Product Designer", "Own the design system and run user research.")
+    assert dedup.distance(original, other_company) > dedup.MAX_GUARANTEED_DISTANCE
+    assert dedup.distance(original, other_post) > dedup.MAX_GUARANTEED_DISTANCE
+
+
+def test_bands_share_a_value_within_guaranteed_distance():
+    rng = random.Random(7)
+    for _ in range(200):
+        fp = rng.getrandbits(64)
+        flipped = fp
+        for bit in rng.sample(range(64), dedup.MAX_GUARANTEED_DISTANCE):
+            flipped ^= 1 << bit
+        assert set(dedup.bands(fp)) & set(dedup.bands(flipped))
+    assert len(set(dedup.bands(0))) == dedup.BANDS # tags keep equal values in different bands apart
+
+
+def test_signed_round_trip():
+    fp = (1 << 64) - 3
+    assert dedup.to_signed(fp) < 0
+    assert dedup.to_unsigned(dedup.to_signed(fp)) == fp
@@ -0,0 +1,48 @@
+# tests/test_geo.py
+"""Gazetteer geocoding and radius search; the GET /jobs?near= tests need Postgres."""
+import pytest
+
+from app.services import geo
+
+
+def test_geohash_reference_value():
+    assert geo.geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+
+
+@pytest.mark.parametrize("text, place", [
+    ("Bengaluru, Karnataka", "Bengaluru"),
+    ("Bangalore (Hybrid)", "Bengaluru"),
+    ("Gurgaon", "Gurugram"),
+    ("Pune / Mumbai", "Pune"),
+    ("Electronic City Bengaluru", "Bengaluru"),
+    ("Aurangabad, Maharashtra", "Aurangabad"),
+    ("Aurangabad, Bihar", None), # Named state rules out the Maharashtra one
+    ("Remote", None),
+    ("", None),
+])
+def test_resolve(text, place):
+    resolved = geo.resolve(text)
+    assert (resolved.name if resolved else None) == place
+
+
+def test_places_within_radius_nearest_first():
+    bengaluru = geo.resolve("Bengaluru")
+    found = [(place.name, round(distance)) for place, distance in geo.gazetteer().within(bengaluru.lat, bengaluru.lon, 150)]
+    assert [name for name, _ in found] == ["Bengaluru", "Hosur", "Mysuru"]
+    assert 120 < found[-1][1] < 135
+
+
+def _locations(client, auth_headers, **params):
+    response = client.get("/api/v1/jobs/", params={"limit": 200, **params}, headers=auth_headers)
+    assert response.status_code == 200
+    return {job["Location"] for job in response.json()}
+
+
+def test_near_lists_only_jobs_within_the_radius(client, auth_headers):
+    assert _locations(client, auth_headers, near="Bangalore") == {"Bengaluru, Karnataka"}
+    assert _locations(client, auth_headers, near="New Delhi", radius_km=40) == {"Gurugram, Haryana", "Noida, Uttar Pradesh"}
+
+
+def test_unknown_place_is_rejected(client, auth_headers):
+    response = client.get("/api/v1/jobs/", params={"near": "Atlantis"}, headers=auth_headers)
+    assert response.status_code == 400
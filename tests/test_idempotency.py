@@ -0,0 +1,35 @@
+# tests/test_idempotency.py
+"""Idempotency-Key on POST /jobs/ against the seeded Postgres database."""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+JOB = {"RoleName": "Idempotent Engineer", "CompanyName": "Retry Labs", "JobDescription": "Exactly once, please."}
+
+
+def _post(client, auth_headers, key, job=JOB):
+    return client.post("/api/v1/jobs/", json=job, headers={**auth_headers, "Idempotency-Key": key})
+
+
+def test_retry_replays_the_first_response(client, auth_headers):
+    key = str(uuid.uuid4())
+    first, retry = _post(client, auth_headers, key), _post(client, auth_headers, key)
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+
+def test_key_reused_for_another_request_is_rejected(client, auth_headers):
+    key = str(uuid.uuid4())
+    assert _post(client, auth_headers, key).status_code == 201
+    other = _post(client, auth_headers, key, {**JOB, "RoleName": "Someone Else"})
+    assert other.status_code == 422
+
+
+def test_concurrent_duplicates_wait_for_the_first(client, auth_headers):
+    key = str(uuid.uuid4())
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: _post(client, auth_headers, key), range(4)))
+    assert {r.status_code for r in responses} == {201}
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert sum("Idempotent-Replayed" not in r.headers for r in responses) == 1
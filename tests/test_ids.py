@@ -0,0 +1,27 @@
+# tests/test_ids.py
+"""UUIDv7 layout and ordering."""
+import uuid
+from datetime import datetime, timezone
+
+from app.core import ids
+
+
+def test_layout():
+    value = ids.uuid7()
+    assert isinstance(value, uuid.UUID)
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert abs((ids.uuid7_time(value) - datetime.now(timezone.utc)).total_seconds()) < 5
+
+
+def test_ids_from_one_process_sort_in_creation_order():
+    minted = [ids.uuid7() for _ in range(20_000)] # Many per millisecond: exercises the counter
+    assert minted == sorted(minted)
+    assert len(set(minted)) == len(minted)
+
+
+def test_pinned_timestamp():
+    moment = datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc)
+    value = ids.uuid7(int(moment.timestamp() * 1000))
+    assert ids.uuid7_time(value) == moment
+    assert value.version == 7
@@ -0,0 +1,12 @@
+# tests/test_import_time.py
+"""
+Keeps worker cold start in check: `import main` must stay within the
+checked-in budget and must not eagerly load the rare-path dependencies.
+"""
+from benchmarks import import_time
+
+
+def test_import_within_budget():
+    budget = import_time.load_budget()
+    result = import_time.measure(budget["module"], runs=3)
+    assert not import_time.violations(result, budget), "\n".join(import_time.report(result, top=15))
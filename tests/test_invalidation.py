@@ -0,0 +1,137 @@
+# tests/test_invalidation.py
+"""
+Cross-worker cache invalidation (app/services/invalidation.py). Message
+handling runs without a database; NOTIFY delivery and the listener's
+reconnect need Postgres (TEST_DATABASE_URL).
+"""
+import json
+import select
+import time
+from collections import defaultdict
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.services import invalidation
+
+
+class Recorder:
+    def __init__(self):
+        self.keys, self.flushes = [], 0
+
+    def on_keys(self, keys):
+        self.keys.append(sorted(keys))
+
+    def on_flush(self):
+        self.flushes += 1
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    monkeypatch.setattr(invalidation, "_handlers", defaultdict(dict))
+    recorder = Recorder()
+    invalidation.register("job", recorder.on_keys, recorder.on_flush)
+    return recorder
+
+
+def _message(origin="other-worker", **body) -> str:
+    return json.dumps({"origin": origin, **body})
+
+
+def test_dispatch_groups_keys_and_skips_own_messages(recorder):
+    invalidation.dispatch([
+        _message(keys={"job": [["a", "v1"]], "user": [["1", None]]}),
+        _message(keys={"job": [["a", "v2"], ["b", None]]}),
+        _message(origin=invalidation.origin(), keys={"job": [["c", None]]}),
+        "not json",
+    ])
+    assert recorder.keys == [[("a", "v2"), ("b", None)]] # One call, latest version wins
+    assert recorder.flushes == 0
+
+
+def test_flush_supersedes_keys(recorder):
+    invalidation.dispatch([_message(keys={"job": [["a", None]]}), _message(flush=["job"])])
+    assert recorder.keys == [] and recorder.flushes == 1
+
+
+def test_oversized_transactions_send_a_flush():
+    pending = {"job": {f"{i:036d}": "2026-01-01T00:00:00+00:00" for i in range(1000)}}
+    assert json.loads(invalidation._payload(pending)) == {"origin": invalidation.origin(), "flush": ["job"]}
+
+
+def test_local_handlers_run_after_commit_only(monkeypatch):
+    monkeypatch.setattr(invalidation, "_handlers", defaultdict(dict))
+    local, remote = Recorder(), Recorder()
+    invalidation.register("job", local.on_keys, local.on_flush, local=True)
+    invalidation.register("job", remote.on_keys, remote.on_flush)
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        db.execute(text("SELECT 1")) # Staged by a write, i.e. inside a transaction
+        invalidation.stage(db, "job", "a")
+        db.rollback()
+        invalidation.stage(db, "job", "b")
+        db.commit()
+    assert local.keys == [[("b", None)]]
+    assert remote.keys == []
+
+
+# -- against Postgres -------------------------------------------------------
+
+def _raw_listener(engine, channel):
+    return invalidation.Listener(engine, channel=channel)._connect()
+
+
+def _received(conn, timeout=2.0) -> list[str]:
+    payloads, deadline = [], time.monotonic() + timeout
+    while not payloads and time.monotonic() < deadline:
+        if select.select([conn], [], [], 0.1)[0]:
+            conn.poll()
+            payloads += [notify.payload for notify in conn.notifies]
+            conn.notifies.clear()
+    return payloads
+
+
+def test_commit_notifies_and_rollback_does_not(pg_engine, monkeypatch):
+    monkeypatch.setattr(invalidation.settings, "INVALIDATION_CHANNEL", "test_invalidation_send")
+    conn = _raw_listener(pg_engine, "test_invalidation_send")
+    try:
+        with Session(pg_engine) as db:
+            db.execute(text("SELECT 1"))
+            invalidation.stage(db, "job", "rolled-back")
+            db.rollback()
+            assert _received(conn, timeout=0.3) == []
+            invalidation.stage(db, "job", "a")
+            invalidation.stage(db, "saved_search", 7)
+            db.commit()
+        (payload,) = _received(conn)
+        assert json.loads(payload)["keys"] == {"job": [["a", None]], "saved_search": [["7", None]]}
+    finally:
+        conn.close()
+
+
+def test_listener_dispatches_and_flushes_only_after_reconnect(pg_engine, recorder):
+    listener = invalidation.Listener(pg_engine, channel="test_invalidation_listen")
+    listener.start()
+    try:
+        assert listener.connected.wait(5)
+        assert recorder.flushes == 0 # The caches have just loaded: no second full refresh
+
+        with pg_engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify('test_invalidation_listen', :p)"), {"p": _message(keys={"job": [["a", None]]})})
+            conn.commit()
+        deadline = time.monotonic() + 5
+        while not recorder.keys and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert recorder.keys == [[("a", None)]]
+
+        with pg_engine.connect() as conn: # Drop the listener's connection: it reconnects and flushes
+            conn.execute(text(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity WHERE query = 'LISTEN \"test_invalidation_listen\"'"
+            ))
+        deadline = time.monotonic() + 10
+        while recorder.flushes < 1 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert recorder.flushes == 1
+    finally:
+        listener.stop()
@@ -0,0 +1,39 @@
+# tests/test_job_counts.py
+"""Listing totals (GET /jobs?count=...) against the seeded Postgres database."""
+from tests.conftest import SEED_JOBS
+
+
+def _total(client, auth_headers, **params):
+    response = client.get("/api/v1/jobs/", params={"limit": 5, **params}, headers=auth_headers)
+    assert response.status_code == 200
+    headers = response.headers
+    return int(headers["X-Total-Count"]), headers["X-Total-Count-Mode"], headers["X-Total-Count-Accuracy"]
+
+
+def test_no_count_by_default(client, auth_headers):
+    response = client.get("/api/v1/jobs/", params={"limit": 5}, headers=auth_headers)
+    assert "X-Total-Count" not in response.headers
+
+
+def test_unfiltered_estimate_uses_table_statistics(client, auth_headers):
+    total, mode, accuracy = _total(client, auth_headers, count="estimated")
+    assert (mode, accuracy) == ("estimated", "table-statistics")
+    assert abs(total - SEED_JOBS) <= SEED_JOBS * 0.1
+
+
+def test_small_filtered_estimate_is_counted_exactly(client, auth_headers):
+    estimated = _total(client, auth_headers, count="estimated", CompanyName="Soylent Payments")
+    assert estimated == (0, "exact", "exact")
+
+
+def test_exact_count_matches_filter(client, auth_headers):
+    total, mode, accuracy = _total(client, auth_headers, count="exact", Location="Kochi")
+    assert (mode, accuracy) == ("exact", "exact")
+    assert 0 < total < SEED_JOBS
+
+
+def test_estimated_count_with_near(client, auth_headers):
+    # near= filters on an expanding IN list of geohashes, which EXPLAIN has to see rendered
+    total, mode, _ = _total(client, auth_headers, count="estimated", near="Bengaluru")
+    exact, _, _ = _total(client, auth_headers, count="exact", near="Bengaluru")
+    assert mode in ("estimated", "exact") and total > 0 and exact > 0
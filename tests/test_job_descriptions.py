@@ -0,0 +1,74 @@
+# tests/test_job_descriptions.py
+"""Descriptions in job_descriptions (out of the job_posts rows) against the seeded Postgres database."""
+import uuid
+
+from sqlalchemy import text
+
+from app.services import dedup, search_index
+
+
+def _create(client, auth_headers):
+    marker = uuid.uuid4().hex
+    job = {
+        "RoleName": f"Description Tester {marker}",
+        "CompanyName": f"Narrow Rows {marker}",
+        "JobDescription": f"Only loaded when asked for ({marker}).",
+    }
+    response = client.post("/api/v1/jobs/", json=job, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _description_rows(pg_engine, job_id) -> int:
+    with pg_engine.connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM job_descriptions WHERE job_id = :id"), {"id": job_id}).scalar()
+
+
+def test_list_items_include_description_only_on_request(client, auth_headers):
+    job = _create(client, auth_headers)
+    params = {"RoleName": job["RoleName"]}
+
+    (item,) = client.get("/api/v1/jobs/", params=params, headers=auth_headers).json()
+    assert item["id"] == job["id"] and item["JobDescription"] is None
+
+    (item,) = client.get("/api/v1/jobs/", params={**params, "include_description": "true"}, headers=auth_headers).json()
+    assert item["JobDescription"] == job["JobDescription"]
+
+
+def test_get_and_update_round_trip_the_description(client, auth_headers):
+    job = _create(client, auth_headers)
+    fetched = client.get(f"/api/v1/jobs/{job['id']}", headers=auth_headers).json()
+    assert fetched["JobDescription"] == job["JobDescription"]
+
+    updated = client.put(f"/api/v1/jobs/{job['id']}", json={"JobDescription": "Rewritten."}, headers=auth_headers)
+    assert updated.status_code == 200 and updated.json()["JobDescription"] == "Rewritten."
+    assert client.get(f"/api/v1/jobs/{job['id']}", headers=auth_headers).json()["JobDescription"] == "Rewritten."
+
+    renamed = client.put(f"/api/v1/jobs/{job['id']}", json={"RoleName": job["RoleName"] + " II"}, headers=auth_headers)
+    assert renamed.json()["JobDescription"] == "Rewritten." # Updating other fields keeps it
+
+
+def test_delete_removes_the_description_row(client, auth_headers, pg_engine):
+    job = _create(client, auth_headers)
+    assert _description_rows(pg_engine, job["id"]) == 1
+    assert client.delete(f"/api/v1/jobs/{job['id']}", headers=auth_headers).status_code == 204
+    assert _description_rows(pg_engine, job["id"]) == 0
+
+
+def _updated_at(pg_engine, job_id):
+    with pg_engine.connect() as conn:
+        return conn.execute(text("SELECT updated_at, simhash FROM job_posts WHERE id = :id"), {"id": job_id}).one()
+
+
+def test_description_only_edit_bumps_updated_at_and_reaches_the_index(client, auth_headers, pg_engine, monkeypatch):
+    monkeypatch.setattr(search_index, "_index", search_index.SearchIndex()) # Commits apply to it
+    monkeypatch.setattr(dedup, "fingerprint", lambda *fields: 42) # As for a one-word edit of a long description
+    job = _create(client, auth_headers)
+    before = _updated_at(pg_engine, job["id"])
+
+    edited = client.put(f"/api/v1/jobs/{job['id']}", json={"JobDescription": "Now in Rust."}, headers=auth_headers)
+    assert edited.status_code == 200
+    after = _updated_at(pg_engine, job["id"])
+    assert after.simhash == before.simhash # job_posts has nothing but updated_at to change
+    assert after.updated_at > before.updated_at
+    assert search_index.search("rust") == [uuid.UUID(job["id"])]
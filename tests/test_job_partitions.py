@@ -0,0 +1,116 @@
+# tests/test_job_partitions.py
+"""
+Month arithmetic and naming of job_posts' monthly partitions (no database
+needed), then creating and archiving partitions against the seeded Postgres
+database. Those tests work on months the seed does not use (far ahead, or in
+2001) and remove them again.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.job import JobPost
+from app.models.saved_search import SavedSearch, SavedSearchMatch
+from app.services import job_partitions
+
+
+def test_month_start_normalises_to_utc():
+    ist = timezone(timedelta(hours=5, minutes=30))
+    # 03:00 IST on 1 March is still February in UTC
+    assert job_partitions.month_start(datetime(2026, 3, 1, 3, 0, tzinfo=ist)) == datetime(2026, 2, 1, tzinfo=timezone.utc)
+    assert job_partitions.month_start(datetime(2026, 3, 31, 23, 59)) == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+def test_add_months_crosses_years():
+    december = datetime(2025, 12, 1, tzinfo=timezone.utc)
+    assert job_partitions.add_months(december, 1) == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert job_partitions.add_months(december, -12) == datetime(2024, 12, 1, tzinfo=timezone.utc)
+    assert job_partitions.add_months(december, 25) == datetime(2028, 1, 1, tzinfo=timezone.utc)
+
+
+def test_partition_names_round_trip():
+    month = datetime(2026, 7, 1, tzinfo=timezone.utc)
+    assert job_partitions.partition_name(month) == "job_posts_p202607"
+    assert job_partitions.partition_month("job_posts_p202607") == month
+    assert job_partitions.partition_month("job_posts_unpartitioned") is None
+
+
+# -- against Postgres -------------------------------------------------------
+
+def _exists(conn, relation: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:relation) IS NOT NULL"), {"relation": relation}).scalar()
+
+
+def test_ensure_ahead_creates_the_missing_months_once(pg_engine):
+    months_ahead = job_partitions.settings.JOB_PARTITION_MONTHS_AHEAD + 2
+    this_month = job_partitions.month_start(datetime.now(timezone.utc))
+    expected = [job_partitions.partition_name(job_partitions.add_months(this_month, months_ahead - i)) for i in (1, 0)]
+    try:
+        assert job_partitions.ensure_ahead(pg_engine, months_ahead) == expected # Startup already made the nearer ones
+        assert job_partitions.ensure_ahead(pg_engine, months_ahead) == []
+        with pg_engine.connect() as conn:
+            assert expected[-1] in job_partitions.attached_partitions(conn)
+    finally:
+        with pg_engine.begin() as conn:
+            for name in expected:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+
+@pytest.fixture
+def archive_schema(pg_engine, monkeypatch):
+    schema = f"test_archive_{uuid.uuid4().hex[:8]}"
+    monkeypatch.setattr(job_partitions.settings, "JOB_ARCHIVE_SCHEMA", schema)
+    yield schema
+    with pg_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        for name in ("job_posts_p200101", "job_posts_p200102"):
+            conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+
+def test_archive_detaches_then_drops_expired_months_and_clears_references(pg_engine, archive_schema):
+    january, february = datetime(2001, 1, 15, tzinfo=timezone.utc), datetime(2001, 2, 15, tzinfo=timezone.utc)
+    with pg_engine.begin() as conn:
+        assert job_partitions.ensure_partitions(conn, january, february) == ["job_posts_p200101", "job_posts_p200102"]
+    with Session(pg_engine) as db:
+        old = JobPost(RoleName="Archived Engineer", PostingDate=january, JobDescription="From 2001.")
+        newer = JobPost(RoleName="Reposted Engineer", PostingDate=february, JobDescription="Also old.")
+        db.add_all([old, newer])
+        db.flush()
+        newer.duplicate_of = old.id
+        search = SavedSearch(user_id=1, RoleName="Engineer")
+        db.add(search)
+        db.flush()
+        db.add_all([SavedSearchMatch(user_id=1, saved_search_id=search.id, job_id=job.id) for job in (old, newer)])
+        db.commit()
+        old_id, newer_id, search_id = old.id, newer.id, search.id
+
+    def remaining(conn, table, column, job_id):
+        return conn.execute(text(f"SELECT count(*) FROM {table} WHERE {column} = :id"), {"id": job_id}).scalar()
+
+    try:
+        # Two months' retention in April 2001 keeps February and everything after it
+        now = datetime(2001, 4, 10, tzinfo=timezone.utc)
+        assert job_partitions.archive_expired(pg_engine, 2, "detach", now=now) == {"job_posts_p200101": 1}
+        with pg_engine.connect() as conn:
+            assert "job_posts_p200101" not in job_partitions.attached_partitions(conn)
+            assert _exists(conn, f"{archive_schema}.job_posts_p200101")
+            assert conn.execute(text(f"SELECT body FROM {archive_schema}.job_descriptions_p200101")).scalar() == "From 2001."
+            assert remaining(conn, "job_descriptions", "job_id", old_id) == 0
+            assert remaining(conn, "saved_search_matches", "job_id", old_id) == 0
+            assert remaining(conn, "job_posts", "duplicate_of", old_id) == 0
+            assert remaining(conn, "saved_search_matches", "job_id", newer_id) == 1 # February is kept
+        assert job_partitions.archive_expired(pg_engine, 2, "detach", now=now) == {} # Nothing left to do
+
+        assert job_partitions.archive_expired(pg_engine, 1, "drop", now=now) == {"job_posts_p200102": 1}
+        with pg_engine.connect() as conn:
+            assert not _exists(conn, "job_posts_p200102")
+            assert not _exists(conn, f"{archive_schema}.job_descriptions_p200102")
+            assert remaining(conn, "job_descriptions", "job_id", newer_id) == 0
+            assert remaining(conn, "saved_search_matches", "job_id", newer_id) == 0
+        assert job_partitions.archive_expired(pg_engine, 1, "drop", now=now) == {}
+    finally:
+        with pg_engine.begin() as conn:
+            conn.execute(text("DELETE FROM saved_searches WHERE id = :id"), {"id": search_id})
@@ -0,0 +1,45 @@
+# tests/test_job_stats.py
+"""Job statistics rollups (GET /jobs/stats) against the seeded Postgres database."""
+from sqlalchemy import text
+
+BY_COMPANY = """
+    SELECT coalesce("CompanyName", ''), count(*) FROM job_posts GROUP BY 1
+    EXCEPT SELECT "CompanyName", sum(postings) FROM job_stats GROUP BY 1 HAVING sum(postings) > 0
+"""
+
+
+def _stats(client, auth_headers, **params):
+    response = client.get("/api/v1/jobs/stats", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    return response.json()["rows"]
+
+
+def test_rollups_match_the_posts(client, auth_headers, pg_engine):
+    with pg_engine.connect() as conn:
+        assert conn.execute(text(BY_COMPANY)).all() == []
+        total = conn.execute(text("SELECT count(*) FROM job_posts")).scalar()
+    assert sum(row["postings"] for row in _stats(client, auth_headers, group_by="day", limit=10_000)) == total
+
+
+def test_writes_move_postings_between_groups(client, auth_headers):
+    job = {"RoleName": "Stats Analyst", "CompanyName": "Rollup Corp", "Location": "Nagpur", "JobDescription": "Counting."}
+    created = client.post("/api/v1/jobs/", json=job, headers=auth_headers).json()
+
+    def counts():
+        rows = _stats(client, auth_headers, group_by="location", CompanyName="Rollup Corp")
+        return {row["location"]: row["postings"] for row in rows}
+
+    assert counts() == {"Nagpur": 1}
+    assert client.put(f"/api/v1/jobs/{created['id']}", json={"Location": "Nashik"}, headers=auth_headers).status_code == 200
+    assert counts() == {"Nashik": 1}
+    assert client.delete(f"/api/v1/jobs/{created['id']}", headers=auth_headers).status_code == 204
+    assert counts() == {}
+
+
+def test_date_range_and_grouping(client, auth_headers):
+    rows = _stats(client, auth_headers, group_by=["day", "company"], date_from="2000-01-01", date_to="2000-12-31")
+    assert rows == []
+    rows = _stats(client, auth_headers, group_by=["company"], limit=3)
+    assert len(rows) == 3
+    assert rows[0]["postings"] >= rows[1]["postings"] >= rows[2]["postings"]
+    assert rows[0]["day"] is None
@@ -0,0 +1,68 @@
+# tests/test_load_shedding.py
+"""Route classes and the per-class concurrency limiter (no database needed)."""
+import asyncio
+
+import pytest
+
+from app.core.load_shedding import ConcurrencyLimiter, Shed, route_class
+
+
+def test_route_classes():
+    assert route_class("POST", "/api/v1/auth/verify-otp") == "auth"
+    assert route_class("GET", "/api/v1/jobs/") == "search"
+    assert route_class("POST", "/api/v1/jobs/batch-get") == "search"
+    assert route_class("POST", "/api/v1/batch") == "search"
+    assert route_class("POST", "/api/v1/jobs/") == "writes"
+    assert route_class("DELETE", "/api/v1/saved-searches/3") == "writes"
+    assert route_class("GET", "/api/v1/admin/profiles") == "export"
+    assert route_class("GET", "/api/v1/jobs/changes/stream") is None
+    assert route_class("GET", "/metrics") is None
+
+
+def test_full_queue_is_refused_at_once():
+    async def scenario():
+        limiter = ConcurrencyLimiter("search", limit=1, queue_size=1, max_wait=5)
+        await limiter.acquire()
+        queued = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Shed) as refused:
+            await limiter.acquire()
+        assert refused.value.reason == "queue_full"
+        limiter.release(0.01) # Hands the slot to the queued request
+        assert await queued >= 0
+        assert (limiter.in_flight, limiter.queued) == (1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_waiting_past_the_deadline_is_refused():
+    async def scenario():
+        limiter = ConcurrencyLimiter("auth", limit=1, queue_size=10, max_wait=0.05)
+        await limiter.acquire()
+        with pytest.raises(Shed) as refused:
+            await limiter.acquire()
+        assert refused.value.reason == "timeout"
+        assert (limiter.in_flight, limiter.queued) == (1, 0)
+        limiter.release(0.01)
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_adaptive_limit_backs_off_and_recovers():
+    limiter = ConcurrencyLimiter("writes", limit=10, queue_size=10, max_wait=1, target_latency=0.1)
+    for _ in range(3):
+        for _ in range(10):
+            limiter.in_flight += 1
+            limiter.release(0.5) # Over the target
+    assert int(limiter.limit) == 7
+    limiter._saturated = True
+    for _ in range(10):
+        limiter.in_flight += 1
+        limiter.release(0.01)
+    assert int(limiter.limit) == 8
+    for _ in range(50):
+        limiter._saturated = True
+        limiter.in_flight += 1
+        limiter.release(0.01)
+    assert limiter.limit == 10 # Never above the configured limit
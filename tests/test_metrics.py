@@ -0,0 +1,63 @@
+# tests/test_metrics.py
+"""
+Prometheus instrumentation (app/core/metrics.py): route labels and the
+/metrics exposition run on a bare Starlette app; the SQL timing hooks need
+Postgres (TEST_DATABASE_URL).
+"""
+import pytest
+from sqlalchemy import exc, text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import metrics
+from app.core.request_context import UNMATCHED_ROUTE, RequestContextMiddleware, route_template
+
+
+def _endpoint(request):
+    return PlainTextResponse("ok")
+
+
+def test_route_template_collapses_path_params():
+    scope = {
+        "endpoint": _endpoint,
+        "path": "/api/v1/jobs/0d5c3a52-1f9e-4d1b-9f0e-2b8f5a7c9e11/similar",
+        "path_params": {"job_id": "0d5c3a52-1f9e-4d1b-9f0e-2b8f5a7c9e11"},
+    }
+    assert route_template(scope) == "/api/v1/jobs/{job_id}/similar"
+    assert route_template({"endpoint": _endpoint, "path": "/api/v1/saved-searches/3", "path_params": {"search_id": 3}}) == (
+        "/api/v1/saved-searches/{search_id}"
+    )
+    assert route_template({"endpoint": _endpoint, "path": "/api/v1/jobs/", "path_params": {}}) == "/api/v1/jobs/"
+    assert route_template({"path": "/no/such/route"}) == UNMATCHED_ROUTE
+
+
+def test_metrics_exposes_request_histogram():
+    app = Starlette(routes=[
+        Route("/items/{item_id}", _endpoint),
+        Route("/metrics", metrics.metrics_endpoint),
+    ])
+    app.add_middleware(metrics.PrometheusMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    with TestClient(app) as client:
+        assert client.get("/items/41").status_code == 200
+        assert client.get("/items/42").status_code == 200
+        body = client.get("/metrics").text
+
+    labels = 'method="GET",route="/items/{item_id}"'
+    assert f"http_request_duration_seconds_bucket{{le=\"+Inf\",{labels}}}" in body
+    count = next(line for line in body.splitlines() if line.startswith(f"http_request_duration_seconds_count{{{labels}}}"))
+    assert float(count.split()[-1]) >= 2
+    assert 'route="/items/41"' not in body
+    assert 'http_responses_total{method="GET",route="/items/{item_id}",status="2xx"}' in body
+
+
+def test_failed_statement_does_not_leak_its_start_time(pg_engine):
+    with pg_engine.connect() as conn:
+        with pytest.raises(exc.ProgrammingError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        conn.rollback()
+        assert conn.info.get("query_start_time") == []
+        conn.execute(text("SELECT 1"))
+        assert conn.info["query_start_time"] == []
@@ -0,0 +1,88 @@
+# tests/test_percolator.py
+"""
+Saved-search matching in the in-memory percolator (no database needed), and
+inbox entries for reposted jobs against the seeded Postgres database.
+"""
+import uuid
+from types import SimpleNamespace
+
+from app.services import percolator as percolator_module
+from app.services.percolator import Percolator
+
+JOB = {
+    "RoleName": "Senior Python Developer", "CompanyName": "Acme Labs", "Location": "Pune, Maharashtra",
+    "DepartmentName": "Engineering", "JobDescription": "Kafka and Postgres", "ContactEmail": "jobs@acme.example",
+}
+
+
+def _percolator(*searches):
+    percolator = Percolator()
+    for search_id, (user_id, criteria) in enumerate(searches, start=1):
+        percolator.add(search_id, user_id, criteria)
+    return percolator
+
+
+def test_all_criteria_must_match_as_case_insensitive_substrings():
+    percolator = _percolator(
+        (10, {"RoleName": "python", "Location": "PUNE"}),
+        (11, {"RoleName": "python", "Location": "Delhi"}),
+        (12, {"keyword": "postgres"}),
+        (13, {"CompanyName": "postgres"}), # keyword text, but not in this field
+    )
+    assert sorted(percolator.match(JOB)) == [(1, 10), (3, 12)]
+
+
+def test_short_needles_are_still_verified():
+    percolator = _percolator((10, {"DepartmentName": "en"}), (11, {"DepartmentName": "hr"}))
+    assert percolator.match(JOB) == [(1, 10)]
+
+
+def test_removed_searches_no_longer_match():
+    percolator = _percolator((10, {"keyword": "kafka"}))
+    percolator.remove(1)
+    assert percolator.match(JOB) == []
+    assert not percolator.buckets
+
+
+def test_changes_applied_during_a_reload_are_replayed_onto_it(monkeypatch):
+    monkeypatch.setattr(percolator_module, "_percolator", _percolator((7, {"Location": "pune"}), (7, {"CompanyName": "acme"})))
+    monkeypatch.setattr(percolator_module, "_loaded_at", 0.0) # Restored afterwards: other tests load the real searches
+
+    def saved(search_id, **criteria):
+        return SimpleNamespace(id=search_id, user_id=7, **{**dict.fromkeys(percolator_module.CRITERIA_FIELDS), **criteria})
+
+    class Rows:
+        def scalars(self): # The reload reads a snapshot older than the commits applied meanwhile
+            percolator_module._apply_pending(SimpleNamespace(info={"percolator_pending": [
+                (3, 9, {"RoleName": "python"}), (2, None, None),
+            ]}))
+            yield saved(1, Location="pune")
+            yield saved(2, CompanyName="acme")
+
+    percolator_module.load(SimpleNamespace(execute=lambda statement: Rows()))
+    assert sorted(percolator_module.match(JOB)) == [(1, 7), (3, 9)]
+    assert percolator_module._replay is None
+
+
+# -- against Postgres -------------------------------------------------------
+
+def test_merged_repost_is_percolated_once(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(percolator_module.settings, "DEDUP_POLICY", "merge")
+    marker = uuid.uuid4().hex
+    place = f"Zanzibar {marker}"
+    search = client.post("/api/v1/saved-searches/", json={"Location": place}, headers=auth_headers).json()
+    try:
+        cursor = client.get("/api/v1/saved-searches/inbox", headers=auth_headers).json()["next_cursor"]
+        job = {"RoleName": "Reposted Engineer", "CompanyName": f"Merge Co {marker}", "JobDescription": f"Same post {marker}"}
+        original = client.post("/api/v1/jobs/", json=job, headers=auth_headers)
+        assert original.status_code == 201
+
+        for _ in range(2): # The repost moves the job to the saved search's place; reposting again adds nothing
+            repost = client.post("/api/v1/jobs/", json={**job, "Location": place}, headers=auth_headers)
+            assert repost.status_code == 200 and repost.json()["id"] == original.json()["id"]
+
+        inbox = client.get("/api/v1/saved-searches/inbox", params={"after": cursor}, headers=auth_headers).json()
+        matches = [m for m in inbox["matches"] if m["saved_search_id"] == search["id"]]
+        assert [m["job"]["id"] for m in matches] == [original.json()["id"]]
+    finally:
+        client.delete(f"/api/v1/saved-searches/{search['id']}", headers=auth_headers)
@@ -0,0 +1,64 @@
+# tests/test_profiler.py
+"""Request profiler (app/core/profiler.py) on a bare Starlette app (no database needed)."""
+import os
+import threading
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core import profiler
+from app.core.request_context import RequestContextMiddleware
+
+profiled_started = threading.Event()
+concurrent_started = threading.Event()
+
+
+def _spin_profiled():
+    profiled_started.set()
+    concurrent_started.wait(5)
+    deadline = time.monotonic() + 0.3
+    while time.monotonic() < deadline:
+        pass
+
+
+def _spin_concurrent():
+    concurrent_started.set()
+    deadline = time.monotonic() + 0.3
+    while time.monotonic() < deadline:
+        pass
+
+
+def profiled(request):
+    _spin_profiled()
+    return PlainTextResponse("ok")
+
+
+def concurrent(request):
+    _spin_concurrent()
+    return PlainTextResponse("ok")
+
+
+def test_profile_excludes_concurrent_requests(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiler.settings, "PROFILE_SAMPLE_RATE", 1.0) # Only one profile runs at a time: the first request's
+    monkeypatch.setattr(profiler.settings, "PROFILE_INTERVAL_MS", 1.0)
+    monkeypatch.setattr(profiler.settings, "PROFILE_DIR", str(tmp_path))
+    app = Starlette(routes=[Route("/profiled", profiled), Route("/concurrent", concurrent)])
+    app.add_middleware(profiler.ProfilerMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+
+    responses = {}
+    with TestClient(app) as client:
+        first = threading.Thread(target=lambda: responses.setdefault("profiled", client.get("/profiled")))
+        first.start()
+        assert profiled_started.wait(5)
+        responses["concurrent"] = client.get("/concurrent")
+        first.join(5)
+
+    assert "x-profile-id" not in responses["concurrent"].headers
+    with open(os.path.join(tmp_path, responses["profiled"].headers["x-profile-id"])) as fh:
+        profile = fh.read()
+    assert "_spin_profiled" in profile
+    assert "_spin_concurrent" not in profile
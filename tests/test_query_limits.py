@@ -0,0 +1,132 @@
+# tests/test_query_limits.py
+"""
+Statement timeouts and query cancellation on client disconnect. The
+middleware mechanics run without a database; the slow-query tests need
+Postgres (TEST_DATABASE_URL).
+"""
+import asyncio
+import threading
+import time
+
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core import query_limits
+from app.core.request_context import RequestContextMiddleware
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+def _app(*routes) -> FastAPI:
+    app = FastAPI()
+    app.add_exception_handler(OperationalError, query_limits.query_canceled_handler)
+    for path, endpoint in routes:
+        app.add_api_route(path, endpoint)
+    app.add_middleware(query_limits.QueryCancelMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+def _request(app, path: str, disconnect_after: float) -> tuple[list[dict], float]:
+    """Drives one GET through the ASGI app; the client goes away after `disconnect_after` seconds."""
+    async def scenario():
+        sent, body_delivered = [], False
+
+        async def receive():
+            nonlocal body_delivered
+            if not body_delivered:
+                body_delivered = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await asyncio.sleep(disconnect_after)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [], "client": ("test", 1), "server": ("test", 80),
+        }
+        start = time.perf_counter()
+        await app(scope, receive, send)
+        return sent, time.perf_counter() - start
+
+    return asyncio.run(scenario())
+
+
+def test_disconnect_cancels_the_requests_queries():
+    seen = {}
+
+    def slow():
+        connection, record = FakeConnection(), type("Record", (), {"info": {}})()
+        query_limits.track_checkout(connection, record)
+        try:
+            seen["cancelled"] = connection.cancelled.wait(10) # A query blocked until cancelled
+        finally:
+            query_limits.track_checkin(connection, record)
+        return {}
+
+    _, elapsed = _request(_app(("/api/v1/slow", slow)), "/api/v1/slow", disconnect_after=0.1)
+    assert seen["cancelled"] is True
+    assert elapsed < 5
+
+
+def test_finished_requests_are_not_cancelled():
+    connection = FakeConnection()
+
+    def fast():
+        query_limits.track_checkout(connection, type("Record", (), {"info": {}})())
+        return {}
+
+    sent, _ = _request(_app(("/api/v1/fast", fast)), "/api/v1/fast", disconnect_after=0.05)
+    assert sent[0]["status"] == 200
+    assert not connection.cancelled.is_set()
+
+
+# -- against Postgres -------------------------------------------------------
+
+def _sleep_endpoint(seconds: float):
+    from app.database import get_db
+
+    def sleep(db=Depends(get_db)):
+        db.execute(text("SELECT pg_sleep(:s)"), {"s": seconds})
+        return {}
+
+    return sleep
+
+
+def _running_sleeps(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT count(*) FROM pg_stat_activity WHERE query LIKE 'SELECT pg_sleep%' AND pid <> pg_backend_pid()"
+        )).scalar()
+
+
+def test_disconnect_cancels_a_slow_query_at_the_backend(pg_engine, monkeypatch):
+    monkeypatch.setitem(query_limits.settings.STATEMENT_TIMEOUT_MS, "search", 0)
+    app = _app(("/api/v1/sleep", _sleep_endpoint(30)))
+    sent, elapsed = _request(app, "/api/v1/sleep", disconnect_after=0.3)
+    assert elapsed < 5
+    assert sent[0]["status"] == 503
+    time.sleep(0.2)
+    assert _running_sleeps(pg_engine) == 0
+
+
+def test_statement_timeout_per_route_class(pg_engine, monkeypatch):
+    monkeypatch.setitem(query_limits.settings.STATEMENT_TIMEOUT_MS, "search", 200)
+    app = _app(("/api/v1/sleep", _sleep_endpoint(3)))
+    sent, elapsed = _request(app, "/api/v1/sleep", disconnect_after=30)
+    assert sent[0]["status"] == 503
+    assert elapsed < 2
+
+    monkeypatch.setitem(query_limits.settings.STATEMENT_TIMEOUT_MS, "search", 0)
+    with pg_engine.connect() as conn: # SET LOCAL did not outlive the request's transaction
+        assert conn.execute(text("SHOW statement_timeout")).scalar() == "0"
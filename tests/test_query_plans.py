@@ -0,0 +1,74 @@
+# tests/test_query_plans.py
+"""
+Guards the hot SQL paths against silently losing their indexes. Each case
+calls an endpoint against the seeded database, picks the statement(s) it
+emitted against a table, EXPLAINs them and checks the plan properties.
+"""
+import pytest
+
+from tests.conftest import SEED_USERS
+from tests.query_plans import PlanExpectation, capture_sql, check_plan, explain
+
+JOBS_RECENCY = ("ix_job_posts_PostingDate",)
+
+# Cost ceilings are about 3x the costs recorded on the seeded 50k-job database.
+JOB_SEARCH_CASES = [
+    # name, query params, expectation
+    ("jobs_recent", {"limit": 20}, PlanExpectation(any_index=JOBS_RECENCY, max_cost=25)),
+    ("jobs_recent_page", {"limit": 20, "skip": 200}, PlanExpectation(any_index=JOBS_RECENCY, max_cost=125)),
+    ("jobs_role", {"limit": 20, "RoleName": "Writer"},
+     PlanExpectation(any_index=JOBS_RECENCY + ("ix_job_posts_RoleName_trgm",), max_cost=200)),
+    ("jobs_company", {"limit": 20, "CompanyName": "Hooli"},
+     PlanExpectation(any_index=JOBS_RECENCY + ("ix_job_posts_CompanyName_trgm",), max_cost=150)),
+    ("jobs_location", {"limit": 20, "Location": "Kochi"},
+     PlanExpectation(any_index=JOBS_RECENCY + ("ix_job_posts_Location_trgm",), max_cost=150)),
+    ("jobs_keyword", {"limit": 20, "keyword": "kafka"}, PlanExpectation(any_index=JOBS_RECENCY, max_cost=65000)),
+    # Nothing matches, so no LIMIT cuts the scan short. Reading job_descriptions once touches about 56k blocks;
+    # once per partition (a correlated EXISTS) touched 125k on 13 months, so this ceiling is tighter than 3x
+    ("jobs_keyword_no_match", {"limit": 20, "keyword": "zzqx-no-such-word"},
+     PlanExpectation(any_index=JOBS_RECENCY, max_blocks=80000)),
+]
+
+
+def _statements_on(captured, table: str):
+    return [
+        s for s in captured
+        if s.statement.lstrip().upper().startswith(("SELECT", "WITH")) and f"FROM {table}" in s.statement
+    ]
+
+
+@pytest.mark.parametrize("name,params,expectation", JOB_SEARCH_CASES, ids=[c[0] for c in JOB_SEARCH_CASES])
+def test_get_jobs_plans(pg_engine, client, auth_headers, name, params, expectation):
+    with capture_sql(pg_engine) as captured:
+        response = client.get("/api/v1/jobs/", params=params, headers=auth_headers)
+    assert response.status_code == 200
+    statements = _statements_on(captured, "job_posts")
+    assert statements, "get_jobs emitted no SELECT against job_posts"
+    for i, statement in enumerate(statements):
+        plan = explain(pg_engine, statement, analyze=expectation.max_blocks is not None)
+        check_plan(name if i == 0 else f"{name}_{i}", statement, plan, expectation)
+
+
+def test_get_current_user_plan(pg_engine, client, auth_headers):
+    with capture_sql(pg_engine) as captured:
+        client.get("/api/v1/users/me", headers=auth_headers)
+    (statement,) = _statements_on(captured, "users")
+    check_plan("get_user", statement, explain(pg_engine, statement),
+               PlanExpectation(any_index=("users_pkey",), max_cost=25))
+
+
+def test_get_user_by_identifier_plan(pg_engine, client):
+    with capture_sql(pg_engine) as captured:
+        response = client.post("/api/v1/auth/request-otp", json={"email": f"user{SEED_USERS // 2}@bench.example.com"})
+    assert response.status_code == 200
+    statement = _statements_on(captured, "users")[0]
+    check_plan("get_user_by_identifier", statement, explain(pg_engine, statement),
+               PlanExpectation(any_index=("ix_users_email", "ix_users_mobile_number"), max_cost=40))
+
+
+def test_get_valid_otp_plan(pg_engine, client):
+    with capture_sql(pg_engine) as captured:
+        client.post("/api/v1/auth/verify-otp", json={"email": "user7@bench.example.com", "otp_code": "000000"})
+    (statement,) = _statements_on(captured, "otps")
+    check_plan("get_valid_otp", statement, explain(pg_engine, statement),
+               PlanExpectation(no_seq_scan_on=("users", "otps"), any_index=("ix_otps_user_id",), max_cost=75))
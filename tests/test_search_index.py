@@ -0,0 +1,183 @@
+# tests/test_search_index.py
+"""
+In-memory behaviour of the embedded search index, its mmap snapshot round
+trip, catch-up from the DB (SQLite) and concurrent access.
+"""
+import re
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.models.job import JobChange, JobPost, JobPostDescription
+from app.services import search_index
+from app.services.search_index import SearchIndex
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _doc(role, company="Acme", location="Pune", department="Engineering", description="", days_ago=0):
+    posted = NOW - timedelta(days=days_ago)
+    return (uuid.uuid4(), posted, role, company, location, department, description, posted)
+
+
+def _index(*docs):
+    index = SearchIndex()
+    for doc in docs:
+        index.add(doc)
+    return index
+
+
+def test_ranks_field_boosted_matches_first_and_requires_all_terms():
+    in_role = _doc("Kafka Engineer", description="streams")
+    in_description = _doc("Backend Engineer", description="kafka streams and more kafka")
+    unrelated = _doc("Designer", description="figma")
+    index = _index(in_description, in_role, unrelated)
+
+    assert index.search("kafka") == [in_role[0], in_description[0]]
+    assert index.search("kafka figma") == []
+    assert index.search("") == []
+
+
+def test_filters_are_case_insensitive_substrings():
+    pune = _doc("Python Developer", location="Pune, Maharashtra")
+    remote = _doc("Python Developer", location="Remote")
+    index = _index(pune, remote)
+
+    assert index.search("python", {"Location": "maha"}) == [pune[0]]
+    assert index.search("python", {"Location": "Nowhere"}) == []
+
+
+def test_updates_and_deletes():
+    job = _doc("Rust Developer")
+    index = _index(job, _doc("Go Developer"))
+
+    index.add((job[0], job[1], "Zig Developer", *job[3:]))
+    assert index.search("rust") == []
+    assert index.search("zig") == [job[0]]
+    assert index.remove(job[0])
+    assert index.search("zig") == []
+    assert index.live_count == 1
+
+
+def test_snapshot_round_trip_compacts_and_stays_writable(tmp_path):
+    keep, dropped = _doc("Data Engineer", days_ago=2), _doc("Data Scientist", days_ago=1)
+    index = _index(keep, dropped)
+    index.remove(dropped[0])
+    path = str(tmp_path / "jobs.idx")
+    index.save(path)
+
+    loaded = SearchIndex.load(path)
+    assert loaded.live_count == 1 and len(loaded.live) == 1
+    assert loaded.search("data") == [keep[0]]
+    assert loaded.watermark == dropped[-1]
+
+    newer = _doc("Data Analyst")
+    loaded.add(newer)
+    assert loaded.search("data") == [newer[0], keep[0]] # equal scores: most recent first
+
+
+# -- catch-up ---------------------------------------------------------------
+
+def _job(role, days_ago=0):
+    now = datetime.now(timezone.utc)
+    job = JobPost(RoleName=role, CompanyName="Acme", PostingDate=now - timedelta(days=days_ago), updated_at=now)
+    job.JobDescription = f"{role} wanted"
+    return job
+
+
+def _db():
+    engine = create_engine("sqlite://")
+    for model in (JobPost, JobPostDescription, JobChange):
+        model.__table__.create(engine)
+    return engine
+
+
+def test_catch_up_reads_changes_without_scanning_every_id():
+    engine = _db()
+    with Session(engine) as db:
+        kept, edited, deleted, archived = _job("Kept"), _job("Edited"), _job("Deleted"), _job("Archived", days_ago=400)
+        db.add_all([kept, edited, deleted, archived])
+        db.commit()
+        index = search_index.build(db)
+        assert search_index.apply(index, search_index.catch_up(index, db)) == 0
+
+        edited.RoleName = "Renamed"
+        db.delete(deleted)
+        db.add(JobChange(job_id=deleted.id, op="delete"))
+        db.delete(archived) # Archived with its month's partition: no job_changes row
+        db.commit()
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        search_index.apply(index, search_index.catch_up(index, db))
+        assert index.search("renamed") == [edited.id]
+        assert index.search("deleted") == [] and index.search("archived") == []
+        assert index.search("kept") == [kept.id]
+    assert not any(re.fullmatch(r"SELECT job_posts\.id\s+FROM job_posts", s.strip()) for s in statements)
+
+
+def test_catch_up_without_a_delete_watermark_diffs_ids():
+    engine = _db()
+    with Session(engine) as db:
+        gone = _job("Gone")
+        db.add_all([_job("Stays"), gone])
+        db.commit()
+        index = search_index.build(db)
+        index.deletes_checked_at = None # e.g. a snapshot written before deletes were tracked
+        db.delete(gone)
+        db.commit()
+        search_index.apply(index, search_index.catch_up(index, db))
+    assert index.search("gone") == [] and index.deletes_checked_at is not None
+
+
+# -- concurrency ------------------------------------------------------------
+
+def test_searches_share_the_lock_and_writers_exclude_them():
+    lock = search_index._ReadWriteLock()
+    inside, release = threading.Barrier(3), threading.Event()
+    writer_done = threading.Event()
+
+    def reader():
+        with lock.read():
+            inside.wait(2) # Both readers get in at once
+            release.wait(2)
+
+    def writer():
+        with lock.write():
+            writer_done.set()
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    inside.wait(2)
+    blocked = threading.Thread(target=writer)
+    blocked.start()
+    assert not writer_done.wait(0.1) # Waits for the readers
+    release.set()
+    assert writer_done.wait(2)
+    for thread in readers + [blocked]:
+        thread.join(2)
+
+
+def test_writes_during_a_snapshot_are_replayed_onto_the_reloaded_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(search_index.settings, "SEARCH_INDEX_PATH", str(tmp_path / "jobs.idx"))
+    monkeypatch.setattr(search_index.settings, "SEARCH_INDEX_SNAPSHOT_EVERY", 1)
+    old = _doc("Cobol Developer")
+    monkeypatch.setattr(search_index, "_index", _index(old))
+    committed = _doc("Elixir Developer")
+    save = SearchIndex.save
+
+    def save_during_a_commit(index, path):
+        search_index._write([("upsert", committed)]) # Another request commits mid-snapshot
+        assert search_index.search("cobol") == [old[0]] # Searches are not blocked
+        assert search_index.search("elixir") == [] # The index being written stays frozen
+        save(index, path)
+
+    monkeypatch.setattr(SearchIndex, "save", save_during_a_commit)
+    search_index._snapshot()
+    assert search_index._index._mmap is not None # Swapped for the reloaded snapshot
+    assert search_index.search("elixir") == [committed[0]]
+    assert search_index._replay is None
@@ -0,0 +1,77 @@
+# tests/test_server_timing.py
+"""
+Server-Timing header (app/core/server_timing.py): phase accounting on a bare
+Starlette app, then the real API against the seeded Postgres database.
+"""
+import re
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.core.request_context import RequestContextMiddleware, get_request_state
+from app.core.server_timing import ServerTimingMiddleware, phase, timed_crud
+
+
+def _phases(header: str) -> dict[str, float]:
+    return {name: float(dur) for name, dur in re.findall(r"(\w+);dur=([\d.]+)", header)}
+
+
+@timed_crud
+def _crud():
+    state = get_request_state()
+    time.sleep(0.02)
+    state.sql_count += 1
+    state.sql_seconds += 0.015 # As if 15 ms of the 20 were spent in cursor execution
+    _nested_crud()
+
+
+@timed_crud
+def _nested_crud():
+    time.sleep(0.005)
+
+
+def _endpoint(request):
+    _crud()
+    with phase("commit"):
+        time.sleep(0.01)
+    return PlainTextResponse("ok")
+
+
+def test_header_reports_db_orm_and_commit_phases():
+    app = Starlette(routes=[Route("/", _endpoint)])
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    with TestClient(app) as client:
+        header = client.get("/").headers["server-timing"]
+
+    phases = _phases(header)
+    assert 'db;dur=15.00;desc="1 queries"' in header
+    assert phases["orm"] >= 9 # 25 ms in crud (nested counted once) minus 15 ms of SQL
+    assert phases["orm"] < 25
+    assert phases["commit"] >= 10
+    assert phases["total"] >= phases["db"] + phases["orm"] + phases["commit"]
+
+
+# -- against Postgres -------------------------------------------------------
+
+def test_api_response_has_db_and_commit_phases(client, auth_headers):
+    response = client.get("/api/v1/jobs/", params={"limit": 5}, headers=auth_headers)
+    assert response.status_code == 200
+    phases = _phases(response.headers["server-timing"])
+    assert {"auth", "db", "orm", "commit", "serialize", "total"} <= phases.keys()
+    assert re.search(r'db;dur=[\d.]+;desc="\d+ queries"', response.headers["server-timing"])
+
+
+def test_batch_sub_responses_hide_server_timing(client, auth_headers):
+    response = client.post("/api/v1/batch", json={"requests": [
+        {"id": "me", "path": "/api/v1/users/me"},
+        {"id": "page", "path": "/api/v1/jobs/?limit=3"},
+    ]}, headers=auth_headers)
+    assert response.status_code == 200
+    assert "db" in _phases(response.headers["server-timing"]) # The batch as a whole is timed
+    for sub in response.json()["responses"]:
+        assert sub["status"] == 200
+        assert "server-timing" not in {name.lower() for name in sub["headers"]}
@@ -0,0 +1,74 @@
+# tests/test_snapshots.py
+"""Parquet analytics snapshots (app/services/snapshots.py) against the seeded Postgres database."""
+import time
+
+import pytest
+from sqlalchemy import text
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from app.services import snapshots
+
+
+def test_full_snapshot_matches_the_database(pg_engine, tmp_path):
+    manifest = snapshots.create_snapshot(pg_engine, batch_rows=4096, directory=str(tmp_path))
+    with pg_engine.connect() as conn:
+        jobs = conn.execute(text("SELECT count(*) FROM job_posts")).scalar()
+        users = conn.execute(text("SELECT count(*) FROM users")).scalar()
+        otps = conn.execute(text("SELECT count(*) FROM otps")).scalar()
+    assert manifest["tables"]["job_posts"] == jobs
+    assert manifest["tables"]["users"] == users
+    assert "job_deletes" not in manifest["tables"]
+
+    directory = tmp_path / manifest["name"]
+    job_file = pq.ParquetFile(directory / "job_posts.parquet")
+    assert job_file.metadata.num_rows == jobs
+    assert job_file.metadata.num_row_groups == -(-jobs // 4096)
+    assert "JobDescription" not in job_file.schema_arrow.names
+    assert "email" not in pq.read_schema(directory / "users.parquet").names
+    assert sum(pq.read_table(directory / "otp_daily.parquet").column("issued").to_pylist()) == otps
+    assert snapshots.list_snapshots(str(tmp_path))[0]["name"] == manifest["name"]
+
+
+def test_incremental_snapshot_holds_changes_since_the_watermark(client, auth_headers, pg_engine, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots.settings, "SNAPSHOT_WATERMARK_OVERLAP_SECONDS", 0)
+    snapshots.create_snapshot(pg_engine, include_users=False, include_otps=False, directory=str(tmp_path))
+    time.sleep(1.1) # Snapshot names have one-second resolution
+
+    job = {"RoleName": "Snapshot Engineer", "CompanyName": "Columnar Ltd", "Location": "Pune", "JobDescription": "Parquet."}
+    created = client.post("/api/v1/jobs/", json=job, headers=auth_headers).json()
+    deleted = client.post("/api/v1/jobs/", json={**job, "RoleName": "Temp"}, headers=auth_headers).json()
+    assert client.delete(f"/api/v1/jobs/{deleted['id']}", headers=auth_headers).status_code == 204
+
+    manifest = snapshots.create_snapshot(
+        pg_engine, incremental=True, include_users=False, include_otps=False, directory=str(tmp_path),
+    )
+    assert manifest["incremental"]
+    directory = tmp_path / manifest["name"]
+    assert pq.read_table(directory / "job_posts.parquet").column("id").to_pylist() == [created["id"]]
+    assert pq.read_table(directory / "job_deletes.parquet").column("job_id").to_pylist() == [deleted["id"]]
+
+
+def test_snapshot_endpoints(client, auth_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots.settings, "SNAPSHOT_DIR", str(tmp_path))
+    response = client.post("/api/v1/admin/snapshots", json={"include_users": False}, headers=auth_headers)
+    assert response.status_code == 202 # TestClient runs the background task before returning
+
+    listed = client.get("/api/v1/admin/snapshots", headers=auth_headers).json()["snapshots"]
+    assert len(listed) == 1 and "users" not in listed[0]["tables"]
+    name = listed[0]["name"]
+    download = client.get(f"/api/v1/admin/snapshots/{name}/job_posts.parquet", headers=auth_headers)
+    assert download.status_code == 200
+    assert download.content[:4] == b"PAR1"
+    assert client.get(f"/api/v1/admin/snapshots/{name}/..%2Fsecret.parquet", headers=auth_headers).status_code == 404
+
+
+def test_snapshot_refused_while_another_worker_holds_the_lock(pg_engine, tmp_path):
+    with pg_engine.connect() as other: # Another process writing a snapshot
+        other.execute(text("SELECT pg_advisory_lock(:key)"), {"key": snapshots._LOCK_KEY})
+        assert snapshots.running(pg_engine)
+        with pytest.raises(snapshots.SnapshotInProgress):
+            snapshots.create_snapshot(pg_engine, directory=str(tmp_path))
+        other.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": snapshots._LOCK_KEY})
+    assert not snapshots.running(pg_engine)
+    assert list(tmp_path.iterdir()) == []
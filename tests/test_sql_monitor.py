@@ -0,0 +1,40 @@
+# tests/test_sql_monitor.py
+"""Statement normalization, parameter redaction and the repeated-query detector (no database needed)."""
+from app.core import sql_monitor
+from app.core.request_context import RequestState
+
+
+def test_normalize_strips_literals_and_parameters():
+    assert sql_monitor.normalize("SELECT * FROM users WHERE id = %(id_1)s LIMIT 10") == (
+        "SELECT * FROM users WHERE id = ? LIMIT ?"
+    )
+    assert sql_monitor.normalize("SELECT * FROM otps WHERE user_id = $1 AND used = :used") == (
+        "SELECT * FROM otps WHERE user_id = ? AND used = ?"
+    )
+    # Numbers inside identifiers are kept
+    assert sql_monitor.normalize("SELECT * FROM job_posts_p202601 WHERE x = 7") == "SELECT * FROM job_posts_p202601 WHERE x = ?"
+
+
+def test_normalize_collapses_in_lists_and_whitespace():
+    two = sql_monitor.normalize("SELECT *\n  FROM job_posts\n WHERE id IN (%(id_1)s, %(id_2)s)")
+    five = sql_monitor.normalize("SELECT * FROM job_posts WHERE id IN (1, 2, 3, 4, 5)")
+    assert two == five == "SELECT * FROM job_posts WHERE id IN (?...)"
+
+
+def test_redact_keeps_shape_not_values():
+    assert sql_monitor.redact({"email": "a@example.com", "id": 3}) == {"email": "<str>", "id": "<int>"}
+    assert sql_monitor.redact(("secret", None)) == ["<str>", "<NoneType>"]
+    assert sql_monitor.redact([{"id": 1}, {"id": 2}]) == "<2 parameter sets>"
+    assert "a@example.com" not in repr(sql_monitor.redact({"email": "a@example.com"}))
+
+
+def test_repeated_query_is_flagged_once(monkeypatch):
+    monkeypatch.setattr(sql_monitor.settings, "SQL_REPEAT_THRESHOLD", 2)
+    warnings = []
+    monkeypatch.setattr(sql_monitor.logger, "warning", lambda message, *args: warnings.append(message % args))
+    state = RequestState({"type": "http", "method": "GET", "path": "/api/v1/jobs/"})
+    for user_id in range(5):
+        sql_monitor.on_statement(state, f"SELECT * FROM users WHERE id = {user_id}", None, 0.001)
+    repeated = [w for w in warnings if "repeated query" in w]
+    assert len(repeated) == 1
+    assert "SELECT * FROM users WHERE id = ?" in repeated[0]